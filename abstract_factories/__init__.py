@@ -48,9 +48,17 @@ Example usage:
     >>> assert instance_factory.get('Honda') is honda
 
 """
-from .constants import LOGGER, FactoryItemModes
+from .constants import LOGGER, FactoryItemModes, FileSources, NameSearchModes
 
 from .core import AbstractTypeFactory, AbstractInstanceFactory
+from .versioning import VersionRange
+from .frozen import FrozenFactory
+from .cache import DiscoveryCache
+from .stats import DiscoveryStats, FileStats
+from .metrics import LookupMetrics
+from .watcher import FactoryWatcher
+from .hub import DiscoveryHub
+from .utils import close_archives, invalidate_modules
 
 """
 MIT License
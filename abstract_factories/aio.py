@@ -0,0 +1,134 @@
+"""
+asyncio support, for using factories from event loops without blocking them on filesystem walks and imports.
+
+`AsyncFactory` wraps a factory, handing its filesystem and import work to an executor. Paths are registered
+file by file, so items become available as each file finishes, whilst `ready` waits for all pending
+registrations to finish.
+
+.. code-block:: python
+
+    >>> async_factory = AsyncFactory(AbstractTypeFactory(AbstractVehicle))
+    >>> async_factory.register_path('c:/tools/vehicles')   # Starts registering in the background.
+    >>> await async_factory.ready()
+    >>> car = await async_factory.get('Car')
+
+Requires python 3.7+, so is not imported by the package itself.
+"""
+import asyncio
+import functools
+
+
+# ------------------------------------------------------------------------------
+class AsyncFactory(object):
+    """
+    Wrap <factory> for use from asyncio event loops.
+    Registration methods schedule their work immediately, returning a task that can be awaited.
+
+    :param _AbstractFactory factory: Factory to wrap.
+    :param concurrent.futures.Executor|None executor: Executor to run filesystem and import work in.
+        None to use the event loop's default executor.
+
+    """
+
+    def __init__(self, factory, executor=None):
+        self._factory = factory
+        self._executor = executor
+        self._pending = set()
+
+    def __repr__(self):
+        return '{}({}, pending={})'.format(type(self).__name__, self._factory, len(self._pending))
+
+    # --------------------------------------------------------------------------
+    @property
+    def factory(self):
+        return self._factory
+
+    @property
+    def is_ready(self):
+        return not self._pending
+
+    # --------------------------------------------------------------------------
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def _schedule(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return task
+
+    async def _register_path(self, path, recursive, lazy, cache, workers):
+        factory = self._factory
+        path_files = await self._run(factory._add_path, path, recursive, lazy, cache, workers)
+        filepaths = await self._run(list, factory._iter_path_files(path, recursive, workers))
+
+        def register_filepath(filepath):
+            path_files.add(filepath)
+            return factory._register_filepaths([filepath], lazy=lazy, cache=cache, save_cache=False)
+
+        count = 0
+        try:
+            for filepath in filepaths:
+                count += await self._run(register_filepath, filepath)
+        finally:
+            if cache is not None:
+                await self._run(cache.save)
+        return count
+
+    # --------------------------------------------------------------------------
+    def register_path(self, path, recursive=True, lazy=False, cache=None, workers=None):
+        """
+        Find and register any viable items found in <path>, as the factory's register_path.
+        Files are registered one at a time in the executor, so their items are available as each finishes.
+        :param str path: Path to use.
+        :param bool recursive: True to search nested directories. False to only search immediate files.
+        :param bool lazy: True to find items statically, only importing a file once an item from it is requested.
+        :param DiscoveryCache|None cache: Discovery cache to use.
+        :param int|None workers: Number of threads to list directories with. None to do so serially.
+        :return: Task resolving to the number of registered items.
+        :rtype: asyncio.Task
+        """
+        return self._schedule(self._register_path(path, recursive, lazy, cache, workers))
+
+    def register_module(self, module):
+        """
+        Find and register any viable items found in <module>, as the factory's register_module.
+        :param ModuleType module: Module to use.
+        :return: Task resolving to the number of registered items.
+        :rtype: asyncio.Task
+        """
+        return self._schedule(self._run(self._factory.register_module, module))
+
+    async def ready(self):
+        """Wait for all pending registrations, including any scheduled whilst waiting, to finish."""
+        while self._pending:
+            await asyncio.wait(list(self._pending))
+
+    async def get(self, name, version=None, wait=True):
+        """
+        Get the item matching <name> and <version>, as the factory's get.
+        Lazy items are imported in the executor.
+        :param str name: Name to get the item for.
+        :param int|float|VersionRange|None version: Version to get. None to get latest.
+        :param bool wait: True to wait for pending registrations first (see ready).
+        :rtype: type|object|None
+        """
+        if wait:
+            await self.ready()
+        if name in self._factory._lazy_names:
+            return await self._run(self._factory.get, name, version=version)
+        return self._factory.get(name, version=version)
+
+    async def get_many(self, requests, wait=True):
+        """
+        Get the items matching each of <requests>, as the factory's get_many.
+        Lazy items are imported in the executor.
+        :param Iterable[str|tuple] requests: Names, or (name, version) to get.
+        :param bool wait: True to wait for pending registrations first (see ready).
+        :rtype: list[type|object|None]
+        """
+        requests = list(requests)
+        if wait:
+            await self.ready()
+        return await self._run(self._factory.get_many, requests)
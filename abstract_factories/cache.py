@@ -0,0 +1,194 @@
+"""
+Persistent discovery cache, to avoid importing unchanged python files on every `register_path`.
+
+Each python file is recorded by its normalised path and stat (mtime and size, plus an optional content hash),
+alongside the (name, version) of the viable items found in it, per factory configuration.
+Unchanged files with no viable items are skipped, whilst the others are registered lazily.
+
+Only the file itself is checked for changes. A change to a file's dependencies (ie, its base classes defined
+elsewhere) is not detected.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+from . import utils
+from .constants import LOGGER
+
+
+CACHE_FORMAT_VERSION = 1
+
+_SERIALISABLE_TYPES = (utils.basestring, bool, int, float, type(None))
+
+
+# ------------------------------------------------------------------------------
+def get_factory_key(factory):
+    """
+    Get the cache key identifying <factory>'s abstract, name and version keys.
+    :param _AbstractFactory factory: Factory to get the key for.
+    :return: Key, or None if <factory> can't be cached (ie, using callable name or version keys).
+    :rtype: str|None
+    """
+    for key in (factory.name_key, factory.version_key):
+        if key is not None and not isinstance(key, utils.basestring):
+            return None
+
+    abstract = factory.abstract
+    return '{}:{}.{}:{}:{}'.format(
+        factory.item_mode,
+        abstract.__module__,
+        getattr(abstract, '__qualname__', abstract.__name__),
+        factory.name_key,
+        factory.version_key,
+    )
+
+
+def get_file_hash(filepath):
+    """
+    Get the sha1 hash of <filepath>'s contents.
+    :param str filepath: Filepath to hash.
+    :rtype: str
+    """
+    sha = hashlib.sha1()
+    with open(filepath, 'rb') as fp:
+        for chunk in iter(lambda: fp.read(65536), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+# ------------------------------------------------------------------------------
+class DiscoveryCache(object):
+    """
+    On-disk record of the items discovered in python files, for use with `register_path`.
+
+    :param str filepath: Cache (json) filepath. Loaded immediately, if it exists.
+    :param bool use_hash: True to also compare file content hashes, False to only compare mtime and size.
+
+    """
+
+    def __init__(self, filepath, use_hash=False):
+        self._filepath = filepath
+        self._use_hash = use_hash
+        self._files = {}
+        self._modified = False
+        self.load()
+
+    def __repr__(self):
+        return '{}("{}", files={})'.format(type(self).__name__, self._filepath, len(self._files))
+
+    # --------------------------------------------------------------------------
+    @property
+    def filepath(self):
+        return self._filepath
+
+    @property
+    def use_hash(self):
+        return self._use_hash
+
+    # --------------------------------------------------------------------------
+    def _get_signature(self, filepath):
+        stat = os.stat(filepath)
+        signature = {'mtime': stat.st_mtime, 'size': stat.st_size}
+        if self._use_hash:
+            signature['hash'] = get_file_hash(filepath)
+        return signature
+
+    # --------------------------------------------------------------------------
+    def load(self):
+        """
+        Load the cache from disk, discarding any unsaved changes.
+        Missing, unreadable or outdated caches are treated as empty.
+        """
+        self._files = {}
+        self._modified = False
+        if not os.path.isfile(self._filepath):
+            return
+
+        try:
+            with open(self._filepath, 'r') as fp:
+                data = json.load(fp)
+        except (IOError, OSError, ValueError) as e:
+            LOGGER.warning('Failed to load discovery cache "{}" :: {}.'.format(self._filepath, e))
+            return
+
+        if data.get('version') == CACHE_FORMAT_VERSION:
+            self._files = data.get('files', {})
+
+    def save(self):
+        """Save the cache to disk, if modified. The cache file is replaced atomically."""
+        if not self._modified:
+            return
+
+        directory = os.path.dirname(os.path.abspath(self._filepath))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        fd, temp_filepath = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as fp:
+                json.dump({'version': CACHE_FORMAT_VERSION, 'files': self._files}, fp)
+            getattr(os, 'replace', os.rename)(temp_filepath, self._filepath)
+        except Exception:
+            if os.path.exists(temp_filepath):
+                os.remove(temp_filepath)
+            raise
+        self._modified = False
+
+    def clear(self):
+        """Clear all cached files."""
+        if self._files:
+            self._files = {}
+            self._modified = True
+
+    # --------------------------------------------------------------------------
+    def get(self, filepath, factory_key):
+        """
+        Get the cached (name, version) records of <filepath> for <factory_key>.
+        :param str filepath: Normalised python filepath.
+        :param str factory_key: Factory key (see get_factory_key).
+        :return: Records, or None if <filepath> is not cached or has changed since.
+        :rtype: list[tuple]|None
+        """
+        entry = self._files.get(filepath)
+        if entry is None or factory_key not in entry['factories']:
+            return None
+
+        try:
+            signature = self._get_signature(filepath)
+        except (IOError, OSError):
+            return None
+
+        if any(entry.get(key) != value for key, value in signature.items()):
+            return None
+
+        return [tuple(record) for record in entry['factories'][factory_key]]
+
+    def set(self, filepath, factory_key, records):
+        """
+        Cache the (name, version) <records> of <filepath> for <factory_key>.
+        Records that are not json serialisable are not cached.
+        :param str filepath: Normalised python filepath.
+        :param str factory_key: Factory key (see get_factory_key).
+        :param list[tuple] records: (name, version) of each viable item in <filepath>.
+        :return: True if <records> were cached.
+        :rtype: bool
+        """
+        for record in records:
+            if not all(isinstance(value, _SERIALISABLE_TYPES) for value in record):
+                return False
+
+        try:
+            signature = self._get_signature(filepath)
+        except (IOError, OSError):
+            return False
+
+        entry = self._files.get(filepath)
+        if entry is None or any(entry.get(key) != value for key, value in signature.items()):
+            # Changed files invalidate the records of all factories.
+            entry = dict(signature, factories={})
+            self._files[filepath] = entry
+
+        entry['factories'][factory_key] = [list(record) for record in records]
+        self._modified = True
+        return True
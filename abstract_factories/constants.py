@@ -9,3 +9,18 @@ class FactoryItemModes:
 
     Types = 'types'             # Store subclasses of abstract.
     Instances = 'instances'     # Store subclass instances of abstract.
+
+
+class NameSearchModes:
+
+    Prefix = 'prefix'           # Names starting with the text.
+    Substring = 'substring'     # Names containing the text.
+    Fuzzy = 'fuzzy'             # Names containing the characters of the text, in order.
+
+
+class FileSources:
+
+    Import = 'import'           # Imported.
+    Scan = 'scan'               # Statically scanned (see register_path(lazy=True)).
+    Cache = 'cache'             # Found in a DiscoveryCache.
+    Process = 'process'         # Discovered in a worker process (see register_path(processes=...)).
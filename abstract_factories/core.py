@@ -1,8 +1,149 @@
+import collections
+import functools
 import inspect
+import itertools
+import operator
+import os
+import threading
+import timeit
 import types
 
-from . import utils
-from .constants import LOGGER, FactoryItemModes
+from . import isolated, manifest, scanning, utils
+from .cache import get_factory_key
+from .constants import LOGGER, FactoryItemModes, FileSources, NameSearchModes
+from .frozen import FrozenFactory
+from .metrics import LookupMetrics
+from .search import NameSearchIndex
+from .stats import DiscoveryStats, FileStats
+from .versioning import VersionRange
+
+
+# Index record for a single name.
+# versions: Distinct versions sorted ascending, or None if the versions are not orderable.
+# items: {version: ((entry_id, item), ...)} in registration order, the last item being the active one.
+_NameRecord = collections.namedtuple('_NameRecord', ['versions', 'items'])
+
+_entry_id_getter = operator.itemgetter(0)
+
+# Placeholder for missing attribute values.
+_MISSING = object()
+
+
+class _IdentityKey(object):
+    """Membership key for unhashable items, comparing by identity."""
+
+    __slots__ = ('_id',)
+
+    def __init__(self, item):
+        self._id = id(item)
+
+    def __eq__(self, other):
+        return type(other) is _IdentityKey and other._id == self._id
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._id)
+
+
+class _AttributeIndex(object):
+    """Secondary index of registration entries by an attribute value (see _AbstractFactory.add_index)."""
+
+    __slots__ = ('values', 'unhashable', 'entries')
+
+    def __init__(self):
+        self.values = {}  # {value: {entry_id, ...}}
+        self.unhashable = set()  # {entry_id, ...} with unhashable values, compared on lookup.
+        self.entries = {}  # {entry_id: value}
+
+    def add(self, entry_id, value):
+        self.entries[entry_id] = value
+        if value is _MISSING:
+            return
+        try:
+            self.values.setdefault(value, set()).add(entry_id)
+        except TypeError:
+            self.unhashable.add(entry_id)
+
+    def remove(self, entry_id):
+        value = self.entries.pop(entry_id, _MISSING)
+        if entry_id in self.unhashable:
+            self.unhashable.remove(entry_id)
+        elif value is not _MISSING:
+            entry_ids = self.values[value]
+            entry_ids.discard(entry_id)
+            if not entry_ids:
+                del self.values[value]
+
+    def find(self, value):
+        try:
+            entry_ids = set(self.values.get(value, ()))
+        except TypeError:
+            entry_ids = set()
+        entry_ids.update(
+            entry_id
+            for entry_id in self.unhashable
+            if self.entries[entry_id] == value
+        )
+        return entry_ids
+
+    def clear(self):
+        self.values.clear()
+        self.unhashable.clear()
+        self.entries.clear()
+
+
+def _membership_key(item):
+    """
+    Get the key used to test <item> membership.
+    Hashable items are their own key, unhashable items fall back to their id().
+    :param type|object item: Item to get the key for.
+    :rtype: Hashable
+    """
+    try:
+        hash(item)
+    except TypeError:
+        return _IdentityKey(item)
+    return item
+
+
+def _path_contains(path_key, filepath):
+    """
+    Get if registered path <path_key> covers <filepath>.
+    :param tuple[str, bool] path_key: Normalised (path, recursive) of a registered path.
+    :param str filepath: Normalised filepath to check.
+    :rtype: bool
+    """
+    path, recursive = path_key
+    if filepath == path:
+        return True
+
+    separator = os.altsep or os.sep
+    if not filepath.startswith(path.rstrip(separator) + separator):
+        return False
+    return recursive or filepath.rfind(separator) <= len(path.rstrip(separator))
+
+
+def _synchronised(func):
+    """Decorate a factory method to hold the factory's lock whilst it's called."""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return func(self, *args, **kwargs)
+    return wrapper
+
+
+def _sort_versions(versions):
+    """
+    Sort <versions> ascending, returning None if they are not orderable (ie, None mixed with numbers).
+    :param Iterable versions: Versions to sort.
+    :rtype: tuple|None
+    """
+    try:
+        return tuple(sorted(versions))
+    except TypeError:
+        return None
 
 
 # ------------------------------------------------------------------------------
@@ -23,7 +164,7 @@ class _AbstractFactory(object):
         If callable given, will expect the callable to accept the item as an argument and will use the returned value.
         If None given, versioning will not be supported (first registered item will only be used).
     :param bool unique_items_only: True to only store unique items, False to support non-unique.
-        Uniqueness is a list membership test (list.__contains__).
+        Uniqueness is a hash membership test, falling back to identity for unhashable items.
     :param FactoryItemModes|str item_mode: Factory item mode. Determine they type of Item to store (types or instances).
 
     """
@@ -53,7 +194,34 @@ class _AbstractFactory(object):
 
         self._item_mode = item_mode
 
-        self._items = []
+        # Writers are serialised by the lock. Readers don't take it, relying on the index records (and items
+        # snapshot) being replaced rather than mutated.
+        self._lock = threading.RLock()
+
+        # Items are stored per registration entry, to support non-unique items whilst keeping
+        # registration order and constant time membership.
+        self._entry_ids = itertools.count()
+        self._items = collections.OrderedDict()  # {entry_id: item}
+        self._items_snapshot = ()  # Registered items, or None if changed since.
+        self._members = {}  # {membership_key: [entry_id, ...]}
+        self._keys = {}  # {entry_id: (name, version)}, resolved once on registration.
+        self._index = {}  # {name: _NameRecord}
+        self._attribute_indexes = {}  # {attribute: _AttributeIndex}
+        self._name_search = NameSearchIndex()  # Registered and lazy (str) names.
+
+        # Statically discovered items, not yet imported (see register_path(lazy=True)).
+        self._lazy_files = collections.OrderedDict()  # {filepath: [name, ...]}
+        self._lazy_names = {}  # {name: [filepath, ...]}
+        self._lazy_manifests = {}  # {filepath: (content_hash, [qualname, ...])}, for files from a manifest.
+
+        # Registered paths and the source files of their items (see refresh).
+        self._paths = collections.OrderedDict()  # {(path, recursive): {option: value}}
+        self._path_files = {}  # {(path, recursive): {filepath, ...}}
+        self._file_mtimes = {}  # {filepath: mtime}
+        self._file_entries = {}  # {filepath: [entry_id, ...]}
+        self._entry_files = {}  # {entry_id: filepath}
+        self._stats = DiscoveryStats()
+        self._metrics = None  # LookupMetrics, if enabled (see enable_metrics).
 
         if paths:
             for path in utils.ensure_iterable(paths):
@@ -72,6 +240,14 @@ class _AbstractFactory(object):
     def abstract(self):
         return self._abstract
 
+    @property
+    def name_key(self):
+        return self._name_key
+
+    @property
+    def version_key(self):
+        return self._version_key
+
     @property
     def unique_items_only(self):
         return self._unique_items_only
@@ -101,24 +277,463 @@ class _AbstractFactory(object):
         return True
 
     def _item_is_registered(self, item):
-        return item in self._items
+        return _membership_key(item) in self._members
 
     def _add_item(self, item):
-        if self._is_viable_item(item):
-            if not self.unique_items_only or not self._item_is_registered(item):
-                LOGGER.debug('Adding item {}.'.format(item))
-                self._items.append(item)
-                return 1
-        return 0
+        return 1 if self._add_items((item,))[0] else 0
+
+    @_synchronised
+    def _add_items(self, items, filepaths=None):
+        """
+        Add each viable item in <items>.
+        :param Iterable[type|object] items: Items to add.
+        :param list[str]|None filepaths: Source filepath of each item in <items>, if known.
+        :return: True for each item added.
+        :rtype: list[bool]
+        """
+        # Keys are resolved for every item before anything is stored, so an item failing to resolve
+        # leaves the factory unchanged.
+        results = []
+        pending = []
+        pending_keys = set()
+        for index, item in enumerate(items):
+            if not self._is_viable_item(item):
+                results.append(False)
+                continue
 
+            key = _membership_key(item)
+            if self.unique_items_only and (key in self._members or key in pending_keys):
+                results.append(False)
+                continue
+
+            pending_keys.add(key)
+            pending.append((index, item, key, self._resolve_keys(item)))
+            results.append(True)
+
+        entries = []
+        for index, item, key, (name, version) in pending:
+            entry_id = next(self._entry_ids)
+            self._items[entry_id] = item
+            self._members.setdefault(key, []).append(entry_id)
+            self._keys[entry_id] = (name, version)
+            if filepaths is not None:
+                self._entry_files[entry_id] = filepaths[index]
+                self._file_entries.setdefault(filepaths[index], []).append(entry_id)
+            entries.append((entry_id, item, name, version))
+
+        if entries:
+            LOGGER.debug('Adding %s item(s).', len(entries))
+            self._items_snapshot = None
+            self._index_entries(entries)
+            for attribute, attribute_index in self._attribute_indexes.items():
+                for entry_id, item, _, _ in entries:
+                    attribute_index.add(entry_id, self._get_attribute(item, attribute))
+        return results
+
+    @_synchronised
     def _remove_item(self, item):
-        count = 0
-        while self._item_is_registered(item):
-            LOGGER.debug('Removing item {}.'.format(item))
-            self._items.remove(item)
-            count += 1
+        return self._remove_entries(list(self._members.get(_membership_key(item), ())))
+
+    @_synchronised
+    def _remove_entries(self, entry_ids):
+        removed = []
+        for entry_id in entry_ids:
+            item = self._items.pop(entry_id)
+            LOGGER.debug('Removing item %s.', item)
+
+            key = _membership_key(item)
+            self._members[key].remove(entry_id)
+            if not self._members[key]:
+                del self._members[key]
+
+            filepath = self._entry_files.pop(entry_id, None)
+            if filepath is not None:
+                self._file_entries[filepath].remove(entry_id)
+                if not self._file_entries[filepath]:
+                    del self._file_entries[filepath]
+
+            for attribute_index in self._attribute_indexes.values():
+                attribute_index.remove(entry_id)
+
+            removed.append((entry_id, self._keys.pop(entry_id)[0]))
+
+        if removed:
+            self._items_snapshot = None
+        self._unindex_entries(removed)
+        return len(removed)
+
+    def _supports_lazy_items(self):
+        if self.item_mode != FactoryItemModes.Types:
+            return False
+        elif not isinstance(self._name_key, utils.basestring):
+            return False
+        elif self._version_key and not isinstance(self._version_key, utils.basestring):
+            return False
+        return True
+
+    def _add_lazy_items(self, filepath, records):
+        if filepath in self._lazy_files:
+            return 0
+
+        names = []
+        for name, _ in records:
+            if name not in names:
+                names.append(name)
+        if not names:
+            return 0
+
+        LOGGER.debug('Deferring %s item(s) from "%s".', len(records), filepath)
+        self._lazy_files[filepath] = names
+        for name in names:
+            self._lazy_names.setdefault(name, []).append(filepath)
+            self._name_search.add(name)
+        return len(records)
+
+    def _discard_lazy_items(self, filepath):
+        self._lazy_manifests.pop(filepath, None)
+        self._discard_lazy_names(filepath, self._lazy_files.pop(filepath, ()))
+
+    def _discard_lazy_names(self, filepath, names):
+        for name in names:
+            name_filepaths = self._lazy_names[name]
+            name_filepaths.remove(filepath)
+            if not name_filepaths:
+                del self._lazy_names[name]
+                if name not in self._index:
+                    self._name_search.remove(name)
+
+    @_synchronised
+    def _load_lazy_items(self, names=None):
+        if names is None:
+            filepaths = list(self._lazy_files)
+        else:
+            filepaths = list(collections.OrderedDict.fromkeys(
+                filepath
+                for name in names
+                for filepath in self._lazy_names.get(name, ())
+            ))
+
+        # Files are taken before importing, so re-entrant lookups don't import them again. Their names are
+        # only discarded once their items are indexed, so readers always find each name in one or the other.
+        loading = [
+            (filepath, self._lazy_files.pop(filepath))
+            for filepath in filepaths
+            if filepath in self._lazy_files
+        ]
+        manifests = dict(
+            (filepath, self._lazy_manifests.pop(filepath))
+            for filepath, _ in loading
+            if filepath in self._lazy_manifests
+        )
+
+        items = []
+        item_filepaths = []
+        try:
+            for result in utils.iter_import_results(filepath for filepath, _ in loading):
+                module_items = None
+                if result.module and result.filepath in manifests:
+                    module_items = manifest.resolve_items(result.module, result.filepath, *manifests[result.filepath])
+                if module_items is None:
+                    module_items = list(result.module.__dict__.values()) if result.module else []
+                items.extend(module_items)
+                item_filepaths.extend([result.filepath] * len(module_items))
+                self._stats.add_file(FileStats(
+                    result.filepath,
+                    FileSources.Import,
+                    result.seconds,
+                    sum(1 for item in module_items if self._is_viable_item(item)),
+                    result.error,
+                    result.profile,
+                ))
+
+            return sum(self._add_items(items, item_filepaths))
+        finally:
+            for filepath, file_names in loading:
+                self._discard_lazy_names(filepath, file_names)
+
+    def _add_lazy_records(self, filepath, records, source, seconds):
+        """
+        Register the (name, version) <records> of <filepath> lazily, recording its stats.
+        :return int: Number of registered items.
+        """
+        count = self._add_lazy_items(filepath, records)
+        self._stats.add_file(FileStats(filepath, source, seconds, len(records), None, None))
         return count
 
+    def _find_records(self, filepath, lazy, cache, cache_key):
+        """
+        Find the (name, version) records of <filepath> without importing it, from <cache> or statically.
+        :return: (records, source). Records are None if not found.
+        :rtype: tuple[list[tuple]|None, str]
+        """
+        if cache_key:
+            records = cache.get(filepath, cache_key)
+            if records is not None:
+                return records, FileSources.Cache
+
+        if not lazy:
+            return None, None
+
+        records = scanning.scan_filepath(filepath, self._abstract, self._name_key, self._version_key)
+        if records is not None and cache_key:
+            cache.set(filepath, cache_key, records)
+        return records, FileSources.Scan
+
+    def _iter_process_filepaths(self, filepaths, processes, mp_context, cache, cache_key, lazy_counts):
+        """
+        Register the items of <filepaths> lazily, discovering them out-of-process.
+        :param list lazy_counts: Number of items registered for each file is appended to this.
+        :return: Filepaths that couldn't be discovered out-of-process, so are left to import.
+        :rtype: Generator[str]
+        """
+        for filepath, item_records, seconds in isolated.iter_discovered_filepaths(
+            self, filepaths, processes, mp_context,
+        ):
+            if item_records is None:
+                yield filepath
+                continue
+
+            records = [(record.name, record.version) for record in item_records]
+            if cache_key:
+                cache.set(filepath, cache_key, records)
+            lazy_counts.append(self._add_lazy_records(filepath, records, FileSources.Process, seconds))
+
+    def _iter_unregistered_filepaths(self, filepaths, lazy, cache, cache_key, processes, mp_context, lazy_counts):
+        """
+        Register the items of <filepaths> lazily where found without importing them (from <cache>, statically
+        or out-of-process), recording each file's mtime.
+        Files left to discover out-of-process are handled once all others are.
+        :param list lazy_counts: Number of items registered for each file is appended to this.
+        :return: Filepaths left to import.
+        :rtype: Generator[str]
+        """
+        process_filepaths = []
+        for filepath in filepaths:
+            try:
+                self._file_mtimes[filepath] = utils.get_mtime(filepath)
+            except OSError:
+                pass
+
+            start = timeit.default_timer()
+            records, source = self._find_records(filepath, lazy, cache, cache_key)
+            if records is not None:
+                lazy_counts.append(self._add_lazy_records(filepath, records, source, timeit.default_timer() - start))
+            elif processes:
+                process_filepaths.append(filepath)
+            else:
+                yield filepath
+
+        if process_filepaths:
+            for filepath in self._iter_process_filepaths(
+                process_filepaths, processes, mp_context, cache, cache_key, lazy_counts,
+            ):
+                yield filepath
+
+    @_synchronised
+    def _register_filepaths(self,
+                            filepaths,
+                            lazy=False,
+                            cache=None,
+                            workers=None,
+                            profile=False,
+                            processes=None,
+                            mp_context=None,
+                            save_cache=True):
+        """
+        Register any viable items found in <filepaths>, recording each file's mtime.
+        See register_path for argument details.
+        :param Iterable[str] filepaths: Normalised python filepaths.
+        :param bool save_cache: True to save <cache> afterwards, False if the caller will.
+        :return int: Number of registered items.
+        """
+        if (lazy or processes) and not self._supports_lazy_items():
+            LOGGER.debug('%s does not support lazy registration.', self)
+            lazy = False
+            processes = None
+
+        cache_key = get_factory_key(self) if cache is not None else None
+        if cache is not None and cache_key is None:
+            LOGGER.debug('%s does not support discovery caching.', self)
+
+        lazy_counts = []
+        import_filepaths = self._iter_unregistered_filepaths(
+            filepaths, lazy, cache, cache_key, processes, mp_context, lazy_counts,
+        )
+
+        items = []
+        item_filepaths = []
+        for result in utils.iter_import_results(import_filepaths, workers=workers, profile=profile):
+            filepath, module = result.filepath, result.module
+            viable_items = []
+            if module:
+                module_items = list(module.__dict__.values())
+                items.extend(module_items)
+                item_filepaths.extend([filepath] * len(module_items))
+                viable_items = [item for item in module_items if self._is_viable_item(item)]
+                if cache_key:
+                    cache.set(filepath, cache_key, [self._resolve_keys(item) for item in viable_items])
+
+            self._stats.add_file(FileStats(
+                filepath, FileSources.Import, result.seconds, len(viable_items), result.error, result.profile,
+            ))
+
+        if cache_key and save_cache:
+            cache.save()
+
+        return sum(lazy_counts) + sum(self._add_items(items, item_filepaths))
+
+    @_synchronised
+    def _register_discovered(self, path, recursive, workers, walk_seconds, files):
+        """
+        Register the items discovered in <path> on the factory's behalf (see DiscoveryHub), recording the path
+        and its files as register_path would.
+        :param str path: Walked path.
+        :param bool recursive: True if nested directories were walked.
+        :param int|None workers: Number of threads used, recorded for refresh.
+        :param float walk_seconds: Time taken to walk <path>.
+        :param list[tuple[ImportResult, float|None, list]] files: (import result, mtime, candidate items) of each
+            python file found.
+        :return int: Number of registered items.
+        """
+        path_files = self._add_path(path, recursive, False, None, workers)
+        self._stats.add_walk(path, walk_seconds, len(files))
+
+        items = []
+        item_filepaths = []
+        for result, mtime, file_items in files:
+            path_files.add(result.filepath)
+            if mtime is not None:
+                self._file_mtimes[result.filepath] = mtime
+            items.extend(file_items)
+            item_filepaths.extend([result.filepath] * len(file_items))
+            self._stats.add_file(FileStats(
+                result.filepath, FileSources.Import, result.seconds, len(file_items), result.error, result.profile,
+            ))
+
+        return sum(self._add_items(items, item_filepaths))
+
+    @_synchronised
+    def _add_path(self, path, recursive, lazy, cache, workers, profile=False, processes=None, mp_context=None):
+        """
+        Record <path> as registered (see refresh).
+        :return: Set to add the path's python filepaths to.
+        :rtype: set
+        """
+        path_key = (utils.normalise_path(path), recursive)
+        self._paths[path_key] = {
+            'lazy': lazy,
+            'cache': cache,
+            'workers': workers,
+            'profile': profile,
+            'processes': processes,
+            'mp_context': mp_context,
+        }
+        return self._path_files.setdefault(path_key, set())
+
+    def _iter_path_files(self, path, recursive, workers):
+        """
+        Iterate the python files found from <path> (see utils.iter_python_files), recording the walk time.
+        :rtype: Generator[str]
+        """
+        seconds = 0.0
+        count = 0
+        walker = utils.iter_python_files(path, recursive=recursive, workers=workers)
+        try:
+            while True:
+                start = timeit.default_timer()
+                try:
+                    filepath = next(walker)
+                except StopIteration:
+                    break
+                finally:
+                    seconds += timeit.default_timer() - start
+                count += 1
+                yield filepath
+        finally:
+            self._stats.add_walk(path, seconds, count)
+
+    def _forget_filepath(self, filepath):
+        """
+        Remove the items (registered or lazy) found in <filepath>.
+        :param str filepath: Normalised python filepath.
+        :return int: Number of removed items.
+        """
+        self._discard_lazy_items(filepath)
+        self._file_mtimes.pop(filepath, None)
+        return self._remove_entries(list(self._file_entries.get(filepath, ())))
+
+    def _resolve_keys(self, item):
+        return self.get_name(item), self.get_version(item)
+
+    def _get_attribute(self, item, attribute):
+        # If using instances, defer missing attributes to the class.
+        if self.item_mode == FactoryItemModes.Instances:
+            return getattr(item, attribute, getattr(type(item), attribute, _MISSING))
+        return getattr(item, attribute, _MISSING)
+
+    def _index_entries(self, entries):
+        """
+        Add <entries> to the name index.
+        :param Iterable[tuple] entries: (entry_id, item, name, version) entries to add.
+        """
+        grouped = collections.OrderedDict()
+        for entry_id, item, name, version in entries:
+            grouped.setdefault(name, []).append((entry_id, item, version))
+
+        for name, name_entries in grouped.items():
+            record = self._index.get(name)
+            if record is None:
+                self._name_search.add(name)
+            items = dict(record.items) if record else {}
+
+            changed = {}
+            for entry_id, item, version in name_entries:
+                if version not in changed:
+                    changed[version] = list(items.get(version, ()))
+                changed[version].append((entry_id, item))
+
+            for version, version_items in changed.items():
+                # Keep registration order, as refreshed entries may be older than those already indexed.
+                version_items.sort(key=_entry_id_getter)
+                items[version] = tuple(version_items)
+
+            if record is not None and len(items) == len(record.items):
+                versions = record.versions
+            else:
+                versions = _sort_versions(items)
+
+            # Records are replaced rather than mutated, so readers always see a consistent record.
+            self._index[name] = _NameRecord(versions, items)
+
+    def _unindex_entries(self, entries):
+        """
+        Remove <entries> from the name index.
+        :param Iterable[tuple] entries: (entry_id, name) entries to remove.
+        """
+        grouped = {}
+        for entry_id, name in entries:
+            grouped.setdefault(name, set()).add(entry_id)
+
+        for name, entry_ids in grouped.items():
+            record = self._index.get(name)
+            if record is None:
+                continue
+
+            items = {}
+            for version, version_items in record.items.items():
+                version_items = tuple(x for x in version_items if x[0] not in entry_ids)
+                if version_items:
+                    items[version] = version_items
+
+            if not items:
+                del self._index[name]
+                if name not in self._lazy_names:
+                    self._name_search.remove(name)
+            elif len(items) == len(record.items):
+                self._index[name] = _NameRecord(record.versions, items)
+            else:
+                self._index[name] = _NameRecord(_sort_versions(items), items)
+
     # --------------------------------------------------------------------------
     def get_name(self, item):
         """
@@ -157,78 +772,339 @@ class _AbstractFactory(object):
                     version = getattr(item, self._version_key)
             except AttributeError as e:
                 LOGGER.debug(
-                    'Failed to get Version from {} using '
-                    'version_identifier "{}" :: {}.'.format(item, self._version_key, e)
+                    'Failed to get Version from %s using version_identifier "%s" :: %s.',
+                    item, self._version_key, e,
                 )
         return version() if callable(version) else version
 
+    def _get(self, name, version):
+        """
+        Get the item matching <name> and <version> from the index, without loading lazy items.
+        :param str name: Name to get the item for.
+        :param int|float|VersionRange|None version: Version to get. None to get latest.
+        :return: Matching item, or _MISSING if <name> is not registered.
+        :rtype: type|object|None
+        """
+        record = self._index.get(name)
+        if record is None:
+            return _MISSING
+
+        # Return latest version
+        if version is None:
+            # Unorderable versions raise the TypeError max() would.
+            version = record.versions[-1] if record.versions is not None else max(record.items)
+            return record.items[version][-1][1]
+
+        if isinstance(version, VersionRange):
+            if not self._version_key:
+                return None
+            versions = record.versions
+            if versions is None:
+                # Unversioned (None) items are never in range, so aren't sorted.
+                versions = sorted(x for x in record.items if x is not None)
+            start, end = version.bisect(versions)
+            return record.items[versions[end - 1]][-1][1] if end > start else None
+
+        version_items = record.items.get(version)
+        return version_items[-1][1] if version_items else None
+
     def get(self, name, version=None):
         """
         Get the item matching <name> and <version>.
         If no version is provided, return the first item matching the given name.
+        If a VersionRange is provided, return the latest item in range.
         If no matching version is found, return None.
         :param str name: Name to get the item for.
-        :param int|float|None version: Version to get. None to get latest.
+        :param int|float|VersionRange|None version: Version to get. None to get latest.
         :rtype: type|object|None
         """
-        name_matches = (
-            item
-            for item in self._items
-            if self.get_name(item) == name
-        )
-        versions = {
-            self.get_version(item): item
-            for item in name_matches
-        }
-        if not versions:
-            LOGGER.warning('{} has no matching items for {}.'.format(self, name))
-            return None
+        metrics = self._metrics
+        if metrics is not None:
+            start = timeit.default_timer()
 
-        # Return latest version
-        if version is None:
-            return versions[max(versions)]
+        if name in self._lazy_names:
+            self._load_lazy_items([name])
+
+        item = self._get(name, version)
+        if item is _MISSING:
+            LOGGER.warning('%s has no matching items for %s.', self, name)
+            item = None
+
+        if metrics is not None:
+            metrics.record(name, version, item is not None, timeit.default_timer() - start)
+        return item
+
+    def get_many(self, requests):
+        """
+        Get the items matching each of <requests>, in a single pass.
+        Lazy items for all requested names are loaded together, and any unregistered names are
+        reported in a single warning.
+        :param Iterable[str|tuple] requests: Names, or (name, version) to get. Versions are as get.
+        :return: Matching item for each request, in order. None where no match is found.
+        :rtype: list[type|object|None]
+        """
+        requests = [
+            request if isinstance(request, tuple) else (request, None)
+            for request in requests
+        ]
+
+        metrics = self._metrics
+        if metrics is not None:
+            start = timeit.default_timer()
+
+        lazy_names = [name for name, _ in requests if name in self._lazy_names]
+        if lazy_names:
+            self._load_lazy_items(lazy_names)
 
-        return versions.get(version, None)
+        results = []
+        missing = []
+        for name, version in requests:
+            item = self._get(name, version)
+            if item is _MISSING:
+                if name not in missing:
+                    missing.append(name)
+                item = None
+            results.append(item)
+
+        if missing:
+            LOGGER.warning('%s has no matching items for %s.', self, ', '.join(str(x) for x in missing))
+
+        if metrics is not None:
+            # Lazy loading is shared, so each request is recorded with an equal share of the time.
+            seconds = (timeit.default_timer() - start) / max(len(requests), 1)
+            for (name, version), item in zip(requests, results):
+                metrics.record(name, version, item is not None, seconds)
+        return results
 
     def names(self):
         """
         Get all unique names for registered items.
         :rtype: list[str]
         """
-        results = {
-            self.get_name(item)
-            for item in self._items
-        }
-        return list(results)
+        # Lazy names are read first, as loading adds names to the index before discarding them.
+        lazy_names = list(self._lazy_names)
+        names = list(self._index)
+        index_names = set(names)
+        names.extend(name for name in lazy_names if name not in index_names)
+        return names
+
+    @_synchronised
+    def search_names(self, text, mode=NameSearchModes.Prefix, limit=None):
+        """
+        Search the registered (str) names for <text>, case-insensitively, without loading any lazy items.
+        The search index is kept up to date as items are registered and deregistered.
+        :param str text: Text to search for.
+        :param NameSearchModes|str mode: Prefix (names starting with <text>, alphabetically),
+            Substring (names containing <text>, earliest match first) or
+            Fuzzy (names containing the characters of <text> in order, best match first).
+        :param int|None limit: Maximum number of names to return. None for all.
+        :rtype: list[str]
+        """
+        return self._name_search.search(text, mode=mode, limit=limit)
 
-    def versions(self, name):
+    def versions(self, name, constraint=None):
         """
         Get all versions the registered item using <name> (descending).
         :param str name: Plugin name to get versions for.
+        :param VersionRange|None constraint: Only get versions in this range. None to get all versions.
         :rtype: list[int|float|None]
         """
         # If we're not able to detect versions, then we don't try to.
         if not self._version_key:
             return []
 
-        results = [
-            self.get_version(item)
-            for item in self._items
-            if self.get_name(item) == name
+        if name in self._lazy_names:
+            self._load_lazy_items([name])
+
+        record = self._index.get(name)
+        if record is None:
+            return []
+
+        versions = record.versions
+        if versions is None and constraint is not None:
+            # Unversioned (None) items are never in range, so aren't sorted.
+            versions = sorted(x for x in record.items if x is not None)
+        elif versions is None:
+            # Unorderable versions raise the TypeError sorting would.
+            versions = sorted(record.items)
+
+        if constraint is not None:
+            versions = constraint.filter(versions)
+
+        # Each registered item contributes its version, so duplicates are kept.
+        return [
+            version
+            for version in versions
+            for _ in record.items[version]
         ]
-        results.sort()
-        return results
 
     def items(self):
         """
         Get the registered items.
         :rtype: list[type|object]
         """
-        return list(self._items)
+        if self._lazy_files:
+            self._load_lazy_items()
+
+        snapshot = self._items_snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._items_snapshot
+                if snapshot is None:
+                    snapshot = self._items_snapshot = tuple(self._items.values())
+        return list(snapshot)
+
+    @_synchronised
+    def freeze(self):
+        """
+        Get an immutable snapshot of the registered items, with precomputed lookups.
+        Lazy items are loaded first. The snapshot is unaffected by later changes to this factory.
+        :rtype: FrozenFactory
+        """
+        if self._lazy_files:
+            self._load_lazy_items()
+
+        records = dict(
+            (name, (record.versions, dict(
+                (version, tuple(item for _, item in version_items))
+                for version, version_items in record.items.items()
+            )))
+            for name, record in self._index.items()
+        )
+        return FrozenFactory(
+            abstract=self._abstract,
+            name_key=self._name_key,
+            version_key=self._version_key,
+            item_mode=self._item_mode,
+            items=self._items.values(),
+            records=records,
+        )
 
+    @_synchronised
     def clear(self):
         """Clear the registered items."""
-        del self._items[:]
+        self._items.clear()
+        self._items_snapshot = ()
+        self._members.clear()
+        self._keys.clear()
+        self._lazy_files.clear()
+        self._lazy_names.clear()
+        self._lazy_manifests.clear()
+        self._paths.clear()
+        self._path_files.clear()
+        self._file_mtimes.clear()
+        self._file_entries.clear()
+        self._entry_files.clear()
+        self._stats.clear()
+        self._index.clear()
+        self._name_search.clear()
+        for attribute_index in self._attribute_indexes.values():
+            attribute_index.clear()
+
+    @_synchronised
+    def refresh_keys(self, item=None):
+        """
+        Re-resolve the name, version and indexed attributes (see add_index) of <item> (or all items if None given).
+        These are resolved once on registration, so this is only needed if they have changed since.
+        :param type|object|None item: Registered item to refresh. None to refresh all items.
+        :return int: Number of registered entries whose name or version changed.
+        """
+        if item is None:
+            entry_ids = list(self._items)
+        else:
+            entry_ids = list(self._members.get(_membership_key(item), ()))
+
+        changed = []
+        for entry_id in entry_ids:
+            keys = self._resolve_keys(self._items[entry_id])
+            if keys != self._keys[entry_id]:
+                changed.append((entry_id, keys))
+
+        self._unindex_entries([
+            (entry_id, self._keys[entry_id][0])
+            for entry_id, _ in changed
+        ])
+        for entry_id, keys in changed:
+            self._keys[entry_id] = keys
+        self._index_entries([
+            (entry_id, self._items[entry_id], name, version)
+            for entry_id, (name, version) in changed
+        ])
+
+        for attribute, attribute_index in self._attribute_indexes.items():
+            for entry_id in entry_ids:
+                attribute_index.remove(entry_id)
+                attribute_index.add(entry_id, self._get_attribute(self._items[entry_id], attribute))
+
+        return len(changed)
+
+    @_synchronised
+    def add_index(self, attribute):
+        """
+        Index registered items by the value of <attribute>, so find() can match it without checking every item.
+        The index is kept up to date as items are registered and deregistered.
+        :param str attribute: Item attribute to index.
+        :return: True if the index was added, False if <attribute> is already indexed.
+        :rtype: bool
+        """
+        if attribute in self._attribute_indexes:
+            return False
+
+        attribute_index = _AttributeIndex()
+        for entry_id, item in self._items.items():
+            attribute_index.add(entry_id, self._get_attribute(item, attribute))
+        self._attribute_indexes[attribute] = attribute_index
+        return True
+
+    @_synchronised
+    def remove_index(self, attribute):
+        """
+        Remove the <attribute> index (see add_index).
+        :param str attribute: Indexed item attribute.
+        :return: True if the index was removed.
+        :rtype: bool
+        """
+        return self._attribute_indexes.pop(attribute, None) is not None
+
+    @_synchronised
+    def find(self, where=None, predicate=None):
+        """
+        Find the registered items matching all of <where> and <predicate>, in registration order.
+        Indexed attributes (see add_index) are matched from their index, others by checking each item.
+        Attribute values are compared as they are (methods are not called). Items missing an attribute don't match.
+        :param dict|None where: {attribute: value} that items must be equal to.
+        :param Callable|None predicate: Callable accepting an item, returning True if it matches.
+        :rtype: list[type|object]
+        """
+        if self._lazy_files:
+            self._load_lazy_items()
+
+        entry_ids = None
+        unindexed = []
+        for attribute, value in (where or {}).items():
+            attribute_index = self._attribute_indexes.get(attribute)
+            if attribute_index is None:
+                unindexed.append((attribute, value))
+                continue
+
+            attribute_entry_ids = attribute_index.find(value)
+            entry_ids = attribute_entry_ids if entry_ids is None else entry_ids & attribute_entry_ids
+            if not entry_ids:
+                return []
+
+        if entry_ids is None:
+            entries = self._items.items()
+        else:
+            entries = [(entry_id, self._items[entry_id]) for entry_id in sorted(entry_ids)]
+
+        results = []
+        for _, item in entries:
+            if any(not self._get_attribute(item, attribute) == value for attribute, value in unindexed):
+                continue
+            elif predicate is not None and not predicate(item):
+                continue
+            results.append(item)
+        return results
 
     # --------------------------------------------------------------------------
     def register_item(self, item):
@@ -242,6 +1118,15 @@ class _AbstractFactory(object):
             return True
         return False
 
+    def register_items(self, items):
+        """
+        Register each of <items> with the factory, in a single pass.
+        :param Iterable[type|object] items: Plugins to register with the factory.
+        :return: True for each item that was registered successfully, in the order given.
+        :rtype: list[bool]
+        """
+        return self._add_items(items)
+
     def deregister_item(self, item):
         """
         Deregister <item> from the factory.
@@ -261,32 +1146,222 @@ class _AbstractFactory(object):
         :param ModuleType module: Path to use.
         :return int: Number of registered items.
         """
-        count = 0
-
         if not isinstance(module, types.ModuleType):
-            return count
+            return 0
 
-        for item in module.__dict__.values():
-            count += self._add_item(item)
-
-        return count
+        return sum(self._add_items(list(module.__dict__.values())))
 
-    def register_path(self, path, recursive=True):
+    @_synchronised
+    def register_path(self,
+                      path,
+                      recursive=True,
+                      lazy=False,
+                      cache=None,
+                      workers=None,
+                      profile=False,
+                      processes=None,
+                      mp_context=None):
         """
         Find and register any viable items found in <path>.
         :param str path: Path to use.
         :param bool recursive: True to search nested directories. False to only search immediate files.
+        :param bool lazy: True to find items statically, only importing a file once an item from it is requested.
+            Files that can't be analysed statically are imported immediately.
+            Only supported by type factories using str name and version keys, otherwise ignored.
+            Items imported (rather than defined) by a file are not found statically.
+        :param DiscoveryCache|None cache: Discovery cache to use. Unchanged files found in <cache> are not imported,
+            but registered lazily (or skipped if they have no viable items). Other files are added to <cache>,
+            which is saved afterwards.
+            Only supported by factories using str name and version keys, otherwise ignored.
+        :param int|None workers: Number of threads to list directories and compile files with. None to do so serially.
+            Modules are always executed (and their items registered) serially, in order.
+        :param bool profile: True to profile each file's import with cProfile (see stats).
+        :param int|None processes: Number of worker processes to import files in, only sending back the name and
+            version of each viable item. Items are registered lazily, so files are only imported into this
+            process once an item from them is requested. Files with no viable items are never imported.
+            Used for files not found in <cache> (or statically, if <lazy>). None to import in this process.
+            Only supported by type factories using str name and version keys, otherwise ignored.
+        :param multiprocessing.context.BaseContext|str|None mp_context: Context, or start method name (ie "spawn",
+            "forkserver" or "fork"), to start <processes> with. None to spawn them.
+            Spawned workers run sys.executable, so within an application embedding python (ie a DCC) either call
+            multiprocessing.set_executable with its python interpreter first, or use another start method.
+            Ignored before Python 3.7, which uses the platform default.
         :return int: Number of registered items.
         """
-        count = 0
+        path_files = self._add_path(path, recursive, lazy, cache, workers, profile, processes, mp_context)
 
-        for filepath in utils.iter_python_files(path, recursive=recursive):
-            module = utils.import_from_filepath(filepath)
-            if module:
-                count += self.register_module(module)
+        def iter_filepaths():
+            for filepath in self._iter_path_files(path, recursive, workers):
+                path_files.add(filepath)
+                yield filepath
+
+        return self._register_filepaths(
+            iter_filepaths(),
+            lazy=lazy,
+            cache=cache,
+            workers=workers,
+            profile=profile,
+            processes=processes,
+            mp_context=mp_context,
+        )
 
+    @_synchronised
+    def register_manifest(self, filepath, verify=True):
+        """
+        Register the items recorded in the manifest at <filepath> (see export_manifest), without discovery.
+        Items are registered lazily, with each file only imported once an item from it is requested, resolving
+        its items by qualified name.
+        :param str filepath: Manifest filepath.
+        :param bool verify: True to check each file's content hash when imported. Changed files (or files whose
+            items can't be resolved) are warned about, and all their viable items registered instead.
+        :raises ValueError: If <filepath> is not a supported manifest, was exported by a differently
+            configured factory, or the factory uses callable name or version keys.
+        :return int: Number of registered items.
+        """
+        count = 0
+        for source_filepath, content_hash, records in manifest.read_manifest(filepath, get_factory_key(self)):
+            if source_filepath in self._lazy_files:
+                continue
+            count += self._add_lazy_items(source_filepath, [(name, version) for _, name, version in records])
+            self._lazy_manifests[source_filepath] = (
+                content_hash if verify else None,
+                [qualname for qualname, _, _ in records],
+            )
         return count
 
+    @_synchronised
+    def export_manifest(self, filepath):
+        """
+        Write the registered items found in python files (see register_path) to a manifest at <filepath>,
+        recording each item's name, version, source file and qualified name, and each file's content hash.
+        Lazy items are imported first. Items registered directly (see register_item and register_module),
+        or with names or versions that are not json serialisable, are not exported.
+        :param str filepath: Manifest (json) filepath to write.
+        :raises ValueError: If the factory uses callable name or version keys.
+        :return int: Number of exported items.
+        """
+        factory_key = get_factory_key(self)
+        if factory_key is None:
+            raise ValueError('{} uses callable name or version keys, so does not support manifests.'.format(self))
+
+        if self._lazy_files:
+            self._load_lazy_items()
+
+        files = collections.OrderedDict()
+        for entry_id, item in self._items.items():
+            source_filepath = self._entry_files.get(entry_id)
+            if source_filepath is None:
+                continue
+            name, version = self._keys[entry_id]
+            files.setdefault(source_filepath, []).append(
+                (manifest.get_item_qualname(source_filepath, item), name, version)
+            )
+        return manifest.write_manifest(filepath, factory_key, files)
+
+    def paths(self):
+        """
+        Get the registered paths (see register_path), normalised.
+        :rtype: list[tuple[str, bool]]
+        :return: (path, recursive) for each registered path.
+        """
+        return list(self._paths)
+
+    def stats(self):
+        """
+        Get the discovery statistics of registered paths, recording each python file's import (or scan) time,
+        viable item count and any import failure, as well as directory walk times.
+        :rtype: DiscoveryStats
+        """
+        return self._stats
+
+    def enable_metrics(self):
+        """
+        Start recording lookup metrics (see metrics), counting each get (and each get_many request) as a hit
+        or miss per name, with its latency. Lookups are not timed whilst metrics are disabled.
+        :return: Lookup metrics, kept if already enabled.
+        :rtype: LookupMetrics
+        """
+        if self._metrics is None:
+            self._metrics = LookupMetrics()
+        return self._metrics
+
+    def disable_metrics(self):
+        """Stop recording lookup metrics, discarding any recorded."""
+        self._metrics = None
+
+    def metrics(self):
+        """
+        Get the lookup metrics, if enabled (see enable_metrics).
+        :rtype: LookupMetrics|None
+        """
+        return self._metrics
+
+    @_synchronised
+    def refresh(self, filepaths=None):
+        """
+        Update the items found in registered paths, only for the files that have been added, modified
+        or deleted since they were registered (or last refreshed).
+        Items from modified or deleted files are deregistered, and added or modified files are registered
+        again, using the options of the path's register_path call.
+        :param Iterable[str]|None filepaths: Only check these (possibly deleted) files, ie from filesystem events.
+            Files outside of registered paths are ignored. None to check every file in the registered paths.
+        :return int: Number of changed files.
+        """
+        if filepaths is not None:
+            filepaths = {utils.normalise_path(filepath) for filepath in filepaths}
+
+        handled = set()
+        for path_key, options in list(self._paths.items()):
+            path, recursive = path_key
+            previous = self._path_files.get(path_key, set())
+
+            # A change to the registered path itself (ie, a replaced zip archive) checks all of its files.
+            if filepaths is None or path in filepaths:
+                scope = None
+                found = self._iter_path_files(path, recursive, options['workers'])
+            else:
+                scope = {filepath for filepath in filepaths if _path_contains(path_key, filepath)}
+                found = sorted(
+                    filepath
+                    for filepath in scope
+                    if utils.PYTHON_FILENAME_PATTERN.match(os.path.basename(filepath))
+                )
+
+            current = collections.OrderedDict()
+            for filepath in found:
+                try:
+                    current[filepath] = utils.get_mtime(filepath)
+                except OSError:
+                    continue
+
+            stale = [
+                filepath
+                for filepath in previous
+                if filepath not in handled
+                and (scope is None or filepath in scope)
+                and current.get(filepath) != self._file_mtimes.get(filepath)
+            ]
+            changed = [
+                filepath
+                for filepath, mtime in current.items()
+                if filepath not in handled and (filepath not in previous or mtime != self._file_mtimes.get(filepath))
+            ]
+
+            for filepath in stale:
+                LOGGER.debug('Refreshing items from "%s".', filepath)
+                self._forget_filepath(filepath)
+
+            if scope is None:
+                self._path_files[path_key] = set(current)
+            else:
+                self._path_files[path_key] = (previous - scope) | set(current)
+
+            self._register_filepaths(changed, **options)
+            handled.update(stale)
+            handled.update(changed)
+
+        return len(handled)
+
 
 # ------------------------------------------------------------------------------
 class AbstractTypeFactory(_AbstractFactory):
@@ -305,7 +1380,7 @@ class AbstractTypeFactory(_AbstractFactory):
         If callable given, will expect the callable to accept the item as an argument and will use the returned value.
         If None given, versioning will not be supported (first registered item will only be used).
     :param bool unique_items_only: True to only store unique items, False to support non-unique.
-        Uniqueness is a list membership test (list.__contains__).
+        Uniqueness is a hash membership test, falling back to identity for unhashable items.
 
     """
 
@@ -343,7 +1418,7 @@ class AbstractInstanceFactory(_AbstractFactory):
         If callable given, will expect the callable to accept the item as an argument and will use the returned value.
         If None given, versioning will not be supported (first registered item will only be used).
     :param bool unique_items_only: True to only store unique items, False to support non-unique.
-        Uniqueness is a list membership test (list.__contains__).
+        Uniqueness is a hash membership test, falling back to identity for unhashable items.
 
     """
 
@@ -0,0 +1,198 @@
+"""
+Read-only factory snapshots, for lookups once a factory is fully registered (see `freeze`).
+
+Lookup tables are precomputed when frozen, so `get` is a single dictionary lookup and `names`, `versions`
+and `items` return prebuilt tuples. Snapshots never change, so are safe to share between threads without locking.
+"""
+from .constants import LOGGER
+from .versioning import VersionRange
+
+
+# Placeholder for unregistered names.
+_MISSING = object()
+
+
+def _frozen(*args, **kwargs):
+    raise TypeError('FrozenFactory is read-only.')
+
+
+# ------------------------------------------------------------------------------
+class _FrozenRecord(object):
+    """Precomputed lookups for a single name."""
+
+    __slots__ = ('latest', 'versions', 'items', 'all_versions')
+
+    def __init__(self, versions, items):
+        """
+        :param tuple|None versions: Distinct versions sorted ascending, or None if not orderable.
+        :param dict items: {version: (item, ...)} in registration order.
+        """
+        self.versions = versions
+        self.items = dict((version, version_items[-1]) for version, version_items in items.items())
+
+        # Unorderable versions raise the TypeError max() would when the latest is requested.
+        self.latest = self.items[versions[-1]] if versions is not None else _MISSING
+        self.all_versions = None if versions is None else tuple(
+            version
+            for version in versions
+            for _ in items[version]
+        )
+
+
+# ------------------------------------------------------------------------------
+class FrozenFactory(object):
+    """
+    Immutable snapshot of a factory's items, created with `freeze`.
+    Supports the same lookups as the factory it was created from, but raises TypeError on any registration.
+
+    :param type abstract: Abstract type of the frozen factory.
+    :param str|Callable name_key: Item name identifier of the frozen factory.
+    :param str|Callable|None version_key: Item version identifier of the frozen factory.
+    :param FactoryItemModes|str item_mode: Item mode of the frozen factory.
+    :param Iterable[type|object] items: Registered items, in registration order.
+    :param dict records: {name: (versions, {version: (item, ...)})}, versions being sorted ascending or None
+        if not orderable.
+
+    """
+
+    __slots__ = ('_abstract', '_name_key', '_version_key', '_item_mode', '_items', '_names', '_records')
+
+    def __init__(self, abstract, name_key, version_key, item_mode, items, records):
+        set_attr = super(FrozenFactory, self).__setattr__
+        set_attr('_abstract', abstract)
+        set_attr('_name_key', name_key)
+        set_attr('_version_key', version_key)
+        set_attr('_item_mode', item_mode)
+        set_attr('_items', tuple(items))
+        set_attr('_names', tuple(records))
+        set_attr('_records', dict(
+            (name, _FrozenRecord(versions, name_items))
+            for name, (versions, name_items) in records.items()
+        ))
+
+    def __repr__(self):
+        return '{}(items={})'.format(type(self).__name__, len(self._items))
+
+    def __setattr__(self, name, value):
+        _frozen()
+
+    def __delattr__(self, name):
+        _frozen()
+
+    # Registration (or any other modification) is not supported.
+    register_item = register_items = deregister_item = _frozen
+    register_module = register_path = register_manifest = refresh = refresh_keys = clear = _frozen
+    add_index = remove_index = enable_metrics = disable_metrics = _frozen
+
+    # --------------------------------------------------------------------------
+    @property
+    def abstract(self):
+        return self._abstract
+
+    @property
+    def name_key(self):
+        return self._name_key
+
+    @property
+    def version_key(self):
+        return self._version_key
+
+    @property
+    def item_mode(self):
+        return self._item_mode
+
+    # --------------------------------------------------------------------------
+    def _get(self, name, version):
+        record = self._records.get(name)
+        if record is None:
+            return _MISSING
+
+        if version is None:
+            if record.latest is _MISSING:
+                return record.items[max(record.items)]
+            return record.latest
+
+        if isinstance(version, VersionRange):
+            if not self._version_key:
+                return None
+            versions = record.versions
+            if versions is None:
+                # Unversioned (None) items are never in range, so aren't sorted.
+                versions = sorted(x for x in record.items if x is not None)
+            start, end = version.bisect(versions)
+            return record.items[versions[end - 1]] if end > start else None
+
+        return record.items.get(version)
+
+    def get(self, name, version=None):
+        """
+        Get the item matching <name> and <version>, as the frozen factory's get.
+        :param str name: Name to get the item for.
+        :param int|float|VersionRange|None version: Version to get. None to get latest.
+        :rtype: type|object|None
+        """
+        item = self._get(name, version)
+        if item is _MISSING:
+            LOGGER.warning('%s has no matching items for %s.', self, name)
+            return None
+        return item
+
+    def get_many(self, requests):
+        """
+        Get the items matching each of <requests>, as the frozen factory's get_many.
+        :param Iterable[str|tuple] requests: Names, or (name, version) to get.
+        :rtype: list[type|object|None]
+        """
+        results = []
+        missing = []
+        for request in requests:
+            name, version = request if isinstance(request, tuple) else (request, None)
+            item = self._get(name, version)
+            if item is _MISSING:
+                if name not in missing:
+                    missing.append(name)
+                item = None
+            results.append(item)
+
+        if missing:
+            LOGGER.warning('%s has no matching items for %s.', self, ', '.join(str(x) for x in missing))
+        return results
+
+    def names(self):
+        """
+        Get all unique names for registered items.
+        :rtype: tuple[str]
+        """
+        return self._names
+
+    def versions(self, name, constraint=None):
+        """
+        Get all versions of the registered item using <name>, as the frozen factory's versions.
+        :param str name: Plugin name to get versions for.
+        :param VersionRange|None constraint: Only get versions in this range. None to get all versions.
+        :rtype: list[int|float|None]
+        """
+        if not self._version_key:
+            return []
+
+        record = self._records.get(name)
+        if record is None:
+            return []
+
+        versions = record.all_versions
+        if versions is None and constraint is not None:
+            # Unversioned (None) items are never in range, so aren't sorted.
+            versions = sorted(x for x in record.items if x is not None)
+        elif versions is None:
+            # Unorderable versions raise the TypeError sorting would.
+            versions = sorted(record.items)
+        if constraint is not None:
+            versions = constraint.filter(versions)
+        return list(versions)
+
+    def items(self):
+        """
+        Get the registered items.
+        :rtype: tuple[type|object]
+        """
+        return self._items
@@ -0,0 +1,198 @@
+"""
+Single pass discovery for many factories, so discovery cost doesn't grow with the number of factories.
+
+A `DiscoveryHub` walks and imports a path once on behalf of all its subscribed factories. Each discovered object
+is classified against every subscribed abstract in one step, by checking its `__mro__` against a map of
+abstract to factories, and dispatched to the matching factories only.
+
+.. code-block:: python
+
+    >>> hub = DiscoveryHub([validator_factory, publisher_factory])
+    >>> hub.register_path('c:/tools/plugins')
+    OrderedDict([(validator_factory, 12), (publisher_factory, 4)])
+
+Abstracts using `abc.ABCMeta` may have virtual subclasses, so are checked with issubclass (or isinstance) instead.
+"""
+import abc
+import collections
+import inspect
+import threading
+import timeit
+import types
+
+from . import utils
+from .constants import FactoryItemModes
+
+
+# ------------------------------------------------------------------------------
+class DiscoveryHub(object):
+    """
+    Discover items for many factories in a single pass.
+    Items are dispatched by each factory's abstract, then registered as the factory's own register_path would.
+
+    :param Iterable[_AbstractFactory]|None factories: Factories to subscribe.
+
+    """
+
+    def __init__(self, factories=None):
+        self._lock = threading.Lock()
+        self._factories = ()
+        # Replaced (rather than modified) on subscription, so discovery can read them without locking.
+        self._types = {}  # {abstract: (factory, ...)}
+        self._instances = {}  # {abstract: (factory, ...)}
+        self._checked = ()  # ((abstract, item_mode, (factory, ...)), ...) checked with issubclass/isinstance.
+
+        for factory in factories or ():
+            self.subscribe(factory)
+
+    def __repr__(self):
+        return '{}(factories={})'.format(type(self).__name__, len(self._factories))
+
+    def __len__(self):
+        return len(self._factories)
+
+    def __contains__(self, factory):
+        return factory in self._factories
+
+    # --------------------------------------------------------------------------
+    @property
+    def factories(self):
+        return self._factories
+
+    # --------------------------------------------------------------------------
+    def _update_maps(self, factories):
+        types_map = collections.defaultdict(list)
+        instances_map = collections.defaultdict(list)
+        checked = collections.OrderedDict()
+        for factory in factories:
+            abstract = factory.abstract
+            if isinstance(abstract, abc.ABCMeta):
+                checked.setdefault((abstract, factory.item_mode), []).append(factory)
+            elif factory.item_mode == FactoryItemModes.Types:
+                types_map[abstract].append(factory)
+            else:
+                instances_map[abstract].append(factory)
+
+        self._factories = tuple(factories)
+        self._types = dict((key, tuple(value)) for key, value in types_map.items())
+        self._instances = dict((key, tuple(value)) for key, value in instances_map.items())
+        self._checked = tuple((key[0], key[1], tuple(value)) for key, value in checked.items())
+
+    def _classify(self, objects):
+        """
+        Classify <objects> against the subscribed abstracts.
+        :param Iterable objects: Objects to classify, ie a module's values.
+        :return: {factory: [item, ...]} of the probable viable items of each factory, in the order given.
+        :rtype: dict[_AbstractFactory, list]
+        """
+        types_map = self._types
+        instances_map = self._instances
+        checked = self._checked
+        results = collections.defaultdict(list)
+        for obj in objects:
+            # An item is never viable for its own abstract, so its first mro entry is skipped.
+            if inspect.isclass(obj):
+                mro = getattr(obj, '__mro__', ())[1:]
+                abstract_map = types_map
+            else:
+                mro = getattr(type(obj), '__mro__', ())[1:]
+                abstract_map = instances_map
+
+            if abstract_map:
+                for base in mro:
+                    for factory in abstract_map.get(base, ()):
+                        results[factory].append(obj)
+
+            for abstract, item_mode, factories in checked:
+                if item_mode == FactoryItemModes.Types:
+                    viable = inspect.isclass(obj) and obj is not abstract and issubclass(obj, abstract)
+                else:
+                    viable = not inspect.isclass(obj) and type(obj) is not abstract and isinstance(obj, abstract)
+                if viable:
+                    for factory in factories:
+                        results[factory].append(obj)
+        return results
+
+    # --------------------------------------------------------------------------
+    def subscribe(self, factory):
+        """
+        Subscribe <factory>, to receive items from later discoveries.
+        :param _AbstractFactory factory: Factory to subscribe.
+        :return: True if <factory> was subscribed, False if already subscribed.
+        :rtype: bool
+        """
+        with self._lock:
+            if factory in self._factories:
+                return False
+            self._update_maps(self._factories + (factory,))
+            return True
+
+    def unsubscribe(self, factory):
+        """
+        Unsubscribe <factory>. Its already registered items are kept.
+        :param _AbstractFactory factory: Factory to unsubscribe.
+        :return: True if <factory> was unsubscribed, False if not subscribed.
+        :rtype: bool
+        """
+        with self._lock:
+            if factory not in self._factories:
+                return False
+            self._update_maps([x for x in self._factories if x is not factory])
+            return True
+
+    def register_module(self, module):
+        """
+        Find and register any viable items found in <module>, for each subscribed factory.
+        :param ModuleType module: Module to use.
+        :return: Number of registered items, per factory.
+        :rtype: collections.OrderedDict[_AbstractFactory, int]
+        """
+        factories = self._factories
+        if not isinstance(module, types.ModuleType):
+            return collections.OrderedDict((factory, 0) for factory in factories)
+
+        candidates = self._classify(list(module.__dict__.values()))
+        return collections.OrderedDict(
+            (factory, sum(factory._add_items(candidates.get(factory, ()))))
+            for factory in factories
+        )
+
+    def register_path(self, path, recursive=True, workers=None, profile=False):
+        """
+        Find and register any viable items found in <path>, for each subscribed factory.
+        The path is walked and each python file imported once, with each factory recording the path as its own
+        register_path would, so it can be refreshed (see refresh).
+        :param str path: Path to use.
+        :param bool recursive: True to search nested directories. False to only search immediate files.
+        :param int|None workers: Number of threads to list directories and compile files with. None to do so serially.
+        :param bool profile: True to profile each file's import with cProfile (see stats).
+        :return: Number of registered items, per factory.
+        :rtype: collections.OrderedDict[_AbstractFactory, int]
+        """
+        factories = self._factories
+
+        start = timeit.default_timer()
+        filepaths = list(utils.iter_python_files(path, recursive=recursive, workers=workers))
+        walk_seconds = timeit.default_timer() - start
+
+        mtimes = {}
+
+        def iter_filepaths():
+            for filepath in filepaths:
+                try:
+                    mtimes[filepath] = utils.get_mtime(filepath)
+                except OSError:
+                    pass
+                yield filepath
+
+        files = collections.defaultdict(list)  # {factory: [(ImportResult, mtime, [item, ...]), ...]}
+        for result in utils.iter_import_results(iter_filepaths(), workers=workers, profile=profile):
+            candidates = self._classify(list(result.module.__dict__.values())) if result.module else {}
+            mtime = mtimes.get(result.filepath)
+            for factory in factories:
+                files[factory].append((result, mtime, candidates.get(factory, [])))
+
+        return collections.OrderedDict(
+            (factory, factory._register_discovered(path, recursive, workers, walk_seconds, files[factory]))
+            for factory in factories
+        )
@@ -0,0 +1,176 @@
+"""
+Isolated (out-of-process) discovery, so plugins (and their dependencies) are only imported into the main process once an
+item from them is requested (see `register_path(processes=...)`).
+
+Python files are imported in a pool of worker processes, which only send back an `ItemRecord` for each viable
+item found. The main process registers the records lazily, importing a file once one of its items is requested.
+Files that fail to be discovered out-of-process (ie, if the abstract can't be pickled) are imported as usual.
+"""
+import collections
+import multiprocessing
+import pickle
+import sys
+import timeit
+
+from . import utils
+from .constants import LOGGER
+
+
+# Discovery record of an item found by a worker process.
+# qualname: Qualified name of the item within the file's module.
+ItemRecord = collections.namedtuple('ItemRecord', ['filepath', 'qualname', 'name', 'version'])
+
+# Largest number of files sent to a worker process at once.
+_MAX_CHUNK_SIZE = 64
+
+_factories = {}  # {(abstract, name_key, version_key): factory}, for the worker process.
+
+
+# ------------------------------------------------------------------------------
+def get_qualname(module, attribute, item):
+    """
+    Get the qualified name that resolves <item> from <module>.
+    :param ModuleType module: Module <item> was found in.
+    :param str attribute: Module attribute <item> was found as.
+    :param type item: Item to get the qualified name of.
+    :return: <item>'s __qualname__ if it resolves from <module>, otherwise <attribute> (ie, for aliases).
+    :rtype: str
+    """
+    qualname = getattr(item, '__qualname__', None)
+    if qualname:
+        obj = module
+        for part in qualname.split('.'):
+            obj = getattr(obj, part, None)
+        if obj is item:
+            return qualname
+    return attribute
+
+
+def resolve_qualname(module, qualname):
+    """
+    Resolve <qualname> from <module> (see get_qualname).
+    :param ModuleType module: Module to resolve from.
+    :param str qualname: Qualified name to resolve.
+    :raises AttributeError: If <qualname> is not in <module>.
+    :rtype: type
+    """
+    obj = module
+    for part in qualname.split('.'):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _get_factory(spec):
+    factory = _factories.get(spec)
+    if factory is None:
+        from .core import AbstractTypeFactory
+
+        abstract, name_key, version_key = spec
+        factory = _factories[spec] = AbstractTypeFactory(abstract, name_key=name_key, version_key=version_key)
+    return factory
+
+
+def discover_filepaths(spec, filepaths):
+    """
+    Import each of <filepaths>, getting a record of each viable item found. Called in worker processes.
+    :param tuple spec: (abstract, name_key, version_key) of the factory to discover items for.
+    :param list[str] filepaths: Normalised python filepaths.
+    :return: (filepath, records, seconds) of each of <filepaths>. Records are None if the file failed to import.
+    :rtype: list[tuple[str, list[ItemRecord]|None, float]]
+    """
+    factory = _get_factory(spec)
+    results = []
+    for filepath in filepaths:
+        start = timeit.default_timer()
+        module = utils.import_from_filepath(filepath)
+        records = None
+        if module is not None:
+            records = []
+            seen = set()
+            for attribute, item in list(module.__dict__.items()):
+                if id(item) in seen or not factory._is_viable_item(item):
+                    continue
+                seen.add(id(item))
+                name, version = factory._resolve_keys(item)
+                records.append(ItemRecord(filepath, get_qualname(module, attribute, item), name, version))
+        results.append((filepath, records, timeit.default_timer() - start))
+    return results
+
+
+def _get_mp_context(mp_context=None):
+    """
+    Get the multiprocessing context to start worker processes with.
+    Unless given, workers are spawned rather than forked, as forked workers inherit the main process's state
+    (ie, its imported modules and held locks), so may deadlock or find items in modules it had already imported.
+    :param multiprocessing.context.BaseContext|str|None mp_context: Context, or start method name, to use.
+        None to spawn.
+    :return: Context, or None if ProcessPoolExecutor doesn't support one (Python 2.7 and before 3.7 have
+        no mp_context argument, so use the platform default).
+    :rtype: multiprocessing.context.BaseContext|None
+    """
+    if sys.version_info < (3, 7):
+        return None
+    elif mp_context is None or isinstance(mp_context, utils.basestring):
+        return multiprocessing.get_context(mp_context or 'spawn')
+    return mp_context
+
+
+def _create_executor(executor_cls, processes, mp_context=None):
+    """
+    Create a pool of <processes> worker processes, started with <mp_context> (see _get_mp_context).
+    :param type executor_cls: ProcessPoolExecutor.
+    :param int processes: Number of worker processes.
+    :param multiprocessing.context.BaseContext|str|None mp_context: Context, or start method name, to use.
+    :rtype: concurrent.futures.ProcessPoolExecutor
+    """
+    mp_context = _get_mp_context(mp_context)
+    if mp_context is None:
+        return executor_cls(max_workers=processes)
+    return executor_cls(max_workers=processes, mp_context=mp_context)
+
+
+def iter_discovered_filepaths(factory, filepaths, processes, mp_context=None):
+    """
+    Discover the viable items of <factory> in each of <filepaths> using <processes> worker processes.
+    :param _AbstractFactory factory: Type factory using str name and version keys.
+    :param Iterable[str] filepaths: Normalised python filepaths.
+    :param int processes: Number of worker processes.
+    :param multiprocessing.context.BaseContext|str|None mp_context: Context, or start method name, to start
+        worker processes with. None to spawn.
+    :return: (filepath, records, seconds) for each of <filepaths>, in the order given. Records are None if the
+        file couldn't be discovered out-of-process.
+    :rtype: Generator[tuple[str, list[ItemRecord]|None, float]]
+    """
+    filepaths = list(filepaths)
+    if not filepaths:
+        return
+
+    spec = (factory.abstract, factory.name_key, factory.version_key)
+    try:
+        from concurrent.futures import ProcessPoolExecutor
+        pickle.dumps(spec)
+    except Exception as e:
+        LOGGER.debug('%s does not support out-of-process discovery :: %s.', factory, e)
+        for filepath in filepaths:
+            yield filepath, None, 0.0
+        return
+
+    chunk_size = max(1, min(_MAX_CHUNK_SIZE, len(filepaths) // (processes * 4)))
+    chunks = [filepaths[index:index + chunk_size] for index in range(0, len(filepaths), chunk_size)]
+
+    executor = _create_executor(ProcessPoolExecutor, processes, mp_context)
+    futures = []
+    try:
+        futures = [executor.submit(discover_filepaths, spec, chunk) for chunk in chunks]
+        for chunk, future in zip(chunks, futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                LOGGER.debug('Failed to discover %s file(s) out-of-process :: %s.', len(chunk), e)
+                results = [(filepath, None, 0.0) for filepath in chunk]
+            for result in results:
+                yield result
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -0,0 +1,206 @@
+"""
+Prebuilt registry manifests, so processes using a fixed set of plugins can skip discovery entirely.
+
+A manifest records the (name, version) of each registered item alongside its source file, qualified name within
+that file and the file's content hash (see `export_manifest`). Registering a manifest (see `register_manifest`)
+only reads the manifest, registering its items lazily. Files are imported once an item from them is requested,
+resolving their items by qualified name. Files whose content hash no longer matches (or whose items can't be
+resolved) have drifted, so are warned about and have all their viable items registered instead.
+
+Source filepaths under the manifest's directory are stored relative to it, so releases can be relocated.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+from . import isolated, utils
+from .cache import _SERIALISABLE_TYPES
+from .constants import LOGGER
+
+
+MANIFEST_FORMAT_VERSION = 1
+
+
+# ------------------------------------------------------------------------------
+def get_content_hash(filepath):
+    """
+    Get the sha1 hash of <filepath>'s contents, which may be within a zip archive.
+    :param str filepath: Filepath to hash.
+    :rtype: str
+    """
+    return hashlib.sha1(utils.read_file(filepath)).hexdigest()
+
+
+def get_item_qualname(filepath, item):
+    """
+    Get the qualified name that resolves <item> from the module imported from <filepath>.
+    :param str filepath: Normalised python filepath <item> was found in.
+    :param type|object item: Item to get the qualified name of.
+    :return: Qualified name, or None if not found.
+    :rtype: str|None
+    """
+    module = utils.get_cached_module(filepath)
+    if module is not None:
+        for attribute, value in list(module.__dict__.items()):
+            if value is item:
+                return isolated.get_qualname(module, attribute, item)
+    return getattr(item, '__qualname__', None) if isinstance(item, type) else None
+
+
+def _is_serialisable(value):
+    if isinstance(value, tuple):
+        return all(_is_serialisable(x) for x in value)
+    return isinstance(value, _SERIALISABLE_TYPES)
+
+
+def _from_json(value):
+    # Tuples are written as lists, which are unhashable.
+    if isinstance(value, list):
+        return tuple(_from_json(x) for x in value)
+    return value
+
+
+def _check_factory_key(factory_key):
+    # Callable name or version keys can't be compared, so their items can't be verified.
+    if factory_key is None:
+        raise ValueError('Manifests are not supported by factories using callable name or version keys.')
+
+
+def _to_manifest_path(directory, filepath):
+    try:
+        relative_path = os.path.relpath(filepath, directory)
+    except ValueError:
+        # On a different drive.
+        return filepath
+    if relative_path.startswith(os.pardir):
+        return filepath
+    return relative_path.replace(os.sep, '/')
+
+
+# ------------------------------------------------------------------------------
+def write_manifest(filepath, factory_key, files):
+    """
+    Write a manifest of <files> to <filepath>, replacing it atomically.
+    Items with names or versions that are not json serialisable are not written.
+    :param str filepath: Manifest (json) filepath.
+    :param str factory_key: Key of the exporting factory (see get_factory_key).
+    :param dict[str, list[tuple]] files: {source filepath: [(qualname, name, version), ...]}.
+    :raises ValueError: If <factory_key> is None (ie, the factory uses callable keys).
+    :return int: Number of written items.
+    """
+    _check_factory_key(factory_key)
+    directory = os.path.dirname(os.path.abspath(filepath))
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    root = utils.normalise_path(directory)
+
+    count = 0
+    manifest_files = []
+    for source_filepath, records in files.items():
+        items = []
+        for qualname, name, version in records:
+            if qualname is None or not (_is_serialisable(name) and _is_serialisable(version)):
+                LOGGER.warning('Skipping "%s" from "%s", which is not serialisable.', name, source_filepath)
+                continue
+            items.append([qualname, name, version])
+        if not items:
+            continue
+
+        manifest_files.append({
+            'path': _to_manifest_path(root, source_filepath),
+            'hash': get_content_hash(source_filepath),
+            'items': items,
+        })
+        count += len(items)
+
+    fd, temp_filepath = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as fp:
+            json.dump(
+                {'version': MANIFEST_FORMAT_VERSION, 'factory': factory_key, 'files': manifest_files},
+                fp,
+                separators=(',', ':'),
+            )
+        getattr(os, 'replace', os.rename)(temp_filepath, filepath)
+    except Exception:
+        if os.path.exists(temp_filepath):
+            os.remove(temp_filepath)
+        raise
+    return count
+
+
+def _load_manifest(filepath):
+    """
+    Load the manifest at <filepath>, without checking the exporting factory.
+    :rtype: tuple[dict, list[tuple[str, str, list[tuple]]]]
+    :return: (manifest data, files), see read_manifest.
+    """
+    with open(filepath, 'r') as fp:
+        data = json.load(fp)
+
+    if not isinstance(data, dict) or data.get('version') != MANIFEST_FORMAT_VERSION:
+        raise ValueError('"{}" is not a supported manifest.'.format(filepath))
+
+    root = os.path.dirname(os.path.abspath(filepath))
+    files = []
+    for manifest_file in data.get('files', ()):
+        items = [(qualname, _from_json(name), _from_json(version)) for qualname, name, version in manifest_file['items']]
+        source_filepath = utils.normalise_path(os.path.join(root, manifest_file['path']))
+        files.append((source_filepath, manifest_file['hash'], items))
+    return data, files
+
+
+def read_manifest(filepath, factory_key):
+    """
+    Read the manifest at <filepath>.
+    :param str filepath: Manifest (json) filepath.
+    :param str factory_key: Key of the registering factory (see get_factory_key), which must match
+        the exporting factory's.
+    :raises ValueError: If <filepath> is not a supported manifest, was exported by a different factory,
+        or <factory_key> is None (ie, the factory uses callable keys).
+    :return: (source filepath, content hash, [(qualname, name, version), ...]) of each file.
+    :rtype: list[tuple[str, str, list[tuple]]]
+    """
+    _check_factory_key(factory_key)
+    data, files = _load_manifest(filepath)
+    if data.get('factory') != factory_key:
+        raise ValueError('"{}" was exported by a different factory ({}).'.format(filepath, data.get('factory')))
+    return files
+
+
+def check_manifest(filepath):
+    """
+    Get the source files of the manifest at <filepath> that have drifted (changed or missing) since exported.
+    :param str filepath: Manifest (json) filepath.
+    :rtype: list[str]
+    """
+    drifted = []
+    for source_filepath, content_hash, _ in _load_manifest(filepath)[1]:
+        try:
+            if get_content_hash(source_filepath) == content_hash:
+                continue
+        except (IOError, OSError):
+            pass
+        drifted.append(source_filepath)
+    return drifted
+
+
+def resolve_items(module, filepath, content_hash, qualnames):
+    """
+    Resolve the manifest items of <filepath> from its imported <module>.
+    :param ModuleType module: Module imported from <filepath>.
+    :param str filepath: Normalised python filepath.
+    :param str|None content_hash: Expected content hash. None to not check.
+    :param list[str] qualnames: Qualified names of the items to resolve.
+    :return: Resolved items, or None if <filepath> has drifted.
+    :rtype: list|None
+    """
+    try:
+        if content_hash is not None and get_content_hash(filepath) != content_hash:
+            LOGGER.warning('"%s" has changed since its manifest was exported.', filepath)
+            return None
+        return [isolated.resolve_qualname(module, qualname) for qualname in qualnames]
+    except (IOError, OSError, AttributeError) as e:
+        LOGGER.warning('Failed to resolve manifest items from "%s" :: %s.', filepath, e)
+        return None
@@ -0,0 +1,118 @@
+"""
+Lookup metrics, to see how a factory is queried (see `enable_metrics`).
+
+Each `get` (and each request of `get_many`) is counted as a hit or miss, per name, and its latency added
+to a histogram. Callbacks can be added to receive each lookup as it happens.
+"""
+import bisect
+import collections
+import threading
+
+from .constants import LOGGER
+
+
+# Upper bounds (in seconds) of the latency histogram buckets. The last bucket is unbounded.
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2, 1e-1, float('inf'))
+
+
+# ------------------------------------------------------------------------------
+class LookupMetrics(object):
+    """Counters and latency histogram of a factory's lookups. Safe to update from multiple threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._names = collections.Counter()
+        self._buckets = [0] * len(LATENCY_BUCKETS)
+        self._callbacks = []
+
+    def __repr__(self):
+        return '{}(hits={}, misses={})'.format(type(self).__name__, self._hits, self._misses)
+
+    # --------------------------------------------------------------------------
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def lookups(self):
+        return self._hits + self._misses
+
+    # --------------------------------------------------------------------------
+    def record(self, name, version, hit, seconds):
+        """
+        Record a lookup, calling any callbacks.
+        :param str name: Looked up name.
+        :param int|float|VersionRange|None version: Looked up version.
+        :param bool hit: True if an item was found.
+        :param float seconds: Lookup latency.
+        """
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+            self._names[name] += 1
+            self._buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            callbacks = self._callbacks
+
+        for callback in callbacks:
+            try:
+                callback(name, version, hit, seconds)
+            except Exception as e:
+                LOGGER.exception('%s callback failed :: %s.', self, e)
+
+    def add_callback(self, callback):
+        """
+        Add <callback>, to be called with (name, version, hit, seconds) after each lookup.
+        Callbacks are called from the looking up thread, so should be quick.
+        :param Callable callback: Callback to add.
+        """
+        with self._lock:
+            # Replaced rather than mutated, so record can iterate without the lock.
+            self._callbacks = self._callbacks + [callback]
+
+    def remove_callback(self, callback):
+        """
+        Remove <callback> (see add_callback).
+        :param Callable callback: Callback to remove.
+        :return: True if <callback> was removed.
+        :rtype: bool
+        """
+        with self._lock:
+            if callback not in self._callbacks:
+                return False
+            self._callbacks = [x for x in self._callbacks if x is not callback]
+            return True
+
+    def reset(self):
+        """Reset all counters. Callbacks are kept."""
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._names.clear()
+            self._buckets = [0] * len(LATENCY_BUCKETS)
+
+    # --------------------------------------------------------------------------
+    def name_counts(self, count=None):
+        """
+        Get the number of lookups per name, most looked up first.
+        :param int|None count: Number of names to get. None for all.
+        :rtype: list[tuple[str, int]]
+        """
+        with self._lock:
+            return self._names.most_common(count)
+
+    def histogram(self):
+        """
+        Get the lookup latency histogram.
+        :rtype: list[tuple[float, int]]
+        :return: (upper bound in seconds, lookup count) of each bucket.
+        """
+        with self._lock:
+            return list(zip(LATENCY_BUCKETS, self._buckets))
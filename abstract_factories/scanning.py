@@ -0,0 +1,369 @@
+"""
+Static (import-free) discovery of abstract subclasses, to support lazy path registration.
+
+Python files are parsed with `ast` to find class definitions that probably subclass the abstract, along
+with their literal name and version values. Files are only imported once an item from them is requested.
+If a file can't be analysed statically, None is returned, and the file is expected to be imported instead.
+"""
+import ast
+import collections
+import os
+
+try:
+    import __builtin__ as builtins
+except ImportError:
+    import builtins
+
+from . import utils
+
+
+_BUILTIN_NAMES = frozenset(dir(builtins))
+_SCOPED_NODES = (ast.FunctionDef, getattr(ast, 'AsyncFunctionDef', ast.FunctionDef), ast.ClassDef)
+
+
+class _Unresolved(Exception):
+    """Raised when a class or attribute can't be resolved statically."""
+
+
+class _Missing(Exception):
+    """Raised when a class attribute is statically known to not exist."""
+
+
+# ------------------------------------------------------------------------------
+def _get_base_name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    elif isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _get_loaded_subclasses(abstract):
+    """
+    Get the already imported subclasses of <abstract> (including <abstract>), by name.
+    :param type abstract: Abstract type to use.
+    :rtype: dict[str, type]
+    """
+    results = {abstract.__name__: abstract}
+    stack = [abstract]
+    while stack:
+        cls = stack.pop()
+        for subclass in type.__subclasses__(cls):
+            if subclass.__name__ not in results:
+                results[subclass.__name__] = subclass
+                stack.append(subclass)
+    return results
+
+
+def _get_bound_names(node):
+    """
+    Get the names bound by the module level statement <node>, other than class definitions.
+    :param ast.AST node: Statement to check.
+    :rtype: list[str]
+    """
+    if isinstance(node, (ast.FunctionDef, getattr(ast, 'AsyncFunctionDef', ast.FunctionDef))):
+        return [node.name]
+    elif isinstance(node, (ast.Import, ast.ImportFrom)):
+        return [(alias.asname or alias.name).split('.')[0] for alias in node.names]
+
+    targets = []
+    if isinstance(node, ast.Assign):
+        targets = node.targets
+    elif isinstance(node, (ast.AugAssign, getattr(ast, 'AnnAssign', ast.AugAssign))):
+        targets = [node.target]
+
+    names = []
+    for target in targets:
+        for child in ast.walk(target):
+            if isinstance(child, ast.Name):
+                names.append(child.id)
+    return names
+
+
+def _get_loaded_names(node):
+    """
+    Get the names (and attribute names) loaded by the module level statement <node>.
+    Names that are only called (ie, to instance a class) are not included.
+    :param ast.AST node: Statement to check.
+    :rtype: set[str]
+    """
+    children = list(ast.walk(node))
+    called = set(id(child.func) for child in children if isinstance(child, ast.Call))
+
+    names = set()
+    for child in children:
+        if id(child) in called:
+            continue
+        elif isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load):
+            names.add(child.id)
+        elif isinstance(child, ast.Attribute) and isinstance(child.ctx, ast.Load):
+            names.add(child.attr)
+    return names
+
+
+def _iter_class_bound_names(node):
+    """
+    Iterate the names bound in the class scope by the class body statement <node>, including within nested
+    blocks. Function, lambda and class bodies have their own scope, so are not searched.
+    :param ast.AST node: Statement to check.
+    :rtype: Iterator[str]
+    """
+    stack = [node]
+    while stack:
+        child = stack.pop()
+        if isinstance(child, _SCOPED_NODES):
+            yield child.name
+            continue
+        elif isinstance(child, ast.Lambda):
+            continue
+        elif isinstance(child, ast.Name) and not isinstance(child.ctx, ast.Load):
+            yield child.id
+        elif isinstance(child, (ast.Import, ast.ImportFrom)):
+            for alias in child.names:
+                yield (alias.asname or alias.name).split('.')[0]
+        elif isinstance(child, ast.Global):
+            for name in child.names:
+                yield name
+        elif isinstance(child, ast.ExceptHandler) and isinstance(child.name, utils.basestring):
+            yield child.name
+        stack.extend(ast.iter_child_nodes(child))
+
+
+def _has_nested_class(node):
+    """
+    Get if module level statement <node> conditionally defines a class (ie, in an if or try block).
+    :param ast.AST node: Statement to check.
+    :rtype: bool
+    """
+    if isinstance(node, _SCOPED_NODES):
+        return False
+    return any(isinstance(child, ast.ClassDef) for child in ast.walk(node))
+
+
+def _get_assigned_targets(statement):
+    """
+    Get the targets of class body statement <statement>, if a plain assignment to names.
+    :param ast.AST statement: Statement to check.
+    :rtype: list[ast.Name]|None
+    """
+    if isinstance(statement, ast.Assign) and all(isinstance(target, ast.Name) for target in statement.targets):
+        return statement.targets
+    elif (
+        isinstance(statement, getattr(ast, 'AnnAssign', ()))
+        and statement.value is not None
+        and isinstance(statement.target, ast.Name)
+    ):
+        return [statement.target]
+    return None
+
+
+def _resolve_loaded_attribute(class_name, key, loaded):
+    """
+    Resolve the value of <key> for the already imported class <class_name>.
+    :param str class_name: Name of the class to resolve.
+    :param str key: Class attribute to resolve.
+    :param dict[str, type] loaded: Already imported classes.
+    :rtype: any
+    """
+    cls = loaded.get(class_name)
+    if cls is None:
+        # Builtin bases (ie object) don't define custom keys.
+        if class_name in _BUILTIN_NAMES:
+            raise _Missing(key)
+        raise _Unresolved(class_name)
+    try:
+        value = getattr(cls, key)
+    except AttributeError:
+        raise _Missing(key)
+    if callable(value) or isinstance(value, property):
+        raise _Unresolved(key)
+    return value
+
+
+def _resolve_class_body(node, key):
+    """
+    Resolve the literal value of <key> assigned in the body of class <node>, ignoring its bases.
+    :param ast.ClassDef node: Class to resolve.
+    :param str key: Class attribute to resolve.
+    :rtype: any
+    """
+    found = False
+    value = None
+    for statement in node.body:
+        targets = _get_assigned_targets(statement)
+        if targets is None:
+            # Methods, properties, nested classes, and conditional, unpacked or augmented assignments.
+            if key in _iter_class_bound_names(statement):
+                raise _Unresolved(key)
+        elif any(target.id == key for target in targets):
+            try:
+                value = ast.literal_eval(statement.value)
+            except ValueError:
+                raise _Unresolved(key)
+            found = True
+
+    if not found:
+        raise _Missing(key)
+    return value
+
+
+def _resolve_attribute(class_name, key, classes, loaded, seen=None):
+    """
+    Resolve the literal value of <key> for <class_name>, following local and loaded base classes.
+    :param str class_name: Name of the class to resolve.
+    :param str key: Class attribute to resolve.
+    :param dict[str, ast.ClassDef] classes: Classes defined in the file.
+    :param dict[str, type] loaded: Already imported classes to defer to.
+    :param set|None seen: Class names already visited.
+    :rtype: any
+    """
+    seen = set() if seen is None else seen
+    if class_name in seen:
+        raise _Unresolved(class_name)
+    seen.add(class_name)
+
+    node = classes.get(class_name)
+    if node is None:
+        return _resolve_loaded_attribute(class_name, key, loaded)
+
+    try:
+        return _resolve_class_body(node, key)
+    except _Missing:
+        pass
+
+    for base in node.bases:
+        try:
+            return _resolve_attribute(_get_base_name(base), key, classes, loaded, seen)
+        except _Missing:
+            continue
+
+    raise _Missing(key)
+
+
+def _is_probable_subclass(node, classes, candidates, loaded):
+    """
+    Get if module level class <node> probably subclasses the abstract, from its bases.
+    :param ast.ClassDef node: Class to check.
+    :param dict[str, ast.ClassDef] classes: Classes defined in the file so far.
+    :param dict[str, ast.ClassDef] candidates: Probable subclasses defined in the file so far.
+    :param dict[str, type] loaded: Already imported subclasses of the abstract.
+    :raises _Unresolved: If a base can't be resolved, so may itself subclass the abstract.
+    :rtype: bool
+    """
+    probable = False
+    for base in node.bases:
+        base_name = _get_base_name(base)
+        if base_name is None:
+            raise _Unresolved(node.name)
+        elif base_name in candidates or (base_name not in classes and base_name in loaded):
+            probable = True
+        elif base_name not in classes and base_name not in _BUILTIN_NAMES:
+            raise _Unresolved(base_name)
+    return probable
+
+
+def _find_candidates(tree, loaded):
+    """
+    Find the module level classes of <tree> that probably subclass the abstract.
+    :param ast.Module tree: Parsed module.
+    :param dict[str, type] loaded: Already imported subclasses of the abstract.
+    :raises _Unresolved: If the module's subclasses can't be found statically.
+    :return: (classes, candidates) by name.
+    :rtype: tuple[dict[str, ast.ClassDef], collections.OrderedDict[str, ast.ClassDef]]
+    """
+    classes = {}
+    candidates = collections.OrderedDict()
+    bound_names = set()
+    loaded_names = set()
+    watched_names = set(loaded)
+
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and any(alias.name == '*' for alias in node.names):
+            raise _Unresolved('*')
+        elif _has_nested_class(node):
+            raise _Unresolved(node)
+        elif not isinstance(node, ast.ClassDef):
+            bound_names.update(_get_bound_names(node))
+            loaded_names.update(_get_loaded_names(node))
+            if isinstance(node, ast.ImportFrom):
+                watched_names.update(alias.asname for alias in node.names if alias.asname and alias.name in loaded)
+            continue
+
+        probable = _is_probable_subclass(node, classes, candidates, loaded)
+        classes[node.name] = node
+        candidates.pop(node.name, None)
+        if probable:
+            # Decorators may replace or register the class.
+            if node.decorator_list:
+                raise _Unresolved(node.name)
+            candidates[node.name] = node
+
+    # Candidates rebound after definition are not what the module exposes.
+    if bound_names.intersection(candidates):
+        raise _Unresolved(candidates)
+
+    # Subclasses may be created dynamically, ie with type() or a factory function.
+    watched_names.update(candidates)
+    if loaded_names.intersection(watched_names):
+        raise _Unresolved(loaded_names)
+
+    return classes, candidates
+
+
+def _get_record(class_name, classes, loaded, name_key, version_key):
+    """
+    Resolve the (name, version) of candidate class <class_name>.
+    :param str class_name: Name of the class to resolve.
+    :param dict[str, ast.ClassDef] classes: Classes defined in the file.
+    :param dict[str, type] loaded: Already imported classes to defer to.
+    :param str name_key: Class attribute used for item names.
+    :param str|None version_key: Class attribute used for item versions.
+    :raises TypeError: If the name is not hashable.
+    :rtype: tuple
+    """
+    if name_key == '__name__':
+        name = class_name
+    else:
+        name = _resolve_attribute(class_name, name_key, classes, loaded)
+    hash(name)
+
+    version = None
+    if version_key:
+        try:
+            version = _resolve_attribute(class_name, version_key, classes, loaded)
+        except _Missing:
+            pass
+    return name, version
+
+
+# ------------------------------------------------------------------------------
+def scan_filepath(filepath, abstract, name_key='__name__', version_key=None):
+    """
+    Statically find the (name, version) of classes in <filepath> that probably subclass <abstract>, without
+    importing it.
+    Only module level classes are considered, and only literal name and version values are supported.
+    :param str filepath: Python (.py) filepath to scan.
+    :param type abstract: Abstract type to find subclasses of.
+    :param str name_key: Class attribute used for item names.
+    :param str|None version_key: Class attribute used for item versions. None if versioning is not supported.
+    :return: (name, version) for each probable subclass, or None if <filepath> can't be analysed statically.
+    :rtype: list[tuple]|None
+    """
+    if os.path.splitext(filepath)[1] != '.py':
+        return None
+
+    try:
+        tree = ast.parse(utils.read_file(filepath), filepath)
+    except (SyntaxError, ValueError, TypeError, IOError, OSError):
+        return None
+
+    loaded = _get_loaded_subclasses(abstract)
+    results = []
+    try:
+        classes, candidates = _find_candidates(tree, loaded)
+        for class_name in candidates:
+            results.append(_get_record(class_name, classes, loaded, name_key, version_key))
+    except (_Unresolved, _Missing, TypeError):
+        return None
+
+    return results
@@ -0,0 +1,208 @@
+"""
+Incrementally maintained name search, for autocompleting registered item names (ie, in tool UIs).
+
+Names are matched case-insensitively. Prefix searches walk a trie, whilst substring and fuzzy searches
+narrow candidates with character n-gram indexes before checking them.
+"""
+from .constants import NameSearchModes
+from .utils import basestring
+
+
+_END = None  # Trie node key holding the names ending at that node.
+_NGRAM_SIZE = 3
+
+
+def _fold(text):
+    return text.casefold() if hasattr(text, 'casefold') else text.lower()
+
+
+def _iter_ngrams(text, size):
+    for index in range(len(text) - size + 1):
+        yield text[index:index + size]
+
+
+def _fuzzy_score(query, text):
+    """
+    Score how well <query> fuzzily matches <text>, with all <query> characters appearing in order.
+    Consecutive characters and early matches score higher.
+    :param str query: Folded query.
+    :param str text: Folded text.
+    :return: Score, or None if <query> doesn't match.
+    :rtype: int|None
+    """
+    score = 0
+    position = -1
+    streak = 0
+    for char in query:
+        index = text.find(char, position + 1)
+        if index < 0:
+            return None
+        streak = streak + 1 if index == position + 1 else 0
+        score += 1 + streak * 2 - min(index - position - 1, 3)
+        position = index
+    return score * 100 - len(text)
+
+
+# ------------------------------------------------------------------------------
+class NameSearchIndex(object):
+    """Search index of (str) names, supporting prefix, substring and fuzzy searches."""
+
+    def __init__(self):
+        self._trie = {}
+        self._names = {}  # {name: folded_name}
+        self._chars = {}  # {char: {name, ...}}
+        self._ngrams = {}  # {ngram: {name, ...}}
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    # --------------------------------------------------------------------------
+    def add(self, name):
+        """
+        Add <name> to the index. Non-str names are ignored.
+        :param str name: Name to add.
+        """
+        if not isinstance(name, basestring) or name in self._names:
+            return
+
+        folded = _fold(name)
+        self._names[name] = folded
+
+        node = self._trie
+        for char in folded:
+            node = node.setdefault(char, {})
+        node.setdefault(_END, set()).add(name)
+
+        for char in set(folded):
+            self._chars.setdefault(char, set()).add(name)
+        for ngram in set(_iter_ngrams(folded, _NGRAM_SIZE)):
+            self._ngrams.setdefault(ngram, set()).add(name)
+
+    def remove(self, name):
+        """
+        Remove <name> from the index, if indexed.
+        :param str name: Name to remove.
+        """
+        folded = self._names.pop(name, None) if isinstance(name, basestring) else None
+        if folded is None:
+            return
+
+        # Remove the name and prune now empty nodes.
+        path = [self._trie]
+        for char in folded:
+            path.append(path[-1][char])
+        path[-1][_END].discard(name)
+        if not path[-1][_END]:
+            del path[-1][_END]
+        for index in range(len(folded) - 1, -1, -1):
+            if path[index + 1]:
+                break
+            del path[index][folded[index]]
+
+        for char in set(folded):
+            self._discard(self._chars, char, name)
+        for ngram in set(_iter_ngrams(folded, _NGRAM_SIZE)):
+            self._discard(self._ngrams, ngram, name)
+
+    @staticmethod
+    def _discard(mapping, key, name):
+        names = mapping[key]
+        names.discard(name)
+        if not names:
+            del mapping[key]
+
+    def clear(self):
+        """Remove all names from the index."""
+        self._trie.clear()
+        self._names.clear()
+        self._chars.clear()
+        self._ngrams.clear()
+
+    # --------------------------------------------------------------------------
+    def _prefix(self, query, limit):
+        node = self._trie
+        for char in query:
+            node = node.get(char)
+            if node is None:
+                return []
+
+        results = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if _END in node:
+                results.extend(sorted(node[_END]))
+                if limit is not None and len(results) >= limit:
+                    break
+            stack.extend(node[char] for char in sorted((x for x in node if x is not _END), reverse=True))
+        return results
+
+    def _candidates(self, query, ngrams):
+        """
+        Get the names that may match <query>, from its rarest n-grams (or characters).
+        :param str query: Folded query.
+        :param bool ngrams: True to narrow by n-grams (substring), False by characters (fuzzy).
+        :rtype: set|list
+        """
+        if ngrams and len(query) >= _NGRAM_SIZE:
+            mapping, keys = self._ngrams, set(_iter_ngrams(query, _NGRAM_SIZE))
+        else:
+            mapping, keys = self._chars, set(query)
+
+        sets = []
+        for key in keys:
+            names = mapping.get(key)
+            if not names:
+                return []
+            sets.append(names)
+        if not sets:
+            return list(self._names)
+
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def _substring(self, query):
+        matches = []
+        for name in self._candidates(query, ngrams=True):
+            index = self._names[name].find(query)
+            if index >= 0:
+                matches.append((index, self._names[name], name))
+        matches.sort()
+        return [name for _, _, name in matches]
+
+    def _fuzzy(self, query):
+        matches = []
+        for name in self._candidates(query, ngrams=False):
+            score = _fuzzy_score(query, self._names[name])
+            if score is not None:
+                matches.append((-score, self._names[name], name))
+        matches.sort()
+        return [name for _, _, name in matches]
+
+    def search(self, text, mode=NameSearchModes.Prefix, limit=None):
+        """
+        Search the indexed names for <text>, case-insensitively.
+        :param str text: Text to search for.
+        :param NameSearchModes|str mode: Prefix (names starting with <text>, alphabetically),
+            Substring (names containing <text>, earliest match first) or
+            Fuzzy (names containing the characters of <text> in order, best match first).
+        :param int|None limit: Maximum number of names to return. None for all.
+        :rtype: list[str]
+        """
+        query = _fold(text)
+        if mode == NameSearchModes.Prefix:
+            results = self._prefix(query, limit)
+        elif mode == NameSearchModes.Substring:
+            results = self._substring(query)
+        elif mode == NameSearchModes.Fuzzy:
+            results = self._fuzzy(query)
+        else:
+            raise ValueError(
+                'Search mode expected to be one of {}. Received {}.'.format(
+                    (NameSearchModes.Prefix, NameSearchModes.Substring, NameSearchModes.Fuzzy), mode,
+                )
+            )
+        return results if limit is None else results[:limit]
@@ -0,0 +1,138 @@
+"""
+Discovery statistics, to find the files that make registering paths slow (see `stats`).
+
+Each python file found by `register_path` (or `refresh`) is recorded with how it was handled, the time taken,
+its number of viable items and any import failure. Imports can also be profiled with cProfile
+(see `register_path(profile=True)`).
+"""
+import collections
+
+
+# Discovery record of a single file.
+# source: How the file was handled (see constants.FileSources).
+# seconds: Time taken to import or scan the file.
+# items: Number of viable items found.
+# error: Exception raised importing the file, or None.
+# profile: pstats.Stats of the file's import, if profiled.
+FileStats = collections.namedtuple('FileStats', ['filepath', 'source', 'seconds', 'items', 'error', 'profile'])
+
+
+# ------------------------------------------------------------------------------
+class DiscoveryStats(object):
+    """Record of the directory walks and files of a factory's path registrations."""
+
+    def __init__(self):
+        self._walks = collections.OrderedDict()  # {path: [seconds, file_count]}
+        self._files = collections.OrderedDict()  # {filepath: FileStats}
+
+    def __repr__(self):
+        return '{}(files={}, failures={})'.format(type(self).__name__, len(self._files), len(self.failures()))
+
+    def __len__(self):
+        return len(self._files)
+
+    # --------------------------------------------------------------------------
+    @property
+    def walk_time(self):
+        """Total seconds spent finding python files."""
+        return sum(seconds for seconds, _ in self._walks.values())
+
+    @property
+    def import_time(self):
+        """Total seconds spent importing (or scanning) python files."""
+        return sum(file_stats.seconds for file_stats in self._files.values())
+
+    # --------------------------------------------------------------------------
+    def add_walk(self, path, seconds, file_count):
+        """
+        Record walking <path> for python files. Repeated walks accumulate.
+        :param str path: Walked path.
+        :param float seconds: Time taken.
+        :param int file_count: Number of python files found.
+        """
+        walk = self._walks.setdefault(path, [0.0, 0])
+        walk[0] += seconds
+        walk[1] = file_count
+
+    def add_file(self, file_stats):
+        """
+        Record a file, replacing any previous record of it (ie, when refreshed).
+        :param FileStats file_stats: File record.
+        """
+        self._files.pop(file_stats.filepath, None)
+        self._files[file_stats.filepath] = file_stats
+
+    def clear(self):
+        """Clear all records."""
+        self._walks.clear()
+        self._files.clear()
+
+    # --------------------------------------------------------------------------
+    def walks(self):
+        """
+        Get the walked paths.
+        :rtype: list[tuple[str, float, int]]
+        :return: (path, seconds, file_count) of each walked path.
+        """
+        return [(path, seconds, file_count) for path, (seconds, file_count) in self._walks.items()]
+
+    def files(self):
+        """
+        Get the recorded files, in the order they were handled.
+        :rtype: list[FileStats]
+        """
+        return list(self._files.values())
+
+    def get(self, filepath):
+        """
+        Get the record of <filepath>.
+        :param str filepath: Normalised python filepath.
+        :rtype: FileStats|None
+        """
+        return self._files.get(filepath)
+
+    def failures(self):
+        """
+        Get the files that failed to import.
+        :rtype: list[FileStats]
+        """
+        return [file_stats for file_stats in self._files.values() if file_stats.error is not None]
+
+    def slowest(self, count=10):
+        """
+        Get the slowest <count> files, slowest first.
+        :param int count: Number of files to get.
+        :rtype: list[FileStats]
+        """
+        return sorted(self._files.values(), key=lambda x: x.seconds, reverse=True)[:count]
+
+    def report(self, count=10):
+        """
+        Get a readable summary, listing the slowest <count> files and all failures.
+        :param int count: Number of slowest files to list.
+        :rtype: str
+        """
+        sources = collections.Counter(file_stats.source for file_stats in self._files.values())
+        lines = [
+            'Walked {} path(s) in {:.3f}s.'.format(len(self._walks), self.walk_time),
+            'Handled {} file(s) in {:.3f}s ({}).'.format(
+                len(self._files),
+                self.import_time,
+                ', '.join('{} {}'.format(number, source) for source, number in sorted(sources.items())),
+            ),
+        ]
+
+        slowest = self.slowest(count)
+        if slowest:
+            lines.append('Slowest files:')
+            lines.extend(
+                '  {:.3f}s  {:>3} item(s)  {:<6}  {}'.format(x.seconds, x.items, x.source, x.filepath)
+                for x in slowest
+            )
+
+        failures = self.failures()
+        if failures:
+            lines.append('Failures:')
+            lines.extend('  {} :: {!r}'.format(x.filepath, x.error) for x in failures)
+
+        return '\n'.join(lines)
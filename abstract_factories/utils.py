@@ -1,15 +1,20 @@
+import collections
 import inspect
+import marshal
 import os
 import re
 import sys
+import threading
+import timeit
 import types
 import uuid
+import zipfile
 
 from .constants import LOGGER
 
 
 try:
-    basestring
+    basestring = basestring
 except NameError:
     basestring = str
 
@@ -19,23 +24,64 @@ PYTHON_FILENAME_PATTERN = re.compile(
     r'\.py[c]?$'        # Ends with .py, .pyc
 )
 
+# Result of importing a single file (see iter_import_results).
+# seconds: Time taken to compile and execute the file.
+# error: Exception raised by the import, or None if successful.
+# profile: pstats.Stats of the import, if profiled.
+ImportResult = collections.namedtuple('ImportResult', ['filepath', 'module', 'seconds', 'error', 'profile'])
+
+# Zip archives (including wheels and eggs) that python files can be found in, without extracting them.
+ARCHIVE_FILENAME_PATTERN = re.compile(r'.*\.(zip|whl|egg)$', re.IGNORECASE)
+_ARCHIVE_MEMBER_PATTERN = re.compile(r'\.(zip|whl|egg)[\\/]', re.IGNORECASE)
+
+# Size of the .pyc header preceding the marshalled code.
+if sys.version_info >= (3, 7):
+    _PYC_HEADER_SIZE = 16
+elif sys.version_info >= (3, 3):
+    _PYC_HEADER_SIZE = 12
+else:
+    _PYC_HEADER_SIZE = 8
+
+try:
+    from importlib.util import MAGIC_NUMBER as _PYC_MAGIC_NUMBER
+except ImportError:
+    # noinspection PyUnresolvedReferences
+    import imp
+    _PYC_MAGIC_NUMBER = imp.get_magic()
+
 
 # ------------------------------------------------------------------------------
 # Generate a python version compatible import from file function
 if sys.version_info >= (3, 5):
+    from importlib.machinery import SourceFileLoader, SourcelessFileLoader
     import importlib.util
 
-    def _import_from_filepath(module_name, filepath):
+    def _compile_from_filepath(filepath):
+        ext = os.path.splitext(filepath)[1]
+        if ext == '.py':
+            loader = SourceFileLoader('__compile__', filepath)
+        elif ext == '.pyc':
+            loader = SourcelessFileLoader('__compile__', filepath)
+        else:
+            raise ImportError('File type "{}" not supported (.py or .pyc only).'.format(ext))
+        return loader.get_code('__compile__')
+
+    def _import_from_filepath(module_name, filepath, code=None):
         spec = importlib.util.spec_from_file_location(module_name, filepath)
         module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+        if code is None:
+            spec.loader.exec_module(module)
+        else:
+            exec(code, module.__dict__)
         return module
 
 elif sys.version_info >= (3, 0):
     from importlib.machinery import SourceFileLoader
     import importlib.util
 
-    def _import_from_filepath(module_name, filepath):
+    _compile_from_filepath = None
+
+    def _import_from_filepath(module_name, filepath, code=None):
         ext = os.path.splitext(filepath)[1]
         if ext == '.py':
             module = SourceFileLoader(module_name, filepath).load_module()
@@ -52,7 +98,9 @@ else:
     # noinspection PyUnresolvedReferences
     import imp
 
-    def _import_from_filepath(module_name, filepath):
+    _compile_from_filepath = None
+
+    def _import_from_filepath(module_name, filepath, code=None):
         ext = os.path.splitext(filepath)[1]
         if ext == '.py':
             module = imp.load_source(module_name, filepath)
@@ -64,6 +112,185 @@ else:
         return module
 
 
+# ------------------------------------------------------------------------------
+# Open archives, so their central directory is only read once per change (see close_archives).
+# Members are read while locked, so archives aren't closed mid-read (and python 2 archives aren't read concurrently).
+_archives = {}  # {archive_path: (mtime, size, ZipFile)}
+_archives_lock = threading.RLock()
+
+
+def _open_archive(archive_path):
+    stat = os.stat(archive_path)
+    with _archives_lock:
+        cached = _archives.get(archive_path)
+        if cached is not None:
+            if cached[:2] == (stat.st_mtime, stat.st_size):
+                return cached[2]
+            # Replaced, so release the old file's handle.
+            cached[2].close()
+
+        archive = zipfile.ZipFile(archive_path)
+        _archives[archive_path] = (stat.st_mtime, stat.st_size, archive)
+        return archive
+
+
+def close_archives():
+    """
+    Close the zip archives held open to read python files from, ie so they can be replaced on Windows.
+    Archives are opened again when next read.
+    :return: Number of closed archives.
+    :rtype: int
+    """
+    with _archives_lock:
+        for _, _, archive in _archives.values():
+            archive.close()
+        count = len(_archives)
+        _archives.clear()
+        return count
+
+
+def split_archive_path(path):
+    """
+    Split <path> into the zip archive it is (or is within) and the archive member path.
+    :param str path: Path to split, ie "c:/plugins/bundle.zip/tools/tool.py".
+    :return: (archive_path, member) ie ("c:/plugins/bundle.zip", "tools/tool.py"), or None if <path> is
+        not a zip archive or within one. Member is empty for the archive itself.
+    :rtype: tuple[str, str]|None
+    """
+    if not _ARCHIVE_MEMBER_PATTERN.search(path) and not ARCHIVE_FILENAME_PATTERN.match(path):
+        return None
+
+    archive_path = path
+    parts = []
+    while not os.path.isfile(archive_path):
+        archive_path, part = os.path.split(archive_path)
+        if not part:
+            return None
+        parts.append(part)
+
+    if not ARCHIVE_FILENAME_PATTERN.match(archive_path):
+        return None
+
+    try:
+        _open_archive(archive_path)
+    except (zipfile.BadZipfile, IOError, OSError):
+        return None
+    return archive_path, '/'.join(reversed(parts))
+
+
+def _read_archive_member(archive_path, member):
+    try:
+        with _archives_lock:
+            return _open_archive(archive_path).read(member)
+    except KeyError:
+        raise IOError('"{}" is not in archive "{}".'.format(member, archive_path))
+
+
+def _compile_from_archive(filepath, archive_path, member):
+    data = _read_archive_member(archive_path, member)
+    if member.endswith('.pyc'):
+        if data[:4] != _PYC_MAGIC_NUMBER:
+            raise ImportError('Bad magic number in "{}".'.format(filepath))
+        return marshal.loads(data[_PYC_HEADER_SIZE:])
+    return compile(data, filepath, 'exec', dont_inherit=True)
+
+
+def _import_from_archive(module_name, filepath, code):
+    module = types.ModuleType(module_name)
+    module.__file__ = filepath
+    exec(code, module.__dict__)
+    return module
+
+
+def read_file(filepath):
+    """
+    Read the contents of <filepath>, which may be within a zip archive (see split_archive_path).
+    :param str filepath: Filepath to read.
+    :rtype: bytes
+    """
+    archive = split_archive_path(filepath)
+    if archive is not None and archive[1]:
+        return _read_archive_member(*archive)
+
+    with open(filepath, 'rb') as fp:
+        return fp.read()
+
+
+def get_mtime(filepath):
+    """
+    Get the modification time of <filepath>. Files within a zip archive use the archive's modification time.
+    :param str filepath: Filepath to check.
+    :raises OSError: If <filepath> doesn't exist.
+    :rtype: float
+    """
+    archive = split_archive_path(filepath)
+    if archive is not None and archive[1]:
+        try:
+            _open_archive(archive[0]).getinfo(archive[1])
+        except KeyError:
+            raise OSError('"{}" does not exist.'.format(filepath))
+        return os.path.getmtime(archive[0])
+    return os.path.getmtime(filepath)
+
+
+# ------------------------------------------------------------------------------
+# Imported modules, shared by all factories so each file is only executed once per change.
+_modules = {}  # {normalised filepath: (signature, ModuleType)}
+_modules_lock = threading.Lock()
+
+
+def _get_module_signature(filepath):
+    """
+    Get the signature of <filepath>, that changes whenever the file does.
+    :param str filepath: Filepath to check.
+    :return: Signature, or None if <filepath> can't be checked.
+    :rtype: tuple|None
+    """
+    try:
+        archive = split_archive_path(filepath)
+        if archive is not None and archive[1]:
+            info = _open_archive(archive[0]).getinfo(archive[1])
+            return os.path.getmtime(archive[0]), info.file_size, info.CRC
+        stat = os.stat(filepath)
+        return stat.st_mtime, stat.st_size
+    except (KeyError, IOError, OSError, zipfile.BadZipfile):
+        return None
+
+
+def get_cached_module(filepath):
+    """
+    Get the module previously imported from <filepath> (see import_from_filepath), if unchanged since.
+    :param str filepath: Filepath to check.
+    :rtype: ModuleType|None
+    """
+    with _modules_lock:
+        cached = _modules.get(normalise_path(filepath))
+    if cached is not None and cached[0] == _get_module_signature(filepath):
+        return cached[1]
+    return None
+
+
+def invalidate_modules(filepaths=None):
+    """
+    Forget the modules imported from <filepaths>, so they are imported again when next registered.
+    Modules are otherwise reused until their file changes.
+    :param Iterable[str]|str|None filepaths: Filepaths to forget. None to forget all.
+    :return: Number of forgotten modules.
+    :rtype: int
+    """
+    with _modules_lock:
+        if filepaths is None:
+            count = len(_modules)
+            _modules.clear()
+            return count
+
+        count = 0
+        for filepath in ensure_iterable(filepaths):
+            if _modules.pop(normalise_path(filepath), None) is not None:
+                count += 1
+        return count
+
+
 # ------------------------------------------------------------------------------
 def is_module(obj):
     """
@@ -102,25 +329,174 @@ def generate_unique_name_from_filepath(filepath):
     return '{}_{}'.format(filename, uuid.uuid4().hex)
 
 
-def import_from_filepath(filepath, module_name=None):
+def import_from_filepath(filepath, module_name=None, code=None, errors=None, reuse=True):
     """
     Import <filepath> as a ModuleType called <module_name> (auto-generated if None given).
+    Modules with auto-generated names are shared process-wide, so a file is only executed again once it has
+    changed (by mtime and size) or been invalidated (see invalidate_modules).
     :param str filepath: Filepath to import as module.
-    :param Optional[str] module_name: Module name to import as.
+    :param Optional[str] module_name: Module name to import as. Always imports.
+    :param Optional[CodeType] code: Code compiled from <filepath> to execute (see compile_from_filepath).
+        Only supported from Python 3.5, otherwise ignored.
+    :param Optional[list] errors: List to append the exception to, if the import fails.
+    :param bool reuse: True to reuse the module previously imported from <filepath>, if unchanged.
+        False to always import.
     :rtype: ModuleType
     """
+    signature = None
+    if reuse and not module_name:
+        key = normalise_path(filepath)
+        signature = _get_module_signature(filepath)
+        with _modules_lock:
+            cached = _modules.get(key)
+        if signature is not None and cached is not None and cached[0] == signature:
+            LOGGER.debug('Reusing module "%s" from "%s".', cached[1].__name__, filepath)
+            return cached[1]
+
     module_name = module_name or generate_unique_name_from_filepath(filepath)
     module = None
     try:
-        LOGGER.debug('Loading "{}" into modulename "{}".'.format(filepath, module_name))
-        module = _import_from_filepath(module_name, filepath)
+        LOGGER.debug('Loading "%s" into modulename "%s".', filepath, module_name)
+        archive = split_archive_path(filepath)
+        if archive is not None:
+            if code is None:
+                code = _compile_from_archive(filepath, *archive)
+            module = _import_from_archive(module_name, filepath, code)
+        else:
+            module = _import_from_filepath(module_name, filepath, code=code)
         if not module:
             raise TypeError('Only .py and .pyc files are supported. Received "{}".'.format(filepath))
     except Exception as e:
-        LOGGER.exception('Failed to load from "{}" :: {}.'.format(filepath, e))
+        LOGGER.exception('Failed to load from "%s" :: %s.', filepath, e)
+        if errors is not None:
+            errors.append(e)
+        return module
+
+    if signature is not None:
+        with _modules_lock:
+            # Keep the first module if imported concurrently, so all factories share the same objects.
+            cached = _modules.get(key)
+            if cached is not None and cached[0] == signature:
+                module = cached[1]
+            else:
+                _modules[key] = (signature, module)
     return module
 
 
+def compile_from_filepath(filepath, errors=None):
+    """
+    Read and compile <filepath> to a code object, without executing it.
+    .py files are compiled from source (using any valid bytecode cache), .pyc files are read as bytecode.
+    :param str filepath: Filepath to compile.
+    :param Optional[list] errors: List to append the exception to, if compiling fails.
+    :return: Compiled code, or None if not supported (Python < 3.5) or <filepath> failed to compile.
+    :rtype: CodeType|None
+    """
+    if _compile_from_filepath is None:
+        return None
+
+    try:
+        archive = split_archive_path(filepath)
+        if archive is not None:
+            return _compile_from_archive(filepath, *archive)
+        return _compile_from_filepath(filepath)
+    except Exception as e:
+        LOGGER.exception('Failed to compile "%s" :: %s.', filepath, e)
+        if errors is not None:
+            errors.append(e)
+    return None
+
+
+def _timed_compile(filepath):
+    # Reused modules don't need compiling.
+    if get_cached_module(filepath) is not None:
+        return None, 0.0, []
+    errors = []
+    start = timeit.default_timer()
+    code = compile_from_filepath(filepath, errors=errors)
+    return code, timeit.default_timer() - start, errors
+
+
+def _timed_import(filepath, code=None, compile_seconds=0.0, errors=None, profile=False):
+    """
+    Import <filepath> (see import_from_filepath), timing it and optionally profiling it.
+    :rtype: ImportResult
+    """
+    errors = list(errors or ())
+    module = None
+    profiler = None
+    start = timeit.default_timer()
+    if not errors:
+        if profile:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            module = import_from_filepath(filepath, code=code, errors=errors)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+    seconds = compile_seconds + timeit.default_timer() - start
+
+    profile_stats = None
+    if profiler is not None:
+        import pstats
+        profile_stats = pstats.Stats(profiler)
+    return ImportResult(filepath, module, seconds, errors[0] if errors else None, profile_stats)
+
+
+def iter_import_results(filepaths, workers=None, profile=False):
+    """
+    Import each of <filepaths>, yielding an ImportResult for each in the order given.
+    With <workers>, files are read and compiled concurrently on a thread pool, whilst modules are
+    still executed one at a time, in order, on the calling thread.
+    :param Iterable[str] filepaths: Filepaths to import.
+    :param int|None workers: Number of threads to compile with. None or 1 to import serially.
+        Only supported from Python 3.5, otherwise ignored.
+    :param bool profile: True to profile each import with cProfile. Only execution is profiled when using <workers>.
+    :rtype: Generator[ImportResult]
+    """
+    if not workers or workers < 2 or _compile_from_filepath is None:
+        for filepath in filepaths:
+            yield _timed_import(filepath, profile=profile)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    def _import(filepath, future):
+        code, compile_seconds, errors = future.result()
+        return _timed_import(filepath, code, compile_seconds, errors, profile=profile)
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = collections.deque()
+    try:
+        for filepath in filepaths:
+            pending.append((filepath, executor.submit(_timed_compile, filepath)))
+            # Bound how far compiling runs ahead of execution.
+            if len(pending) > workers * 2:
+                yield _import(*pending.popleft())
+
+        while pending:
+            yield _import(*pending.popleft())
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def iter_import_from_filepaths(filepaths, workers=None):
+    """
+    Import each of <filepaths>, yielding (filepath, module) in the order given.
+    Module is None if the import failed. See iter_import_results for details.
+    :param Iterable[str] filepaths: Filepaths to import.
+    :param int|None workers: Number of threads to compile with. None or 1 to import serially.
+        Only supported from Python 3.5, otherwise ignored.
+    :rtype: Generator[tuple[str, ModuleType|None]]
+    """
+    for result in iter_import_results(filepaths, workers=workers):
+        yield result.filepath, result.module
+
+
 def get_source_filepath(obj):
     """
     Get the source filepath of <obj>.
@@ -139,6 +515,13 @@ def get_source_filepath(obj):
     return source_filepath
 
 
+def _normalise_real_path(real_path):
+    norm_path = os.path.normcase(os.path.normpath(real_path))
+    if os.altsep:
+        norm_path = norm_path.replace(os.sep, os.altsep)
+    return norm_path
+
+
 def normalise_path(path):
     """
     Expand and normalise <path> to its real path.
@@ -146,28 +529,151 @@ def normalise_path(path):
     :param str path: Path to normalise.
     :rtype: str
     """
-    norm_path = os.path.normcase(os.path.normpath(os.path.realpath(path)))
-    if os.altsep:
-        norm_path = norm_path.replace(os.sep, os.altsep)
-    return norm_path
+    return _normalise_real_path(os.path.realpath(path))
+
+
+def _list_python_directory(directory):
+    """
+    List the python files and subdirectories of <directory>, both sorted by name.
+    Python filepaths are normalised from <directory>'s real path, so only symlinked files need resolving.
+    Symlinked subdirectories are not included (matching os.walk).
+    :param str directory: Directory to list.
+    :rtype: tuple[list[str], list[str]]
+    """
+    try:
+        entries = sorted(os.scandir(directory), key=lambda x: x.name)
+    except OSError as e:
+        LOGGER.debug('Failed to list "%s" :: %s.', directory, e)
+        return [], []
+
+    real_directory = os.path.realpath(directory)
+    filepaths = []
+    directories = []
+    for entry in entries:
+        # DirEntry caches its type from the directory listing, avoiding further stat calls.
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+
+        if is_dir:
+            if not entry.is_symlink():
+                directories.append(entry.path)
+        elif PYTHON_FILENAME_PATTERN.match(entry.name):
+            if entry.is_symlink():
+                filepaths.append(normalise_path(entry.path))
+            else:
+                filepaths.append(_normalise_real_path(os.path.join(real_directory, entry.name)))
 
+    return filepaths, directories
 
-def iter_python_files(path, recursive=True):
+
+def _iter_python_directory(path, recursive=True, workers=None):
+    """
+    Iterate the python files found in directory <path>, depth first in name order.
+    :param str path: Directory to find python files from.
+    :param bool recursive: True to iterate recursively.
+    :param int|None workers: Number of threads to list directories with. None or 1 to list serially.
+    :rtype: Generator[str]
+    """
+    if not workers or workers < 2:
+        stack = [path]
+        while stack:
+            filepaths, directories = _list_python_directory(stack.pop())
+            for filepath in filepaths:
+                yield filepath
+            if recursive:
+                stack.extend(reversed(directories))
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    stack = []
+    try:
+        # Subdirectories are listed concurrently as soon as their parent is listed, whilst
+        # results are consumed in the same (deterministic) order as a serial walk.
+        stack.append(executor.submit(_list_python_directory, path))
+        while stack:
+            filepaths, directories = stack.pop().result()
+            if recursive:
+                stack.extend(reversed([
+                    executor.submit(_list_python_directory, directory)
+                    for directory in directories
+                ]))
+            for filepath in filepaths:
+                yield filepath
+    finally:
+        for future in stack:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _iter_python_archive(archive_path, member, recursive=True):
+    """
+    Iterate the python files in zip archive <archive_path>, from its central directory.
+    Files are yielded depth first in name order (as a directory), as <archive_path>/<member path>.
+    :param str archive_path: Zip archive to find python files in.
+    :param str member: Archive directory (or python file) to find python files from. Empty for the whole archive.
+    :param bool recursive: True to iterate recursively.
+    :rtype: Generator[str]
+    """
+    try:
+        names = _open_archive(archive_path).namelist()
+    except (zipfile.BadZipfile, IOError, OSError) as e:
+        LOGGER.error('iter_python_files >> Failed to read archive "{}" :: {}.'.format(archive_path, e))
+        return
+
+    prefix = member.strip('/') + '/' if member else ''
+    sort_keys = {}
+    for name in names:
+        if name == member and PYTHON_FILENAME_PATTERN.match(name.rsplit('/', 1)[-1]):
+            sort_keys[name] = ()
+            continue
+        elif not name.startswith(prefix) or name.endswith('/'):
+            continue
+
+        parts = name[len(prefix):].split('/')
+        if (recursive or len(parts) == 1) and PYTHON_FILENAME_PATTERN.match(parts[-1]):
+            # Files sort before the subdirectories alongside them.
+            sort_keys[name] = tuple((1, part) for part in parts[:-1]) + ((0, parts[-1]),)
+
+    archive_path = normalise_path(archive_path)
+    separator = os.altsep or os.sep
+    for name in sorted(sort_keys, key=sort_keys.get):
+        yield archive_path + separator + name
+
+
+def iter_python_files(path, recursive=True, workers=None):
     """
     Iterate the python files found from <path>.
     If <path> is a python file, yield that.
-    If <path> is a directory, iterate nested python files.
+    If <path> is a directory, iterate nested python files, depth first in name order.
+    If <path> is a zip archive (.zip, .whl or .egg) or a directory within one, iterate its python files
+    without extracting it, as <archive path>/<member path>.
     :param str path: Path to find python files from.
     :param bool recursive: True to iterate recursively.
+    :param int|None workers: Number of threads to list directories with. None or 1 to list serially.
+        Only supported from Python 3.5, otherwise ignored.
     :rtype: Generator[str]
     """
-    # TODO: Handle .zip python packages.
-    if os.path.isfile(path):
+    archive = split_archive_path(path)
+    if archive is not None:
+        for filepath in _iter_python_archive(archive[0], archive[1], recursive=recursive):
+            yield filepath
+    elif os.path.isfile(path):
         if PYTHON_FILENAME_PATTERN.match(os.path.basename(path)):
             yield normalise_path(path)
     elif os.path.isdir(path):
-        for root, _, files in os.walk(path):
-            for filename in files:
+        if hasattr(os, 'scandir'):
+            for filepath in _iter_python_directory(path, recursive=recursive, workers=workers):
+                yield filepath
+            return
+
+        # -- Python 2.7
+        for root, directories, files in os.walk(path):
+            directories.sort()
+            for filename in sorted(files):
                 if not PYTHON_FILENAME_PATTERN.match(filename):
                     continue
 
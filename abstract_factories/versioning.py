@@ -0,0 +1,172 @@
+"""
+Version constraints, for resolving items by a range of versions rather than an exact version.
+
+.. code-block:: python
+
+    >>> factory.get('IKChainComponent', version=VersionRange(2, 3))             # Latest 2.x
+    >>> factory.get('IKChainComponent', version=VersionRange.parse('>=2,<5'))   # Latest below 5
+    >>> factory.get('IKChainComponent', version=VersionRange.compatible(2.1))   # Latest >=2.1,<3
+
+"""
+import ast
+import bisect
+import math
+
+from .utils import basestring
+
+
+_OPERATORS = ('>=', '<=', '==', '>', '<')
+
+
+def _parse_version(value):
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+
+
+# ------------------------------------------------------------------------------
+class VersionRange(object):
+    """
+    Range of versions, from <minimum> (inclusive) to <maximum> (exclusive) by default.
+    Versions are compared as they are (ie, numbers or tuples), so bounds should be of the same type.
+
+    :param int|float|tuple|None minimum: Lowest version. None for no lower bound.
+    :param int|float|tuple|None maximum: Highest version. None for no upper bound.
+    :param bool include_minimum: True if <minimum> itself is in range.
+    :param bool include_maximum: True if <maximum> itself is in range.
+
+    """
+
+    __slots__ = ('_minimum', '_maximum', '_include_minimum', '_include_maximum')
+
+    def __init__(self, minimum=None, maximum=None, include_minimum=True, include_maximum=False):
+        self._minimum = minimum
+        self._maximum = maximum
+        self._include_minimum = include_minimum
+        self._include_maximum = include_maximum
+
+    def __repr__(self):
+        return '{}({!r}, {!r}, include_minimum={}, include_maximum={})'.format(
+            type(self).__name__,
+            self._minimum,
+            self._maximum,
+            self._include_minimum,
+            self._include_maximum,
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, VersionRange):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __contains__(self, version):
+        if self._minimum is not None:
+            if version < self._minimum or (version == self._minimum and not self._include_minimum):
+                return False
+        if self._maximum is not None:
+            if version > self._maximum or (version == self._maximum and not self._include_maximum):
+                return False
+        return True
+
+    def _key(self):
+        return self._minimum, self._maximum, self._include_minimum, self._include_maximum
+
+    # --------------------------------------------------------------------------
+    @property
+    def minimum(self):
+        return self._minimum
+
+    @property
+    def maximum(self):
+        return self._maximum
+
+    @property
+    def include_minimum(self):
+        return self._include_minimum
+
+    @property
+    def include_maximum(self):
+        return self._include_maximum
+
+    # --------------------------------------------------------------------------
+    @classmethod
+    def parse(cls, specifier):
+        """
+        Create a VersionRange from a comma separated <specifier>, ie '>=2,<5' or '==3'.
+        Supported operators are >=, >, <=, < and ==. Values are evaluated as python literals where possible.
+        :param str specifier: Specifier to parse.
+        :rtype: VersionRange
+        """
+        if not isinstance(specifier, basestring):
+            raise TypeError('Specifier is required to be a str, received {}.'.format(type(specifier)))
+
+        kwargs = {}
+        for clause in specifier.split(','):
+            clause = clause.strip()
+            operator = next((x for x in _OPERATORS if clause.startswith(x)), None)
+            if operator is None:
+                raise ValueError('Invalid version specifier "{}" in "{}".'.format(clause, specifier))
+
+            value = _parse_version(clause[len(operator):].strip())
+            if operator in ('>=', '>', '=='):
+                kwargs['minimum'] = value
+                kwargs['include_minimum'] = operator != '>'
+            if operator in ('<=', '<', '=='):
+                kwargs['maximum'] = value
+                kwargs['include_maximum'] = operator != '<'
+
+        return cls(**kwargs)
+
+    @classmethod
+    def compatible(cls, version):
+        """
+        Create a VersionRange of versions compatible with <version>, being at least <version> with the
+        same major version. ie, compatible(2.1) is >=2.1,<3 and compatible((2, 1)) is >=(2, 1),<(3,).
+        :param int|float|tuple version: Version to be compatible with.
+        :rtype: VersionRange
+        """
+        if isinstance(version, tuple):
+            maximum = (version[0] + 1,)
+        else:
+            maximum = int(math.floor(version)) + 1
+        return cls(version, maximum)
+
+    # --------------------------------------------------------------------------
+    def bisect(self, versions):
+        """
+        Get the slice of sorted <versions> that are in range, using binary search.
+        Unversioned (None) versions are never in range.
+        :param Sequence versions: Versions sorted ascending.
+        :rtype: tuple[int, int]
+        :return: Start and end index of the in range versions.
+        """
+        # None sorts first on python 2, and can't be compared with the bounds on python 3.
+        start = 0
+        while start < len(versions) and versions[start] is None:
+            start += 1
+
+        end = len(versions)
+        if self._minimum is not None:
+            bisect_func = bisect.bisect_left if self._include_minimum else bisect.bisect_right
+            start = bisect_func(versions, self._minimum, start)
+        if self._maximum is not None:
+            bisect_func = bisect.bisect_right if self._include_maximum else bisect.bisect_left
+            end = bisect_func(versions, self._maximum, start)
+        return start, max(start, end)
+
+    def filter(self, versions):
+        """
+        Get the versions from sorted <versions> that are in range.
+        :param Sequence versions: Versions sorted ascending.
+        :rtype: Sequence
+        """
+        start, end = self.bisect(versions)
+        return versions[start:end]
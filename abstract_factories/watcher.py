@@ -0,0 +1,372 @@
+"""
+Filesystem watching, to keep the items of a factory's registered paths up to date.
+
+`FactoryWatcher` refreshes a factory (see `refresh`) from a background thread whenever python files in its
+registered paths are added, modified or deleted. inotify is used where available (Linux), otherwise directory
+mtimes are polled.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+
+from . import utils
+from .constants import LOGGER
+
+
+# inotify constants (see inotify(7)).
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE |
+    _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR
+)
+
+_EVENT_STRUCT = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+def _encode_path(path):
+    if isinstance(path, bytes):
+        return path
+    return path.encode(sys.getfilesystemencoding())
+
+
+def _decode_path(path):
+    if isinstance(path, str):
+        return path
+    return path.decode(sys.getfilesystemencoding())
+
+
+# ------------------------------------------------------------------------------
+class _Inotify(object):
+    """Minimal ctypes inotify binding. Raises OSError if inotify is not available."""
+
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, 'inotify is only available on Linux.')
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+    def add_watch(self, directory):
+        wd = self._libc.inotify_add_watch(self._fd, _encode_path(directory), _WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), directory)
+        return wd
+
+    def read(self, timeout):
+        """
+        Read the pending events, waiting up to <timeout> seconds for any.
+        :param float timeout: Seconds to wait.
+        :rtype: list[tuple[int, int, str]]
+        :return: (wd, mask, name) for each event.
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+
+        try:
+            data = os.read(self._fd, 65536)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return []
+            raise
+
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_STRUCT.unpack_from(data, offset)
+            offset += _EVENT_STRUCT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            events.append((wd, mask, _decode_path(name)))
+        return events
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+# ------------------------------------------------------------------------------
+class FactoryWatcher(object):
+    """
+    Watch the registered paths of <factory>, refreshing its items from a background thread whenever
+    python files are added, modified or deleted. Only the affected files are refreshed.
+    Paths registered after the watcher is started are not watched until it is restarted.
+
+    Without inotify, only directory mtimes are polled, which detects files being added, deleted or
+    replaced (ie, saved via rename). Use <poll_files> to also detect files modified in place.
+
+    :param _AbstractFactory factory: Factory to keep up to date.
+    :param float interval: Seconds between polls. Also the time to wait for further events before refreshing.
+    :param bool use_inotify: True to use inotify where available, False to always poll.
+    :param bool poll_files: True to also stat known python files when polling.
+    :param Callable|None callback: Called with the number of changed files after each refresh with changes.
+        Called from the watcher thread.
+
+    """
+
+    def __init__(self, factory, interval=1.0, use_inotify=True, poll_files=False, callback=None):
+        self._factory = factory
+        self._interval = interval
+        self._use_inotify = use_inotify
+        self._poll_files = poll_files
+        self._callback = callback
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._inotify = None
+        self._watches = {}  # {wd: (directory, recursive)}
+        self._directories = {}  # {directory: (recursive, mtime, {filepath, ...})}
+
+    def __repr__(self):
+        return '{}({}, running={})'.format(type(self).__name__, self._factory, self.is_running)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    # --------------------------------------------------------------------------
+    @property
+    def factory(self):
+        return self._factory
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def uses_inotify(self):
+        return self._inotify is not None
+
+    # --------------------------------------------------------------------------
+    def _iter_watch_directories(self):
+        for path, recursive in self._factory.paths():
+            if os.path.isfile(path):
+                yield os.path.dirname(path), False
+            elif os.path.isdir(path):
+                yield path, recursive
+
+    def _add_directory(self, directory, recursive, filepaths=None):
+        """
+        Watch <directory> (and subdirectories if <recursive>), adding its python files to <filepaths>.
+        :param str directory: Directory to watch.
+        :param bool recursive: True to also watch subdirectories.
+        :param set|None filepaths: Set to add found python files to.
+        """
+        stack = [directory]
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime = os.stat(directory).st_mtime
+            except OSError:
+                continue
+
+            # Watch before listing, so files created in between are not missed.
+            if self._inotify is not None:
+                try:
+                    self._watches[self._inotify.add_watch(directory)] = (directory, recursive)
+                except OSError as e:
+                    LOGGER.warning('Failed to watch "{}" :: {}.'.format(directory, e))
+
+            files, subdirectories = self._list_directory(directory)
+            if filepaths is not None:
+                filepaths.update(files)
+            if self._inotify is None:
+                self._directories[directory] = (recursive, mtime, files)
+
+            if recursive:
+                stack.extend(subdirectories)
+
+    @staticmethod
+    def _list_directory(directory):
+        files = set()
+        subdirectories = []
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return files, subdirectories
+
+        for name in names:
+            path = os.path.join(directory, name)
+            if os.path.isdir(path):
+                if not os.path.islink(path):
+                    subdirectories.append(path)
+            elif utils.PYTHON_FILENAME_PATTERN.match(name) or utils.ARCHIVE_FILENAME_PATTERN.match(name):
+                files.add(path)
+        return files, subdirectories
+
+    def _refresh(self, filepaths):
+        """
+        Refresh the factory from <filepaths>, or all registered paths if None given.
+        :param set|None filepaths: Changed filepaths.
+        """
+        if filepaths is not None and not filepaths:
+            return
+
+        try:
+            count = self._factory.refresh(filepaths)
+        except Exception as e:
+            LOGGER.exception('{} failed to refresh :: {}.'.format(self, e))
+            return
+
+        if count and self._callback is not None:
+            try:
+                self._callback(count)
+            except Exception as e:
+                LOGGER.exception('{} callback failed :: {}.'.format(self, e))
+
+    # --------------------------------------------------------------------------
+    def _poll(self):
+        filepaths = set()
+        for directory, (recursive, mtime, files) in list(self._directories.items()):
+            try:
+                current_mtime = os.stat(directory).st_mtime
+            except OSError:
+                # Deleted, so are its files. Subdirectories are handled by their own entries.
+                del self._directories[directory]
+                filepaths.update(files)
+                continue
+
+            if current_mtime == mtime:
+                if self._poll_files:
+                    filepaths.update(files)
+                continue
+
+            current_files, subdirectories = self._list_directory(directory)
+            self._directories[directory] = (recursive, current_mtime, current_files)
+            filepaths.update(files)
+            filepaths.update(current_files)
+
+            if recursive:
+                for subdirectory in subdirectories:
+                    if subdirectory not in self._directories:
+                        self._add_directory(subdirectory, recursive, filepaths)
+
+        return filepaths
+
+    def _read_inotify(self, timeout):
+        """
+        Read inotify events, waiting up to <timeout> for the first.
+        :param float timeout: Seconds to wait.
+        :return: Changed filepaths, or None if a full refresh is required.
+        :rtype: set|None
+        """
+        filepaths = set()
+        for wd, mask, name in self._inotify.read(timeout):
+            if mask & _IN_Q_OVERFLOW:
+                return None
+
+            watch = self._watches.get(wd)
+            if watch is None:
+                continue
+
+            directory, recursive = watch
+            if mask & _IN_IGNORED:
+                del self._watches[wd]
+                continue
+            elif mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                # Known files below <directory> are unknown here, so refresh everything.
+                return None
+
+            path = os.path.join(directory, name)
+            if mask & _IN_ISDIR:
+                if not recursive:
+                    continue
+                elif mask & (_IN_CREATE | _IN_MOVED_TO):
+                    self._add_directory(path, recursive, filepaths)
+                elif mask & _IN_MOVED_FROM:
+                    return None
+            elif utils.PYTHON_FILENAME_PATTERN.match(name) or utils.ARCHIVE_FILENAME_PATTERN.match(name):
+                filepaths.add(path)
+
+        return filepaths
+
+    def _run(self):
+        inotify = self._inotify
+        try:
+            while not self._stop_event.is_set():
+                if self._inotify is None:
+                    self._stop_event.wait(self._interval)
+                    if not self._stop_event.is_set():
+                        self._refresh(self._poll())
+                    continue
+
+                filepaths = self._read_inotify(self._interval)
+                if not filepaths:
+                    if filepaths is None:
+                        self._refresh(None)
+                    continue
+
+                # Gather further events (ie, a save writing several files) before refreshing.
+                while filepaths is not None and not self._stop_event.is_set():
+                    more_filepaths = self._read_inotify(self._interval)
+                    if more_filepaths is None:
+                        filepaths = None
+                    elif not more_filepaths:
+                        break
+                    else:
+                        filepaths.update(more_filepaths)
+
+                self._refresh(filepaths)
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    # --------------------------------------------------------------------------
+    def start(self):
+        """Start watching the factory's registered paths, if not already running."""
+        if self.is_running:
+            return
+
+        self._stop_event.clear()
+        self._watches.clear()
+        self._directories.clear()
+
+        self._inotify = None
+        if self._use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                LOGGER.debug('inotify not available, polling instead :: {}.'.format(e))
+
+        for directory, recursive in self._iter_watch_directories():
+            self._add_directory(directory, recursive)
+
+        self._thread = threading.Thread(target=self._run, name=repr(self))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop watching, waiting for the watcher thread to finish.
+        :param float|None timeout: Seconds to wait for the thread. None to wait indefinitely.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,157 @@
+"""
+Synthetic data for the benchmarks: abstracts with many (versioned) items, and on-disk plugin trees.
+
+Generation is deterministic, so the same arguments always produce the same items and files.
+"""
+import os
+
+
+PLUGIN_ABSTRACT_MODULE = 'benchmark_plugin_abstract'
+
+_PLUGIN_ABSTRACT_SOURCE = '''
+class BenchmarkPlugin(object):
+    Name = ''
+    Version = 0
+    Category = ''
+'''
+
+_PLUGIN_HEADER = 'from {} import BenchmarkPlugin\n'.format(PLUGIN_ABSTRACT_MODULE)
+
+_PLUGIN_CLASS = '''
+
+class Plugin{index}(BenchmarkPlugin):
+    Name = '{name}'
+    Version = {version}
+    Category = '{category}'
+
+    def run(self):
+        return {index}
+'''
+
+
+# ------------------------------------------------------------------------------
+class BenchmarkAbstract(object):
+    Name = ''
+    Version = 0
+    Category = ''
+
+
+class BenchmarkItem(BenchmarkAbstract):
+    """Instanced item, as instance factories only accept instances of subclasses."""
+
+
+def get_name(index):
+    """
+    Get the item name for name <index>.
+    :param int index: Name index.
+    :rtype: str
+    """
+    return 'Item{:06d}'.format(index)
+
+
+def get_category(index):
+    """
+    Get the category for name <index>, cycling through 10 categories.
+    :param int index: Name index.
+    :rtype: str
+    """
+    return 'Category{}'.format(index % 10)
+
+
+def iter_keys(count, versions):
+    """
+    Generate (name, version, category) for <count> items, with <versions> versions per name.
+    :param int count: Number of items.
+    :param int versions: Number of versions per name.
+    :rtype: Iterator[tuple[str, int, str]]
+    """
+    for index in range(count):
+        name_index = index // versions
+        yield get_name(name_index), index % versions + 1, get_category(name_index)
+
+
+def create_types(count, versions):
+    """
+    Create <count> subclasses of BenchmarkAbstract, with <versions> versions per name.
+    :param int count: Number of types.
+    :param int versions: Number of versions per name.
+    :rtype: list[type]
+    """
+    return [
+        type('{}v{}'.format(name, version), (BenchmarkAbstract,), {'Name': name, 'Version': version, 'Category': category})
+        for name, version, category in iter_keys(count, versions)
+    ]
+
+
+def create_instances(count, versions):
+    """
+    Create <count> BenchmarkItem instances, with <versions> versions per name.
+    :param int count: Number of instances.
+    :param int versions: Number of versions per name.
+    :rtype: list[BenchmarkItem]
+    """
+    instances = []
+    for name, version, category in iter_keys(count, versions):
+        instance = BenchmarkItem()
+        instance.Name = name
+        instance.Version = version
+        instance.Category = category
+        instances.append(instance)
+    return instances
+
+
+# ------------------------------------------------------------------------------
+def create_plugin_tree(root, file_count, classes_per_file=2, versions=2, files_per_directory=50):
+    """
+    Write a tree of <file_count> plugin files to <root>, nested <files_per_directory> files per directory.
+    Each file defines <classes_per_file> subclasses of BenchmarkPlugin, using literal names and versions
+    so the files can be scanned lazily.
+    The abstract module is written to <root>, so <root> must be on sys.path to import the plugins.
+    :param str root: Directory to write to.
+    :param int file_count: Number of plugin files.
+    :param int classes_per_file: Number of classes per file.
+    :param int versions: Number of versions per name.
+    :param int files_per_directory: Number of files per directory.
+    :return: Plugins directory, to register.
+    :rtype: str
+    """
+    with open(os.path.join(root, PLUGIN_ABSTRACT_MODULE + '.py'), 'w') as fp:
+        fp.write(_PLUGIN_ABSTRACT_SOURCE)
+
+    plugins_directory = os.path.join(root, 'plugins')
+    keys = iter_keys(file_count * classes_per_file, versions)
+    index = 0
+    for file_index in range(file_count):
+        directory = os.path.join(plugins_directory, 'group{:04d}'.format(file_index // files_per_directory))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        lines = [_PLUGIN_HEADER]
+        for _ in range(classes_per_file):
+            name, version, category = next(keys)
+            lines.append(_PLUGIN_CLASS.format(index=index, name=name, version=version, category=category))
+            index += 1
+
+        with open(os.path.join(directory, 'plugin{:06d}.py'.format(file_index)), 'w') as fp:
+            fp.write(''.join(lines))
+
+    return plugins_directory
+
+
+def touch_plugin_files(plugins_directory, count):
+    """
+    Update the mtime of the first <count> plugin files (sorted by path), as if modified.
+    :param str plugins_directory: Plugins directory (see create_plugin_tree).
+    :param int count: Number of files to touch.
+    :return: Touched filepaths.
+    :rtype: list[str]
+    """
+    filepaths = []
+    for directory, _, filenames in sorted(os.walk(plugins_directory)):
+        filepaths.extend(os.path.join(directory, x) for x in sorted(filenames) if x.endswith('.py'))
+
+    touched = filepaths[:count]
+    for filepath in touched:
+        mtime = os.path.getmtime(filepath) + 10
+        os.utime(filepath, (mtime, mtime))
+    return touched
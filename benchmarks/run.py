@@ -0,0 +1,403 @@
+"""
+Scaling benchmarks for factory registration, lookup and path discovery.
+
+.. code-block:: bash
+
+    python -m benchmarks.run                              # Default sizes.
+    python -m benchmarks.run --full --save baseline.json  # Up to 10^5 items and 5000 files.
+    python -m benchmarks.run --compare baseline.json      # Exits with 1 if any benchmark regressed.
+
+Each benchmark reports the best per-operation time across its repeats, which is the most stable measure between
+runs. Scaling is the exponent fitted across sizes, where 0 is constant and 1 is linear time per operation.
+Results are only comparable when run with the same python, machine and arguments.
+"""
+import argparse
+import collections
+import json
+import logging
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import timeit
+
+from abstract_factories import (
+    AbstractInstanceFactory,
+    AbstractTypeFactory,
+    DiscoveryCache,
+    LOGGER,
+    VersionRange,
+    invalidate_modules,
+)
+from abstract_factories.constants import NameSearchModes
+
+from . import generate
+
+
+RESULTS_FORMAT_VERSION = 1
+
+DEFAULT_SIZES = (100, 1000, 10000)
+FULL_SIZES = (100, 1000, 10000, 100000)
+DEFAULT_FILE_COUNTS = (100, 1000)
+FULL_FILE_COUNTS = (100, 1000, 5000)
+
+# Number of names looked up per lookup benchmark.
+SAMPLE_SIZE = 100
+
+
+# ------------------------------------------------------------------------------
+def time_operation(func, setup=None, operations=1, repeat=5, min_time=0.02):
+    """
+    Get the best time per operation of calling <func> across <repeat> runs.
+    Without <setup>, <func> is called in a loop long enough to be measured reliably. With <setup>, <func> is
+    called once per run, with the state returned by <setup> (untimed), ie for benchmarks that modify a factory.
+    :param Callable func: Callable accepting the setup state (None without <setup>).
+    :param Callable|None setup: Callable returning fresh state for each run.
+    :param int operations: Number of operations each call of <func> performs.
+    :param int repeat: Number of runs.
+    :param float min_time: Minimum time (in seconds) of each looped run.
+    :rtype: float
+    """
+    timer = timeit.default_timer
+    times = []
+    if setup is not None:
+        for _ in range(repeat):
+            state = setup()
+            start = timer()
+            func(state)
+            times.append(timer() - start)
+        return min(times) / operations
+
+    number = 1
+    while True:
+        start = timer()
+        for _ in range(number):
+            func(None)
+        elapsed = timer() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    times.append(elapsed / number)
+    for _ in range(repeat - 1):
+        start = timer()
+        for _ in range(number):
+            func(None)
+        times.append((timer() - start) / number)
+    return min(times) / operations
+
+
+def get_scaling(timings):
+    """
+    Get the least squares exponent of <timings> against size (0 is constant, 1 is linear).
+    :param dict[int, float] timings: {size: seconds}.
+    :rtype: float|None
+    """
+    points = [(math.log(size), math.log(seconds)) for size, seconds in timings.items() if seconds > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if not variance:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def _sample(values, count=SAMPLE_SIZE):
+    step = max(len(values) // count, 1)
+    return values[::step][:count]
+
+
+# ------------------------------------------------------------------------------
+def benchmark_items(factory_class, create_items, count, versions, repeat):
+    """
+    Time the item operations of <factory_class> with <count> items.
+    :param type factory_class: AbstractTypeFactory or AbstractInstanceFactory.
+    :param Callable create_items: Callable accepting (count, versions), returning items to register.
+    :param int count: Number of items.
+    :param int versions: Number of versions per name.
+    :param int repeat: Number of runs per benchmark.
+    :rtype: collections.OrderedDict[str, float]
+    """
+    items = create_items(count, versions)
+    names = sorted(set(item.Name for item in items))
+    sample = _sample(names)
+    missing = ['Missing{}'.format(x) for x in sample]
+    removals = _sample(items)
+    version_range = VersionRange(2, versions)
+
+    def create_factory():
+        return factory_class(generate.BenchmarkAbstract, name_key='Name', version_key='Version')
+
+    def create_registered_factory():
+        new_factory = create_factory()
+        new_factory.register_items(items)
+        return new_factory
+
+    factory = create_registered_factory()
+    factory.add_index('Category')
+    frozen_factory = factory.freeze()
+
+    benchmarks = [
+        ('register_items', lambda x: x.register_items(items), create_factory, count),
+        (
+            'deregister_item',
+            lambda x: [x.deregister_item(item) for item in removals],
+            create_registered_factory,
+            len(removals),
+        ),
+        ('get', lambda _: [factory.get(name) for name in sample], None, len(sample)),
+        ('get_version', lambda _: [factory.get(name, version=1) for name in sample], None, len(sample)),
+        ('get_range', lambda _: [factory.get(name, version=version_range) for name in sample], None, len(sample)),
+        ('get_missing', lambda _: [factory.get(name) for name in missing], None, len(missing)),
+        ('get_many', lambda _: factory.get_many(sample), None, len(sample)),
+        ('names', lambda _: factory.names(), None, 1),
+        ('versions', lambda _: [factory.versions(name) for name in sample], None, len(sample)),
+        ('items', lambda _: factory.items(), None, 1),
+        ('search_names', lambda _: factory.search_names('Item00', NameSearchModes.Prefix, limit=10), None, 1),
+        ('find', lambda _: factory.find(where={'Category': 'Category3'}), None, 1),
+        ('freeze', lambda _: factory.freeze(), None, 1),
+        ('frozen_get', lambda _: [frozen_factory.get(name) for name in sample], None, len(sample)),
+    ]
+
+    results = collections.OrderedDict()
+    for name, func, setup, operations in benchmarks:
+        results[name] = time_operation(func, setup=setup, operations=operations, repeat=repeat)
+    return results
+
+
+def benchmark_paths(file_count, versions, repeat):
+    """
+    Time path registration of a generated plugin tree of <file_count> files.
+    :param int file_count: Number of plugin files.
+    :param int versions: Number of versions per name.
+    :param int repeat: Number of runs per benchmark.
+    :rtype: collections.OrderedDict[str, float]
+    """
+    root = tempfile.mkdtemp(prefix='abstract_factories_benchmark_')
+    sys.path.insert(0, root)
+    try:
+        plugins_directory = generate.create_plugin_tree(root, file_count, versions=versions)
+        abstract = __import__(generate.PLUGIN_ABSTRACT_MODULE).BenchmarkPlugin
+        cache_filepath = os.path.join(root, 'cache.json')
+        touch_count = max(file_count // 100, 1)
+
+        def create_factory():
+            # Imported modules are shared between factories, so each run starts from a cold import.
+            invalidate_modules()
+            return AbstractTypeFactory(abstract, name_key='Name', version_key='Version')
+
+        def create_registered_factory(lazy=False):
+            new_factory = create_factory()
+            new_factory.register_path(plugins_directory, lazy=lazy)
+            return new_factory
+
+        def create_cold_cache():
+            if os.path.isfile(cache_filepath):
+                os.remove(cache_filepath)
+            return create_factory(), DiscoveryCache(cache_filepath)
+
+        def create_warm_cache():
+            if not os.path.isfile(cache_filepath):
+                create_factory().register_path(plugins_directory, cache=DiscoveryCache(cache_filepath))
+            return create_factory(), DiscoveryCache(cache_filepath)
+
+        def register_path_cache(args):
+            factory, cache = args
+            return factory.register_path(plugins_directory, cache=cache)
+
+        def create_touched_factory():
+            new_factory = create_registered_factory()
+            generate.touch_plugin_files(plugins_directory, touch_count)
+            return new_factory
+
+        names = _sample(create_registered_factory(lazy=True).names())
+        manifest_filepath = os.path.join(root, 'manifest.json')
+        create_registered_factory().export_manifest(manifest_filepath)
+
+        benchmarks = [
+            ('register_path', lambda x: x.register_path(plugins_directory), create_factory, file_count),
+            ('register_path_workers', lambda x: x.register_path(plugins_directory, workers=4), create_factory, file_count),
+            ('register_path_lazy', lambda x: x.register_path(plugins_directory, lazy=True), create_factory, file_count),
+            ('register_path_cache_cold', register_path_cache, create_cold_cache, file_count),
+            ('register_path_cache_warm', register_path_cache, create_warm_cache, file_count),
+            ('register_manifest', lambda x: x.register_manifest(manifest_filepath), create_factory, file_count),
+            ('lazy_get', lambda x: [x.get(name) for name in names], lambda: create_registered_factory(lazy=True), len(names)),
+            ('refresh_unchanged', lambda x: x.refresh(), create_registered_factory, file_count),
+            ('refresh_modified', lambda x: x.refresh(), create_touched_factory, touch_count),
+        ]
+
+        results = collections.OrderedDict()
+        for name, func, setup, operations in benchmarks:
+            results[name] = time_operation(func, setup=setup, operations=operations, repeat=repeat)
+        return results
+    finally:
+        sys.path.remove(root)
+        sys.modules.pop(generate.PLUGIN_ABSTRACT_MODULE, None)
+        shutil.rmtree(root, ignore_errors=True)
+
+
+# ------------------------------------------------------------------------------
+def run(sizes, file_counts, versions, repeat, groups=None, stream=sys.stdout):
+    """
+    Run the benchmarks.
+    :param Iterable[int] sizes: Item counts for item benchmarks.
+    :param Iterable[int] file_counts: File counts for path benchmarks.
+    :param int versions: Number of versions per name.
+    :param int repeat: Number of runs per benchmark.
+    :param Iterable[str]|None groups: Groups to run ('types', 'instances', 'paths'). None for all.
+    :param stream: Stream to write progress to.
+    :return: {group: {benchmark: {size: seconds}}}.
+    :rtype: collections.OrderedDict
+    """
+    suites = [
+        ('types', sizes, lambda size: benchmark_items(AbstractTypeFactory, generate.create_types, size, versions, repeat)),
+        ('instances', sizes, lambda size: benchmark_items(
+            AbstractInstanceFactory, generate.create_instances, size, versions, repeat,
+        )),
+        ('paths', file_counts, lambda size: benchmark_paths(size, versions, repeat)),
+    ]
+
+    results = collections.OrderedDict()
+    for group, group_sizes, benchmark in suites:
+        if groups and group not in groups:
+            continue
+        group_results = results[group] = collections.OrderedDict()
+        for size in group_sizes:
+            stream.write('Running {} ({})...\n'.format(group, size))
+            stream.flush()
+            for name, seconds in benchmark(size).items():
+                group_results.setdefault(name, collections.OrderedDict())[str(size)] = seconds
+    return results
+
+
+def format_seconds(seconds):
+    """
+    Format <seconds> with a readable unit.
+    :param float seconds: Seconds to format.
+    :rtype: str
+    """
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return '{:.2f}{}'.format(seconds / scale, unit)
+    return '{:.0f}ns'.format(seconds / 1e-9)
+
+
+def format_results(results):
+    """
+    Format <results> as a table per group, of per-operation times and scaling.
+    :param dict results: Results (see run).
+    :rtype: str
+    """
+    lines = []
+    for group, group_results in results.items():
+        sizes = sorted(set(size for timings in group_results.values() for size in timings), key=int)
+        width = max(len(name) for name in group_results)
+        lines.append('')
+        lines.append('{:<{}}  {}  {:>7}'.format(group, width, '  '.join('{:>10}'.format(x) for x in sizes), 'scaling'))
+        for name, timings in group_results.items():
+            scaling = get_scaling(dict((int(size), seconds) for size, seconds in timings.items()))
+            lines.append('{:<{}}  {}  {:>7}'.format(
+                name,
+                width,
+                '  '.join('{:>10}'.format(format_seconds(timings[x]) if x in timings else '-') for x in sizes),
+                '-' if scaling is None else '{:.2f}'.format(scaling),
+            ))
+    return '\n'.join(lines)
+
+
+def compare_results(results, baseline, threshold):
+    """
+    Compare <results> to <baseline>, listing benchmarks slower than <threshold> times their baseline.
+    :param dict results: Results (see run).
+    :param dict baseline: Baseline results (see run).
+    :param float threshold: Slowdown ratio considered a regression, ie 1.25.
+    :rtype: list[tuple[str, str, str, float]]
+    :return: (group, benchmark, size, ratio) of each regression, worst first.
+    """
+    regressions = []
+    for group, group_results in results.items():
+        for name, timings in group_results.items():
+            baseline_timings = baseline.get(group, {}).get(name, {})
+            for size, seconds in timings.items():
+                baseline_seconds = baseline_timings.get(size)
+                if baseline_seconds:
+                    ratio = seconds / baseline_seconds
+                    if ratio > threshold:
+                        regressions.append((group, name, size, ratio))
+    return sorted(regressions, key=lambda x: x[3], reverse=True)
+
+
+def get_environment():
+    """
+    Get a description of the running environment, to check results are comparable.
+    :rtype: dict
+    """
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+    }
+
+
+# ------------------------------------------------------------------------------
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', help='Item counts. Defaults to {}.'.format(DEFAULT_SIZES))
+    parser.add_argument('--files', type=int, nargs='+', help='File counts. Defaults to {}.'.format(DEFAULT_FILE_COUNTS))
+    parser.add_argument('--full', action='store_true', help='Use the full sizes (up to 10^5 items and 5000 files).')
+    parser.add_argument('--versions', type=int, default=5, help='Number of versions per name.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs per benchmark.')
+    parser.add_argument('--groups', nargs='+', choices=('types', 'instances', 'paths'), help='Groups to run.')
+    parser.add_argument('--save', help='Json filepath to save results to.')
+    parser.add_argument('--compare', help='Json filepath of baseline results to compare to.')
+    parser.add_argument('--threshold', type=float, default=1.25, help='Slowdown ratio considered a regression.')
+    options = parser.parse_args(args)
+
+    sizes = options.sizes or (FULL_SIZES if options.full else DEFAULT_SIZES)
+    file_counts = options.files or (FULL_FILE_COUNTS if options.full else DEFAULT_FILE_COUNTS)
+
+    # Lookup misses and import failures are expected, so are not logged.
+    LOGGER.setLevel(logging.CRITICAL)
+    results = run(sizes, file_counts, options.versions, options.repeat, groups=options.groups)
+    sys.stdout.write(format_results(results) + '\n')
+
+    environment = get_environment()
+    if options.save:
+        with open(options.save, 'w') as fp:
+            json.dump(
+                {
+                    'format': RESULTS_FORMAT_VERSION,
+                    'environment': environment,
+                    'versions': options.versions,
+                    'results': results,
+                },
+                fp,
+                indent=2,
+            )
+
+    if not options.compare:
+        return 0
+
+    with open(options.compare, 'r') as fp:
+        baseline = json.load(fp)
+    if baseline.get('environment') != environment or baseline.get('versions') != options.versions:
+        sys.stdout.write('\nWarning: baseline was run with a different environment or versions, so may not be comparable.\n')
+
+    regressions = compare_results(results, baseline.get('results', {}), options.threshold)
+    if not regressions:
+        sys.stdout.write('\nNo regressions against "{}".\n'.format(options.compare))
+        return 0
+
+    sys.stdout.write('\n{} regression(s) against "{}":\n'.format(len(regressions), options.compare))
+    for group, name, size, ratio in regressions:
+        sys.stdout.write('  {}/{} ({}) :: {:.2f}x slower\n'.format(group, name, size, ratio))
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -16,12 +16,14 @@ class RigComponentBuilder(object):
         )
 
     def build(self, component_data):
+        # Resolve all components in a single pass.
+        components = self.factory.get_many([
+            (data.pop('type'), data.pop('version', None))
+            for data in component_data
+        ])
+
         results = []
-        for data in component_data:
-            component = self.factory.get(
-                data.pop('type'),
-                version=data.pop('version', None),
-            )
+        for component, data in zip(components, component_data):
             instance = component()
             instance.build(**data)
             results.append(instance)
@@ -1,5 +1,6 @@
 import os
 import sys
+import threading
 import unittest
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
@@ -8,7 +9,7 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 if sys.version_info[0] == 2:
     unittest.TestCase.assertCountEqual = unittest.TestCase.assertItemsEqual
 
-from abstract_factories import AbstractTypeFactory, AbstractInstanceFactory
+from abstract_factories import AbstractTypeFactory, AbstractInstanceFactory, NameSearchModes, VersionRange
 
 
 class MockAbstract(object):
@@ -17,11 +18,13 @@ class MockAbstract(object):
 
 class MockItem1(MockAbstract):
     Name = 'MockItem1'
+    Category = 'Simple'
 
 
 class MockItem2(MockAbstract):
     Name = 'MockItem2'
     Version = 1.0
+    Category = 'Versioned'
 
 
 class MockItem2b(MockItem2):
@@ -32,6 +35,14 @@ class MockItem2c(MockItem2):
     Version = 3.0
 
 
+class MockUnhashableItem(MockAbstract):
+    Name = 'MockUnhashableItem'
+    __hash__ = None
+
+    def __eq__(self, other):
+        return isinstance(other, MockUnhashableItem)
+
+
 # ------------------------------------------------------------------------------
 class TestCallableIdentifierFactories(unittest.TestCase):
 
@@ -57,6 +68,340 @@ class TestCallableIdentifierFactories(unittest.TestCase):
         self.assertEqual(factory.get_name(MockItem2), 'MockItem2')
         self.assertEqual(factory.get_version(MockItem2), 1.0)
 
+    def test_callable_keys_resolved_once(self):
+        calls = []
+
+        def get_name(item):
+            calls.append(item)
+            return item.Name
+
+        factory = AbstractTypeFactory(MockAbstract, name_key=get_name)
+        factory.register_item(MockItem1)
+        factory.register_item(MockItem2)
+        self.assertEqual(len(calls), 2)
+
+        factory.get('MockItem1')
+        factory.names()
+        factory.versions('MockItem2')
+        factory.deregister_item(MockItem2)
+        self.assertEqual(len(calls), 2)
+
+
+# ------------------------------------------------------------------------------
+class TestVersionRange(unittest.TestCase):
+
+    def test_contains(self):
+        version_range = VersionRange(1, 3)
+        self.assertIn(1, version_range)
+        self.assertIn(2.5, version_range)
+        self.assertNotIn(3, version_range)
+        self.assertIn(3, VersionRange(1, 3, include_maximum=True))
+        self.assertNotIn(1, VersionRange(1, include_minimum=False))
+
+    def test_parse(self):
+        self.assertEqual(VersionRange.parse('>=2, <5'), VersionRange(2, 5))
+        self.assertEqual(VersionRange.parse('>2'), VersionRange(2, include_minimum=False))
+        self.assertEqual(VersionRange.parse('<=1.5'), VersionRange(maximum=1.5, include_maximum=True))
+        self.assertEqual(VersionRange.parse('==3'), VersionRange(3, 3, include_maximum=True))
+        self.assertRaises(ValueError, VersionRange.parse, '~2')
+
+    def test_compatible(self):
+        self.assertEqual(VersionRange.compatible(2.1), VersionRange(2.1, 3))
+        self.assertEqual(VersionRange.compatible((2, 1)), VersionRange((2, 1), (3,)))
+
+    def test_filter(self):
+        versions = [1, 2, 2.5, 3, 4]
+        self.assertListEqual(VersionRange(2, 4).filter(versions), [2, 2.5, 3])
+        self.assertListEqual(VersionRange.parse('>2,<=4').filter(versions), [2.5, 3, 4])
+        self.assertListEqual(VersionRange(5).filter(versions), [])
+        self.assertListEqual(VersionRange().filter(versions), versions)
+        self.assertListEqual(VersionRange().filter([None, 1, 2]), [1, 2])
+        self.assertListEqual(VersionRange(maximum=2).filter([None, 1, 2]), [1])
+
+
+# ------------------------------------------------------------------------------
+class TestRefreshKeys(unittest.TestCase):
+
+    def setUp(self):
+        self.factory = AbstractInstanceFactory(MockAbstract, name_key='Name', version_key='Version')
+
+    def test_refresh_item(self):
+        instance1 = MockItem2()
+        instance2 = MockItem2b()
+        self.factory.register_item(instance1)
+        self.factory.register_item(instance2)
+
+        instance1.Version = 4.0
+        self.assertIs(self.factory.get('MockItem2'), instance2)  # Not refreshed yet.
+
+        self.assertEqual(self.factory.refresh_keys(instance1), 1)
+        self.assertIs(self.factory.get('MockItem2'), instance1)
+        self.assertListEqual(self.factory.versions('MockItem2'), [2.0, 4.0])
+
+    def test_refresh_all(self):
+        instance1 = MockItem1()
+        instance2 = MockItem2()
+        self.factory.register_item(instance1)
+        self.factory.register_item(instance2)
+
+        instance1.Name = 'Renamed'
+        self.assertEqual(self.factory.refresh_keys(), 1)
+        self.assertCountEqual(self.factory.names(), ['Renamed', 'MockItem2'])
+        self.assertIs(self.factory.get('Renamed'), instance1)
+        self.assertIsNone(self.factory.get('MockItem1'))
+
+    def test_refresh_unchanged(self):
+        self.factory.register_item(MockItem1())
+        self.assertEqual(self.factory.refresh_keys(), 0)
+
+    def test_refresh_keeps_registration_order(self):
+        instance1 = MockItem2()
+        instance2 = MockItem2()
+        instance1.Version = 5.0
+        self.factory.register_item(instance1)
+        self.factory.register_item(instance2)
+
+        # instance1 moves into instance2's version, but was registered first so does not win.
+        instance1.Version = 1.0
+        self.factory.refresh_keys(instance1)
+        self.assertIs(self.factory.get('MockItem2', version=1.0), instance2)
+
+
+# ------------------------------------------------------------------------------
+class TestFrozenFactory(unittest.TestCase):
+
+    def setUp(self):
+        self.factory = AbstractTypeFactory(MockAbstract, name_key='Name', version_key='Version')
+        self.factory.register_items([MockItem2b, MockItem2, MockItem2c])
+        self.frozen = self.factory.freeze()
+
+    def test_get(self):
+        self.assertIs(self.frozen.get('MockItem2'), MockItem2c)
+        self.assertIs(self.frozen.get('MockItem2', version=1.0), MockItem2)
+        self.assertIs(self.frozen.get('MockItem2', version=VersionRange(1.0, 3.0)), MockItem2b)
+        self.assertIsNone(self.frozen.get('MockItem2', version=4.0))
+        self.assertIsNone(self.frozen.get('Missing'))
+        self.assertListEqual(
+            self.frozen.get_many(['MockItem2', ('MockItem2', 2.0), 'Missing']),
+            [MockItem2c, MockItem2b, None],
+        )
+
+    def test_queries(self):
+        self.assertTupleEqual(self.frozen.names(), ('MockItem2',))
+        self.assertTupleEqual(self.frozen.items(), (MockItem2b, MockItem2, MockItem2c))
+        self.assertListEqual(self.frozen.versions('MockItem2'), [1.0, 2.0, 3.0])
+        self.assertListEqual(self.frozen.versions('MockItem2', VersionRange.parse('>=2')), [2.0, 3.0])
+        self.assertListEqual(self.frozen.versions('Missing'), [])
+
+    def test_snapshot(self):
+        self.factory.register_item(MockItem1)
+        self.factory.deregister_item(MockItem2c)
+        self.assertIsNone(self.frozen.get('MockItem1'))
+        self.assertIs(self.frozen.get('MockItem2'), MockItem2c)
+
+    def test_read_only(self):
+        self.assertRaises(TypeError, self.frozen.register_item, MockItem1)
+        self.assertRaises(TypeError, self.frozen.register_items, [MockItem1])
+        self.assertRaises(TypeError, self.frozen.deregister_item, MockItem2)
+        self.assertRaises(TypeError, self.frozen.clear)
+        self.assertRaises(TypeError, self.frozen.register_manifest, 'manifest.json')
+        self.assertRaises(TypeError, self.frozen.add_index, 'Category')
+        self.assertRaises(TypeError, self.frozen.remove_index, 'Category')
+        self.assertRaises(TypeError, self.frozen.enable_metrics)
+        self.assertRaises(TypeError, setattr, self.frozen, '_items', ())
+        self.assertRaises(AttributeError, getattr, self.frozen, '__dict__')
+
+    def test_unorderable_versions(self):
+        factory = AbstractInstanceFactory(MockAbstract, name_key='Name', version_key='Version')
+        instance1 = MockItem2()
+        instance2 = MockItem2()
+        instance2.Version = None
+        factory.register_items([instance1, instance2])
+
+        # Latest can't be resolved on Python 3, as with the mutable factory.
+        frozen = factory.freeze()
+        if sys.version_info[0] == 2:
+            self.assertIs(frozen.get('MockItem2'), factory.get('MockItem2'))
+        else:
+            self.assertRaises(TypeError, factory.get, 'MockItem2')
+            self.assertRaises(TypeError, frozen.get, 'MockItem2')
+        self.assertIs(frozen.get('MockItem2', version=1.0), instance1)
+
+
+# ------------------------------------------------------------------------------
+class TestThreadSafety(unittest.TestCase):
+
+    def test_concurrent_register_and_get(self):
+        factory = AbstractInstanceFactory(MockAbstract, name_key='Name', version_key='Version')
+        stable = MockItem2()
+        factory.register_item(stable)
+
+        errors = []
+        stop = threading.Event()
+
+        def write(index):
+            try:
+                for iteration in range(200):
+                    instances = []
+                    for version in range(5):
+                        instance = MockItem1()
+                        instance.Name = 'Item{}_{}'.format(index, iteration % 10)
+                        instance.Version = version
+                        instances.append(instance)
+                    factory.register_items(instances)
+                    for instance in instances[::2]:
+                        factory.deregister_item(instance)
+            except Exception as e:
+                errors.append(e)
+
+        def read():
+            try:
+                while not stop.is_set():
+                    if factory.get('MockItem2') is not stable:
+                        errors.append(AssertionError('Stable item not found.'))
+                    self.assertIn(stable, factory.items())
+                    self.assertIn('MockItem2', factory.names())
+                    for name in factory.names():
+                        factory.versions(name)
+                        factory.get(name, version=VersionRange(1, 4))
+                    factory.get_many(['MockItem2', ('Item0_0', 3)])
+            except Exception as e:
+                errors.append(e)
+
+        writers = [threading.Thread(target=write, args=(index,)) for index in range(4)]
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+        self.assertListEqual(errors, [])
+        self.assertEqual(len(factory.items()), 1 + 4 * 200 * 2)
+        self.assertEqual(len(factory.names()), 1 + 4 * 10)
+
+
+# ------------------------------------------------------------------------------
+class TestNameSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.factory = AbstractInstanceFactory(MockAbstract, name_key='Name')
+        self.instances = {}
+        for name in ('IKChain', 'FKChain', 'IKSpline', 'Spine', 'ikHandle'):
+            instance = MockItem1()
+            instance.Name = name
+            self.instances[name] = instance
+            self.factory.register_item(instance)
+
+    def test_prefix(self):
+        self.assertListEqual(self.factory.search_names('ik'), ['IKChain', 'ikHandle', 'IKSpline'])
+        self.assertListEqual(self.factory.search_names('IKS'), ['IKSpline'])
+        self.assertListEqual(self.factory.search_names('ik', limit=2), ['IKChain', 'ikHandle'])
+        self.assertListEqual(self.factory.search_names('Missing'), [])
+        self.assertEqual(len(self.factory.search_names('')), 5)
+
+    def test_substring(self):
+        self.assertListEqual(self.factory.search_names('chain', NameSearchModes.Substring), ['FKChain', 'IKChain'])
+        self.assertListEqual(
+            self.factory.search_names('in', NameSearchModes.Substring),
+            ['Spine', 'FKChain', 'IKChain', 'IKSpline'],
+        )
+        self.assertListEqual(self.factory.search_names('h', NameSearchModes.Substring, limit=1), ['ikHandle'])
+        self.assertListEqual(self.factory.search_names('xyz', NameSearchModes.Substring), [])
+
+    def test_fuzzy(self):
+        self.assertListEqual(self.factory.search_names('spn', NameSearchModes.Fuzzy), ['Spine', 'IKSpline'])
+        self.assertListEqual(self.factory.search_names('ikc', NameSearchModes.Fuzzy), ['IKChain'])
+        self.assertListEqual(self.factory.search_names('nsp', NameSearchModes.Fuzzy), [])
+
+    def test_invalid_mode(self):
+        self.assertRaises(ValueError, self.factory.search_names, 'ik', 'regex')
+
+    def test_updates(self):
+        self.factory.deregister_item(self.instances['IKChain'])
+        self.assertListEqual(self.factory.search_names('ik'), ['ikHandle', 'IKSpline'])
+
+        self.instances['Spine'].Name = 'Torso'
+        self.factory.refresh_keys(self.instances['Spine'])
+        self.assertListEqual(self.factory.search_names('t'), ['Torso'])
+        self.assertListEqual(self.factory.search_names('spine', NameSearchModes.Substring), [])
+
+        self.factory.clear()
+        self.assertListEqual(self.factory.search_names(''), [])
+
+    def test_non_str_names(self):
+        instance = MockItem1()
+        instance.Name = 1
+        self.factory.register_item(instance)
+        self.assertEqual(len(self.factory.search_names('')), 5)
+
+
+# ------------------------------------------------------------------------------
+class TestLookupMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.factory = AbstractTypeFactory(MockAbstract, version_key='Version')
+        self.factory.register_item(MockItem1)
+        self.factory.register_item(MockItem2)
+
+    def test_disabled(self):
+        self.assertIsNone(self.factory.metrics())
+        self.factory.get('MockItem1')
+        self.assertIsNone(self.factory.metrics())
+
+    @unittest.skipIf(sys.version_info[0] == 2, 'assertLogs not supported.')
+    def test_counts(self):
+        metrics = self.factory.enable_metrics()
+        self.assertIs(self.factory.enable_metrics(), metrics)
+        self.assertIs(self.factory.metrics(), metrics)
+
+        self.factory.get('MockItem1')
+        self.factory.get('MockItem1')
+        self.factory.get('MockItem2', version=99)
+        with self.assertLogs('abstract_factories', level='WARNING'):
+            self.factory.get('Missing')
+            self.factory.get_many(['MockItem2', 'Missing'])
+
+        self.assertEqual(metrics.hits, 3)
+        self.assertEqual(metrics.misses, 3)
+        self.assertEqual(metrics.lookups, 6)
+        self.assertListEqual(metrics.name_counts(1), [('MockItem1', 2)])
+        self.assertEqual(dict(metrics.name_counts()), {'MockItem1': 2, 'MockItem2': 2, 'Missing': 2})
+        self.assertEqual(sum(count for _, count in metrics.histogram()), 6)
+
+        metrics.reset()
+        self.assertEqual(metrics.lookups, 0)
+        self.assertListEqual(metrics.name_counts(), [])
+
+        self.factory.disable_metrics()
+        self.assertIsNone(self.factory.metrics())
+
+    @unittest.skipIf(sys.version_info[0] == 2, 'assertLogs not supported.')
+    def test_callbacks(self):
+        metrics = self.factory.enable_metrics()
+        lookups = []
+
+        def callback(*args):
+            lookups.append(args[:3])
+
+        def failing_callback(*args):
+            raise RuntimeError('Callback failed.')
+
+        metrics.add_callback(callback)
+        metrics.add_callback(failing_callback)
+
+        with self.assertLogs('abstract_factories', level='ERROR'):
+            self.factory.get('MockItem2', version=1)
+        self.assertListEqual(lookups, [('MockItem2', 1, True)])
+
+        self.assertTrue(metrics.remove_callback(callback))
+        self.assertFalse(metrics.remove_callback(callback))
+        with self.assertLogs('abstract_factories', level='ERROR'):
+            self.factory.get('MockItem2')
+        self.assertEqual(len(lookups), 1)
+
 
 # ------------------------------------------------------------------------------
 class TestTypeFactoryItems(unittest.TestCase):
@@ -86,6 +431,31 @@ class TestTypeFactoryItems(unittest.TestCase):
         self.assertFalse(self.factory.register_item(instance))
         self.assertEqual(len(self.factory.items()), 0)
 
+    def test_register_items(self):
+        results = self.factory.register_items([MockItem1, MockItem1(), MockItem2c, MockItem2])
+        self.assertListEqual(results, [True, False, True, True])
+        self.assertListEqual(self.factory.items(), [MockItem1, MockItem2c, MockItem2])
+        self.assertEqual(self.factory.get('MockItem2'), MockItem2c)
+
+    def test_register_items_unresolvable(self):
+        factory = AbstractTypeFactory(MockAbstract, name_key='Label')
+        good_item = type('GoodItem', (MockAbstract,), {'Label': 'Good'})
+        bad_item = type('BadItem', (MockAbstract,), {})
+        other_item = type('OtherItem', (MockAbstract,), {'Label': 'Other'})
+
+        self.assertRaises(AttributeError, factory.register_items, [good_item, bad_item, other_item])
+        self.assertListEqual(factory.items(), [])
+        self.assertListEqual(factory.names(), [])
+
+        self.assertListEqual(factory.register_items([good_item, other_item]), [True, True])
+        self.assertIs(factory.get('Good'), good_item)
+        self.assertCountEqual(factory.names(), ['Good', 'Other'])
+
+    def test_register_items_duplicates(self):
+        results = self.factory.register_items(iter([MockItem1, MockItem1]))
+        self.assertListEqual(results, [True, False])
+        self.assertEqual(len(self.factory.items()), 1)
+
     def test_deregister_item(self):
         self.factory.register_item(MockItem1)
         self.assertTrue(self.factory.deregister_item(MockItem1))
@@ -120,6 +490,75 @@ class TestTypeFactoryItems(unittest.TestCase):
 
         self.assertEqual(self.factory.get('MockItem2'), MockItem2c)
 
+    def test_get_version_range(self):
+        self.factory.register_item(MockItem2b)
+        self.factory.register_item(MockItem2)
+        self.factory.register_item(MockItem2c)
+
+        self.assertEqual(self.factory.get('MockItem2', version=VersionRange(1.0, 3.0)), MockItem2b)
+        self.assertEqual(self.factory.get('MockItem2', version=VersionRange.parse('<=3')), MockItem2c)
+        self.assertEqual(self.factory.get('MockItem2', version=VersionRange.parse('>1,<2')), None)
+        self.assertEqual(self.factory.get('MockItem2', version=VersionRange.compatible(1.0)), MockItem2)
+        self.assertListEqual(self.factory.versions('MockItem2', VersionRange.parse('>=2')), [2.0, 3.0])
+
+    def test_get_version_range_unversioned(self):
+        # Unversioned (None) items are never in range.
+        MockItem1b = type('MockItem1b', (MockItem1,), {'Version': 2.0})
+        self.factory.register_items([MockItem1, MockItem1b])
+        for factory in (self.factory, self.factory.freeze()):
+            self.assertIs(factory.get('MockItem1', version=VersionRange(1.0)), MockItem1b)
+            self.assertIsNone(factory.get('MockItem1', version=VersionRange(maximum=2.0)))
+            self.assertListEqual(factory.versions('MockItem1', VersionRange(1.0)), [2.0])
+
+        factory = AbstractTypeFactory(MockAbstract, name_key='Name')
+        factory.register_item(MockItem2)
+        for factory in (factory, factory.freeze()):
+            self.assertIsNone(factory.get('MockItem2', version=1.0))
+            self.assertIsNone(factory.get('MockItem2', version=VersionRange(1.0)))
+            self.assertListEqual(factory.versions('MockItem2', VersionRange(1.0)), [])
+
+    def test_get_missing_version(self):
+        self.factory.register_item(MockItem2)
+        self.assertIsNone(self.factory.get('MockItem2', version=4.0))
+
+    @unittest.skipIf(sys.version_info[0] == 2, 'assertLogs not supported.')
+    def test_get_many(self):
+        self.factory.register_items([MockItem1, MockItem2, MockItem2b])
+
+        with self.assertLogs('abstract_factories', level='WARNING') as logs:
+            results = self.factory.get_many([
+                'MockItem1',
+                ('MockItem2', 1.0),
+                ('MockItem2', None),
+                ('Missing', None),
+                ('MockItem2', 4.0),
+                'Missing',
+            ])
+        self.assertListEqual(results, [MockItem1, MockItem2, MockItem2b, None, None, None])
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn('Missing', logs.output[0])
+
+    def test_get_after_deregister(self):
+        self.factory.register_item(MockItem2)
+        self.factory.register_item(MockItem2c)
+        self.factory.deregister_item(MockItem2c)
+
+        self.assertEqual(self.factory.get('MockItem2'), MockItem2)
+        self.assertIsNone(self.factory.get('MockItem2', version=3.0))
+
+        self.factory.deregister_item(MockItem2)
+        self.assertIsNone(self.factory.get('MockItem2'))
+        self.assertNotIn('MockItem2', self.factory.names())
+
+    def test_get_unversioned(self):
+        factory = AbstractTypeFactory(MockAbstract, name_key='Name')
+        factory.register_item(MockItem2)
+        factory.register_item(MockItem2b)
+
+        # Without versioning, the last registered item wins.
+        self.assertEqual(factory.get('MockItem2'), MockItem2b)
+        self.assertListEqual(factory.versions('MockItem2'), [])
+
     def test_names(self):
         self.factory.register_item(MockItem1)
         self.factory.register_item(MockItem2)
@@ -147,6 +586,36 @@ class TestTypeFactoryItems(unittest.TestCase):
 
         self.assertCountEqual(self.factory.items(), [MockItem1, MockItem2])
 
+    def test_find(self):
+        self.factory.register_items([MockItem1, MockItem2, MockItem2b, MockItem2c])
+
+        self.assertListEqual(self.factory.find({'Category': 'Simple'}), [MockItem1])
+        self.assertListEqual(self.factory.find({'Category': 'Versioned', 'Version': 2.0}), [MockItem2b])
+        self.assertListEqual(self.factory.find({'Category': 'Missing'}), [])
+        self.assertListEqual(self.factory.find({'Missing': None}), [])
+        self.assertListEqual(
+            self.factory.find({'Category': 'Versioned'}, predicate=lambda item: item.Version > 1.0),
+            [MockItem2b, MockItem2c],
+        )
+        self.assertListEqual(self.factory.find(), [MockItem1, MockItem2, MockItem2b, MockItem2c])
+
+    def test_find_indexed(self):
+        self.assertTrue(self.factory.add_index('Category'))
+        self.assertFalse(self.factory.add_index('Category'))
+        self.factory.register_items([MockItem1, MockItem2, MockItem2b])
+
+        self.assertTrue(self.factory.add_index('Version'))
+        self.assertListEqual(self.factory.find({'Category': 'Versioned'}), [MockItem2, MockItem2b])
+        self.assertListEqual(self.factory.find({'Category': 'Versioned', 'Version': 2.0}), [MockItem2b])
+
+        self.factory.deregister_item(MockItem2)
+        self.assertListEqual(self.factory.find({'Category': 'Versioned'}), [MockItem2b])
+
+        self.factory.clear()
+        self.assertListEqual(self.factory.find({'Category': 'Versioned'}), [])
+        self.assertTrue(self.factory.remove_index('Category'))
+        self.assertFalse(self.factory.remove_index('Category'))
+
     def test_clear(self):
         self.factory.register_item(MockItem1)
         self.factory.clear()
@@ -193,6 +662,17 @@ class TestInstanceFactoryItems(unittest.TestCase):
         self.assertFalse(self.factory.register_item(instance))
         self.assertEqual(len(self.factory.items()), 1)
 
+    def test_register_unhashable_item(self):
+        instance1 = MockUnhashableItem()
+        instance2 = MockUnhashableItem()
+        self.assertTrue(self.factory.register_item(instance1))
+        self.assertTrue(self.factory.register_item(instance2))  # Equal, but tracked by identity.
+        self.assertEqual(len(self.factory.items()), 2)
+
+        self.assertTrue(self.factory.deregister_item(instance1))
+        self.assertEqual(self.factory.items(), [instance2])
+        self.assertIs(self.factory.get('MockUnhashableItem'), instance2)
+
     def test_get_name(self):
         instance = MockItem1()
         self.factory.register_item(instance)
@@ -271,6 +751,21 @@ class TestInstanceFactoryItems(unittest.TestCase):
 
         self.assertCountEqual(self.factory.items(), [instance1, instance2, instance3])
 
+    def test_find_indexed(self):
+        instance1 = MockItem1()
+        instance2 = MockItem2()
+        instance2.Category = ['Unhashable']
+        instance3 = MockItem2c()
+        self.factory.add_index('Category')
+        self.factory.register_items([instance1, instance2, instance3])
+
+        self.assertListEqual(self.factory.find({'Category': 'Versioned'}), [instance3])
+        self.assertListEqual(self.factory.find({'Category': ['Unhashable']}), [instance2])
+
+        instance3.Category = 'Changed'
+        self.factory.refresh_keys(instance3)
+        self.assertListEqual(self.factory.find({'Category': 'Changed'}), [instance3])
+
     def test_clear(self):
         instance1 = MockItem1()
         self.factory.register_item(instance1)
@@ -294,6 +789,21 @@ class TestMultiTypeFactoryItems(TestTypeFactoryItems):
         self.assertTrue(self.factory.register_item(MockItem1))
         self.assertEqual(len(self.factory.items()), 2)
 
+    def test_register_items_duplicates(self):
+        results = self.factory.register_items(iter([MockItem1, MockItem1]))
+        self.assertListEqual(results, [True, True])
+        self.assertEqual(len(self.factory.items()), 2)
+
+    def test_deregister_duplicate_item(self):
+        self.factory.register_item(MockItem1)
+        self.factory.register_item(MockItem2)
+        self.factory.register_item(MockItem1)
+        self.assertEqual(self.factory.items(), [MockItem1, MockItem2, MockItem1])
+
+        self.assertTrue(self.factory.deregister_item(MockItem1))
+        self.assertEqual(self.factory.items(), [MockItem2])
+        self.assertIsNone(self.factory.get('MockItem1'))
+
 
 # ------------------------------------------------------------------------------
 class TestMultiInstanceFactoryItems(TestInstanceFactoryItems):
@@ -1,12 +1,30 @@
 from unittest.mock import patch
+import asyncio
+import multiprocessing
 import os
+import shutil
 import sys
+import tempfile
+import threading
 import unittest
+import zipfile
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from .abstract import VehicleAbstract
-from abstract_factories import AbstractTypeFactory, AbstractInstanceFactory
+from abstract_factories import (
+    AbstractTypeFactory,
+    AbstractInstanceFactory,
+    DiscoveryCache,
+    DiscoveryHub,
+    FactoryWatcher,
+    FileSources,
+    invalidate_modules,
+    isolated,
+    manifest,
+    utils,
+)
+from abstract_factories.aio import AsyncFactory
 
 try:
     from io import StringIO
@@ -158,6 +176,612 @@ class TestVehicleInstanceFilepathFactory(TestVehicleInstanceFactory):
         )
 
 
+class TestVehicleInstanceWorkersFactory(TestVehicleInstanceFactory):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.VehicleFactory = AbstractInstanceFactory(VehicleAbstract, name_key='name', version_key='year')
+        cls.VehicleFactory.register_path(subclass_directory, workers=4)
+
+
+class TestVehicleTypeLazyFactory(TestVehicleTypeFactory):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.VehicleFactory = AbstractTypeFactory(VehicleAbstract)
+        cls.VehicleFactory.register_path(subclass_directory, lazy=True)
+
+    def test_lazy_import(self):
+        factory = AbstractTypeFactory(VehicleAbstract)
+        with patch('abstract_factories.utils.import_from_filepath', wraps=utils.import_from_filepath) as mock_import:
+            self.assertEqual(factory.register_path(subclass_directory, lazy=True), 4)
+            self.assertCountEqual(factory.names(), ['Car', 'Truck', 'Truck2', 'Motorcycle'])
+            self.assertEqual(mock_import.call_count, 0)
+
+            self.assertIsNotNone(factory.get('Car'))
+            self.assertIsNotNone(factory.get('Truck'))
+            self.assertEqual(mock_import.call_count, 1)
+
+        self.assertEqual(len(factory.items()), 4)
+
+    def test_lazy_search_names(self):
+        factory = AbstractTypeFactory(VehicleAbstract)
+        with patch('abstract_factories.utils.import_from_filepath', wraps=utils.import_from_filepath) as mock_import:
+            factory.register_path(subclass_directory, lazy=True)
+            self.assertListEqual(factory.search_names('tru'), ['Truck', 'Truck2'])
+            self.assertEqual(mock_import.call_count, 0)
+
+        factory.get('Truck')
+        self.assertListEqual(factory.search_names('tru'), ['Truck', 'Truck2'])
+
+    def test_lazy_get_many(self):
+        factory = AbstractTypeFactory(VehicleAbstract)
+        factory.register_path(subclass_directory, lazy=True)
+        with patch('abstract_factories.utils.import_from_filepath', wraps=utils.import_from_filepath) as mock_import:
+            results = factory.get_many(['Car', 'Truck', 'Car'])
+            self.assertEqual(mock_import.call_count, 1)
+
+        self.assertListEqual([x.__name__ for x in results], ['Car', 'Truck', 'Car'])
+
+
+# ------------------------------------------------------------------------------
+class TestSharedModules(unittest.TestCase):
+
+    def test_shared_between_factories(self):
+        factory = AbstractTypeFactory(VehicleAbstract)
+        factory.register_path(subclass_directory)
+        with patch('abstract_factories.utils._import_from_filepath', wraps=utils._import_from_filepath) as mock_import:
+            other_factory = AbstractTypeFactory(VehicleAbstract)
+            other_factory.register_path(subclass_directory)
+            instance_factory = AbstractInstanceFactory(VehicleAbstract)
+            instance_factory.register_path(subclass_directory)
+            self.assertEqual(mock_import.call_count, 0)
+
+        self.assertIs(other_factory.get('Car'), factory.get('Car'))
+
+    def test_invalidate_modules(self):
+        factory = AbstractTypeFactory(VehicleAbstract)
+        factory.register_path(subclass_directory)
+        self.assertGreater(invalidate_modules(), 0)
+
+        other_factory = AbstractTypeFactory(VehicleAbstract)
+        other_factory.register_path(subclass_directory)
+        self.assertIsNot(other_factory.get('Car'), factory.get('Car'))
+
+
+# ------------------------------------------------------------------------------
+class TestDiscoveryHub(unittest.TestCase):
+
+    def setUp(self):
+        self.type_factory = AbstractTypeFactory(VehicleAbstract)
+        self.instance_factory = AbstractInstanceFactory(VehicleAbstract, name_key='name', version_key='year')
+        self.other_factory = AbstractTypeFactory(DiscoveryHub)
+        self.hub = DiscoveryHub([self.type_factory, self.instance_factory, self.other_factory])
+
+    def test_register_path(self):
+        invalidate_modules()
+        with patch('abstract_factories.utils._import_from_filepath', wraps=utils._import_from_filepath) as mock_import:
+            counts = self.hub.register_path(subclass_directory)
+            self.assertEqual(mock_import.call_count, 1)
+
+        self.assertListEqual(list(counts.values()), [4, 7, 0])
+        self.assertCountEqual(self.type_factory.names(), ['Car', 'Truck', 'Truck2', 'Motorcycle'])
+        self.assertIsNotNone(self.instance_factory.get('Ford F-150', version=2018))
+        self.assertListEqual(self.other_factory.items(), [])
+
+        expected_factory = AbstractInstanceFactory(VehicleAbstract, name_key='name', version_key='year')
+        expected_factory.register_path(subclass_directory)
+        self.assertListEqual(self.instance_factory.items(), expected_factory.items())
+
+    def test_refresh(self):
+        self.hub.register_path(subclass_directory)
+        self.assertListEqual(self.type_factory.paths(), [(utils.normalise_path(subclass_directory), True)])
+        self.assertEqual(self.type_factory.stats().get(self.type_factory.stats().files()[0].filepath).items, 4)
+        self.assertEqual(self.type_factory.refresh(), 0)
+
+    def test_register_module(self):
+        module = utils.import_from_filepath(os.path.join(subclass_directory, 'vehicles.py'))
+        counts = self.hub.register_module(module)
+        self.assertListEqual(list(counts.values()), [4, 7, 0])
+        self.assertListEqual(list(self.hub.register_module(None).values()), [0, 0, 0])
+
+    def test_subscribe(self):
+        self.assertEqual(len(self.hub), 3)
+        self.assertFalse(self.hub.subscribe(self.type_factory))
+        self.assertTrue(self.hub.unsubscribe(self.type_factory))
+        self.assertFalse(self.hub.unsubscribe(self.type_factory))
+        self.assertNotIn(self.type_factory, self.hub)
+
+        self.hub.register_path(subclass_directory)
+        self.assertListEqual(self.type_factory.items(), [])
+
+    def test_abc_abstract(self):
+        import abc
+
+        AbstractBase = abc.ABCMeta('AbstractBase', (object,), {})
+        AbstractBase.register(VehicleAbstract)
+        abc_factory = AbstractTypeFactory(AbstractBase)
+        self.hub.subscribe(abc_factory)
+
+        counts = self.hub.register_path(subclass_directory)
+        self.assertEqual(counts[abc_factory], 5)
+        self.assertIn(VehicleAbstract, abc_factory.items())
+
+
+# ------------------------------------------------------------------------------
+class TestIsolatedDiscovery(unittest.TestCase):
+
+    def test_register_path(self):
+        factory = AbstractTypeFactory(VehicleAbstract)
+        with patch('abstract_factories.utils.import_from_filepath', wraps=utils.import_from_filepath) as mock_import:
+            self.assertEqual(factory.register_path(subclass_directory, processes=2), 4)
+            self.assertCountEqual(factory.names(), ['Car', 'Truck', 'Truck2', 'Motorcycle'])
+            self.assertEqual(mock_import.call_count, 0)
+            self.assertListEqual([x.source for x in factory.stats().files()], [FileSources.Process])
+
+            self.assertEqual(factory.get('Truck').__name__, 'Truck')
+            self.assertEqual(mock_import.call_count, 1)
+
+        self.assertEqual(len(factory.items()), 4)
+
+    def test_mp_context(self):
+        self.assertEqual(isolated._get_mp_context().get_start_method(), 'spawn')
+        context = multiprocessing.get_context('spawn')
+        self.assertIs(isolated._get_mp_context(context), context)
+
+        start_method = multiprocessing.get_all_start_methods()[0]
+        factory = AbstractTypeFactory(VehicleAbstract)
+        self.assertEqual(factory.register_path(subclass_directory, processes=2, mp_context=start_method), 4)
+        self.assertListEqual([x.source for x in factory.stats().files()], [FileSources.Process])
+
+    def test_cache(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        cache = DiscoveryCache(os.path.join(directory, 'cache.json'))
+
+        AbstractTypeFactory(VehicleAbstract).register_path(subclass_directory, cache=cache, processes=2)
+        factory = AbstractTypeFactory(VehicleAbstract)
+        factory.register_path(subclass_directory, cache=DiscoveryCache(cache.filepath))
+        self.assertListEqual([x.source for x in factory.stats().files()], [FileSources.Cache])
+        self.assertCountEqual(factory.names(), ['Car', 'Truck', 'Truck2', 'Motorcycle'])
+
+    def test_unpicklable_abstract(self):
+        local_abstract = type('LocalAbstract', (object,), {})
+        factory = AbstractTypeFactory(local_abstract)
+        self.assertEqual(factory.register_path(subclass_directory, processes=2), 0)
+        self.assertListEqual([x.source for x in factory.stats().files()], [FileSources.Import])
+
+    def test_unsupported(self):
+        factory = AbstractInstanceFactory(VehicleAbstract, name_key='name', version_key='year')
+        self.assertEqual(factory.register_path(subclass_directory, processes=2), 7)
+        self.assertListEqual([x.source for x in factory.stats().files()], [FileSources.Import])
+
+    def test_qualname(self):
+        module = utils.import_from_filepath(os.path.join(subclass_directory, 'vehicles.py'))
+        self.assertEqual(isolated.get_qualname(module, 'Car', module.Car), 'Car')
+        self.assertEqual(isolated.get_qualname(module, 'Alias', module.Car), 'Car')
+        self.assertIs(isolated.resolve_qualname(module, 'Car'), module.Car)
+        self.assertRaises(AttributeError, isolated.resolve_qualname, module, 'Missing')
+
+
+# ------------------------------------------------------------------------------
+class TestManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.plugin_directory = os.path.join(self.directory, 'plugins')
+        os.makedirs(self.plugin_directory)
+        self.plugin_filepath = os.path.join(self.plugin_directory, 'vehicles.py')
+        shutil.copy(os.path.join(subclass_directory, 'vehicles.py'), self.plugin_filepath)
+        self.manifest_filepath = os.path.join(self.directory, 'manifest.json')
+
+    def test_type_factory(self):
+        factory = AbstractTypeFactory(VehicleAbstract)
+        factory.register_path(self.plugin_directory)
+        self.assertEqual(factory.export_manifest(self.manifest_filepath), 4)
+
+        manifest_factory = AbstractTypeFactory(VehicleAbstract)
+        with patch('abstract_factories.utils.import_from_filepath', wraps=utils.import_from_filepath) as mock_import:
+            self.assertEqual(manifest_factory.register_manifest(self.manifest_filepath), 4)
+            self.assertCountEqual(manifest_factory.names(), ['Car', 'Truck', 'Truck2', 'Motorcycle'])
+            self.assertEqual(mock_import.call_count, 0)
+
+            self.assertIs(manifest_factory.get('Car'), factory.get('Car'))
+            self.assertEqual(mock_import.call_count, 1)
+
+        self.assertCountEqual(manifest_factory.items(), factory.items())
+
+    def test_instance_factory(self):
+        factory = AbstractInstanceFactory(VehicleAbstract, name_key='name', version_key='year')
+        factory.register_path(self.plugin_directory)
+        self.assertEqual(factory.export_manifest(self.manifest_filepath), 7)
+
+        manifest_factory = AbstractInstanceFactory(VehicleAbstract, name_key='name', version_key='year')
+        self.assertEqual(manifest_factory.register_manifest(self.manifest_filepath), 7)
+        self.assertEqual(manifest_factory.get('Ford F-150', version=2018).year, 2018)
+        self.assertListEqual(manifest_factory.items(), factory.items())
+
+        type_factory = AbstractTypeFactory(VehicleAbstract)
+        self.assertRaises(ValueError, type_factory.register_manifest, self.manifest_filepath)
+
+    def test_callable_keys(self):
+        factory = AbstractTypeFactory(VehicleAbstract)
+        factory.register_path(self.plugin_directory)
+        factory.export_manifest(self.manifest_filepath)
+
+        callable_factory = AbstractTypeFactory(VehicleAbstract, name_key=lambda x: x.__name__.lower())
+        callable_factory.register_path(self.plugin_directory)
+        self.assertRaises(ValueError, callable_factory.export_manifest, os.path.join(self.directory, 'other.json'))
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'other.json')))
+
+        callable_factory = AbstractTypeFactory(VehicleAbstract, name_key=lambda x: x.__name__.lower())
+        self.assertRaises(ValueError, callable_factory.register_manifest, self.manifest_filepath)
+        self.assertListEqual(callable_factory.names(), [])
+
+    def test_relative_paths(self):
+        factory = AbstractTypeFactory(VehicleAbstract)
+        factory.register_path(self.plugin_directory)
+        factory.export_manifest(self.manifest_filepath)
+
+        with open(self.manifest_filepath, 'r') as fp:
+            self.assertIn('"plugins/vehicles.py"', fp.read())
+
+        moved_directory = self.directory + '_moved'
+        shutil.move(self.directory, moved_directory)
+        self.addCleanup(shutil.move, moved_directory, self.directory)
+
+        manifest_factory = AbstractTypeFactory(VehicleAbstract)
+        manifest_factory.register_manifest(os.path.join(moved_directory, 'manifest.json'))
+        self.assertEqual(manifest_factory.get('Car').__name__, 'Car')
+        self.assertListEqual(manifest.check_manifest(os.path.join(moved_directory, 'manifest.json')), [])
+
+    def test_drift(self):
+        factory = AbstractTypeFactory(VehicleAbstract)
+        factory.register_path(self.plugin_directory)
+        factory.export_manifest(self.manifest_filepath)
+
+        with open(self.plugin_filepath, 'a') as fp:
+            fp.write('\n\nclass Bus(VehicleAbstract):\n    pass\n')
+        self.assertListEqual(manifest.check_manifest(self.manifest_filepath), [utils.normalise_path(self.plugin_filepath)])
+
+        manifest_factory = AbstractTypeFactory(VehicleAbstract)
+        manifest_factory.register_manifest(self.manifest_filepath)
+        with self.assertLogs('abstract_factories', level='WARNING'):
+            self.assertIsNotNone(manifest_factory.get('Car'))
+        self.assertIsNotNone(manifest_factory.get('Bus'))
+
+        unverified_factory = AbstractTypeFactory(VehicleAbstract)
+        unverified_factory.register_manifest(self.manifest_filepath, verify=False)
+        unverified_factory.get('Car')
+        self.assertCountEqual(unverified_factory.names(), ['Car', 'Truck', 'Truck2', 'Motorcycle'])
+
+
+# ------------------------------------------------------------------------------
+class TestAsyncFactory(unittest.TestCase):
+
+    def test_register_path(self):
+        async def run():
+            async_factory = AsyncFactory(AbstractTypeFactory(VehicleAbstract))
+            task = async_factory.register_path(subclass_directory)
+            self.assertFalse(async_factory.is_ready)
+            await async_factory.ready()
+            self.assertTrue(async_factory.is_ready)
+            self.assertEqual(task.result(), 4)
+            return async_factory
+
+        async_factory = asyncio.run(run())
+        self.assertCountEqual(async_factory.factory.names(), ['Car', 'Truck', 'Truck2', 'Motorcycle'])
+        self.assertEqual(len(async_factory.factory.paths()), 1)
+
+    def test_get_waits(self):
+        async def run():
+            async_factory = AsyncFactory(AbstractTypeFactory(VehicleAbstract))
+            async_factory.register_path(subclass_directory, lazy=True)
+            car = await async_factory.get('Car')
+            vehicles = await async_factory.get_many(['Truck', 'Motorcycle'])
+            return car, vehicles
+
+        car, vehicles = asyncio.run(run())
+        self.assertEqual(car.__name__, 'Car')
+        self.assertListEqual([x.__name__ for x in vehicles], ['Truck', 'Motorcycle'])
+
+    def test_register_module(self):
+        from . import abstract
+
+        async def run():
+            async_factory = AsyncFactory(AbstractTypeFactory(VehicleAbstract))
+            return await async_factory.register_module(abstract)
+
+        self.assertEqual(asyncio.run(run()), 0)
+
+    def test_cache(self):
+        directory = tempfile.mkdtemp()
+        try:
+            cache_filepath = os.path.join(directory, 'cache.json')
+
+            async def run():
+                async_factory = AsyncFactory(AbstractTypeFactory(VehicleAbstract))
+                return await async_factory.register_path(subclass_directory, cache=DiscoveryCache(cache_filepath))
+
+            self.assertEqual(asyncio.run(run()), 4)
+            self.assertTrue(os.path.isfile(cache_filepath))
+        finally:
+            shutil.rmtree(directory)
+
+
+# ------------------------------------------------------------------------------
+class TestDiscoveryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.plugin_directory = os.path.join(self.directory, 'plugins')
+        shutil.copytree(subclass_directory, self.plugin_directory)
+        with open(os.path.join(self.plugin_directory, 'empty.py'), 'w') as fp:
+            fp.write('VALUE = 1\n')
+        self.cache_filepath = os.path.join(self.directory, 'cache.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def register(self, factory, use_hash=False):
+        with patch('abstract_factories.utils.import_from_filepath', wraps=utils.import_from_filepath) as mock_import:
+            count = factory.register_path(self.plugin_directory, cache=DiscoveryCache(self.cache_filepath, use_hash))
+        return count, mock_import.call_count
+
+    def test_cached_type_factory(self):
+        self.assertEqual(self.register(AbstractTypeFactory(VehicleAbstract)), (4, 2))
+        self.assertTrue(os.path.isfile(self.cache_filepath))
+
+        factory = AbstractTypeFactory(VehicleAbstract)
+        self.assertEqual(self.register(factory), (4, 0))
+        self.assertCountEqual(factory.names(), ['Car', 'Truck', 'Truck2', 'Motorcycle'])
+        self.assertIsNotNone(factory.get('Truck2'))
+        self.assertEqual(len(factory.items()), 4)
+
+    def test_cached_instance_factory(self):
+        factory = AbstractInstanceFactory(VehicleAbstract, name_key='name', version_key='year')
+        self.assertEqual(self.register(factory), (7, 2))
+
+        factory = AbstractInstanceFactory(VehicleAbstract, name_key='name', version_key='year')
+        self.assertEqual(self.register(factory), (7, 0))
+        self.assertEqual(factory.versions('Ford F-150'), [2018, 2020])
+
+    def test_modified_file(self):
+        self.register(AbstractTypeFactory(VehicleAbstract), use_hash=True)
+
+        filepath = os.path.join(self.plugin_directory, 'vehicles.py')
+        with open(filepath, 'a') as fp:
+            fp.write('\n\nclass Bus(Car):\n    pass\n')
+
+        factory = AbstractTypeFactory(VehicleAbstract)
+        self.assertEqual(self.register(factory, use_hash=True), (5, 1))
+        self.assertEqual(self.register(AbstractTypeFactory(VehicleAbstract), use_hash=True), (5, 0))
+
+    def test_callable_keys_not_cached(self):
+        factory = AbstractTypeFactory(VehicleAbstract, name_key=lambda item: item.__name__)
+        self.assertEqual(self.register(factory), (4, 2))
+        self.assertFalse(os.path.isfile(self.cache_filepath))
+
+
+# ------------------------------------------------------------------------------
+class TestArchivePaths(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.archive_path = os.path.join(self.directory, 'plugins.zip')
+        with open(os.path.join(subclass_directory, 'vehicles.py')) as fp:
+            self.source = fp.read()
+        self.write_archive(self.source)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_archive(self, source):
+        with zipfile.ZipFile(self.archive_path, 'w') as archive:
+            archive.writestr('plugins/vehicles.py', source)
+
+    def test_register_archive(self):
+        factory = AbstractTypeFactory(VehicleAbstract)
+        self.assertEqual(factory.register_path(self.archive_path), 4)
+        self.assertCountEqual(factory.names(), ['Car', 'Truck', 'Truck2', 'Motorcycle'])
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'plugins')))  # Not extracted.
+
+    def test_register_archive_lazy(self):
+        factory = AbstractTypeFactory(VehicleAbstract)
+        with patch('abstract_factories.utils.import_from_filepath', wraps=utils.import_from_filepath) as mock_import:
+            self.assertEqual(factory.register_path(self.archive_path, lazy=True), 4)
+            self.assertEqual(mock_import.call_count, 0)
+            self.assertIsNotNone(factory.get('Car'))
+            self.assertEqual(mock_import.call_count, 1)
+
+    def test_refresh_replaced_archive(self):
+        factory = AbstractTypeFactory(VehicleAbstract, paths=[self.archive_path])
+        self.assertEqual(factory.refresh(), 0)
+
+        self.write_archive(self.source + '\n\nclass Bus(Car):\n    pass\n')
+        mtime = os.path.getmtime(self.archive_path) + 10
+        os.utime(self.archive_path, (mtime, mtime))
+
+        self.assertEqual(factory.refresh([self.archive_path]), 1)
+        self.assertIsNotNone(factory.get('Bus'))
+
+
+# ------------------------------------------------------------------------------
+class TestDiscoveryStats(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        shutil.copytree(subclass_directory, os.path.join(self.directory, 'plugins'))
+        self.directory = os.path.join(self.directory, 'plugins')
+        self.vehicles_filepath = utils.normalise_path(os.path.join(self.directory, 'vehicles.py'))
+        self.broken_filepath = utils.normalise_path(os.path.join(self.directory, 'broken.py'))
+        with open(self.broken_filepath, 'w') as fp:
+            fp.write('raise RuntimeError("Broken plugin.")\n')
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.directory))
+
+    def test_stats(self):
+        factory = AbstractTypeFactory(VehicleAbstract)
+        factory.register_path(self.directory)
+        stats = factory.stats()
+
+        self.assertEqual(len(stats), 2)
+        self.assertEqual(len(stats.walks()), 1)
+        self.assertEqual(stats.walks()[0][2], 2)
+
+        vehicles_stats = stats.get(self.vehicles_filepath)
+        self.assertEqual(vehicles_stats.source, FileSources.Import)
+        self.assertEqual(vehicles_stats.items, 4)
+        self.assertIsNone(vehicles_stats.error)
+        self.assertGreater(vehicles_stats.seconds, 0)
+
+        failures = stats.failures()
+        self.assertListEqual([x.filepath for x in failures], [self.broken_filepath])
+        self.assertIsInstance(failures[0].error, RuntimeError)
+
+        report = stats.report()
+        self.assertIn(self.vehicles_filepath, report)
+        self.assertIn('Broken plugin.', report)
+
+        factory.clear()
+        self.assertEqual(len(factory.stats()), 0)
+
+    def test_stats_lazy(self):
+        factory = AbstractTypeFactory(VehicleAbstract)
+        factory.register_path(self.directory, lazy=True)
+        self.assertEqual(factory.stats().get(self.vehicles_filepath).source, FileSources.Scan)
+
+        factory.get('Car')
+        self.assertEqual(factory.stats().get(self.vehicles_filepath).source, FileSources.Import)
+
+    def test_stats_profile(self):
+        factory = AbstractTypeFactory(VehicleAbstract)
+        factory.register_path(self.directory, workers=2, profile=True)
+        self.assertIsNotNone(factory.stats().get(self.vehicles_filepath).profile)
+        self.assertIsNone(AbstractTypeFactory(VehicleAbstract, paths=[self.directory]).stats().files()[0].profile)
+
+
+# ------------------------------------------------------------------------------
+class TestRefresh(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        shutil.copytree(subclass_directory, os.path.join(self.directory, 'plugins'))
+        self.directory = os.path.join(self.directory, 'plugins')
+        self.factory = AbstractTypeFactory(VehicleAbstract, paths=[self.directory])
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.directory))
+
+    def write(self, filename, source):
+        filepath = os.path.join(self.directory, filename)
+        existed = os.path.exists(filepath)
+        with open(filepath, 'a') as fp:
+            fp.write(source)
+        if existed:
+            # Ensure the mtime changes, regardless of filesystem resolution.
+            mtime = os.path.getmtime(filepath) + 10
+            os.utime(filepath, (mtime, mtime))
+        return filepath
+
+    def test_refresh_unchanged(self):
+        with patch('abstract_factories.utils.import_from_filepath') as mock_import:
+            self.assertEqual(self.factory.refresh(), 0)
+            self.assertEqual(mock_import.call_count, 0)
+
+    def test_refresh_modified(self):
+        car = self.factory.get('Car')
+        self.write('vehicles.py', '\n\nclass Bus(Car):\n    pass\n')
+
+        self.assertEqual(self.factory.refresh(), 1)
+        self.assertIsNotNone(self.factory.get('Bus'))
+        self.assertIsNot(self.factory.get('Car'), car)
+        self.assertEqual(len(self.factory.items()), 5)
+
+    def test_refresh_added_deleted(self):
+        self.write(
+            'boats.py',
+            'from test_abstract_factories_paths.abstract import VehicleAbstract\n\n\n'
+            'class Boat(VehicleAbstract):\n    pass\n',
+        )
+        with patch('abstract_factories.utils.import_from_filepath', wraps=utils.import_from_filepath) as mock_import:
+            self.assertEqual(self.factory.refresh(), 1)
+            self.assertEqual(mock_import.call_count, 1)
+        self.assertIsNotNone(self.factory.get('Boat'))
+
+        os.remove(os.path.join(self.directory, 'vehicles.py'))
+        self.assertEqual(self.factory.refresh(), 1)
+        self.assertCountEqual(self.factory.names(), ['Boat'])
+
+    def test_refresh_lazy(self):
+        factory = AbstractTypeFactory(VehicleAbstract)
+        factory.register_path(self.directory, lazy=True)
+        self.write('vehicles.py', '\n\nclass Bus(Car):\n    pass\n')
+
+        self.assertEqual(factory.refresh(), 1)
+        self.assertIn('Bus', factory.names())
+        self.assertEqual(len(factory.items()), 5)
+
+
+# ------------------------------------------------------------------------------
+class TestFactoryWatcher(unittest.TestCase):
+
+    use_inotify = True
+
+    def setUp(self):
+        self.directory = os.path.join(tempfile.mkdtemp(), 'plugins')
+        shutil.copytree(subclass_directory, self.directory)
+        self.factory = AbstractTypeFactory(VehicleAbstract, paths=[self.directory])
+
+        self.refreshed = threading.Event()
+        self.watcher = FactoryWatcher(
+            self.factory,
+            interval=0.05,
+            use_inotify=self.use_inotify,
+            callback=lambda count: self.refreshed.set(),
+        )
+        self.watcher.start()
+
+    def tearDown(self):
+        self.watcher.stop()
+        shutil.rmtree(os.path.dirname(self.directory))
+
+    def wait(self):
+        self.assertTrue(self.refreshed.wait(5.0))
+        self.refreshed.clear()
+
+    def test_watch(self):
+        self.assertTrue(self.watcher.is_running)
+
+        source = (
+            'from test_abstract_factories_paths.abstract import VehicleAbstract\n\n\n'
+            'class Boat(VehicleAbstract):\n    pass\n'
+        )
+        subdirectory = os.path.join(self.directory, 'boats')
+        os.mkdir(subdirectory)
+        with open(os.path.join(subdirectory, 'boats.py'), 'w') as fp:
+            fp.write(source)
+        self.wait()
+        self.assertIsNotNone(self.factory.get('Boat'))
+
+        os.remove(os.path.join(self.directory, 'vehicles.py'))
+        self.wait()
+        self.assertCountEqual(self.factory.names(), ['Boat'])
+
+        self.watcher.stop()
+        self.assertFalse(self.watcher.is_running)
+
+
+class TestFactoryWatcherPolling(TestFactoryWatcher):
+
+    use_inotify = False
+
+    def test_polling(self):
+        self.assertFalse(self.watcher.uses_inotify)
+
+
 # ------------------------------------------------------------------------------
 if __name__ == '__main__':
     unittest.main(verbosity=1)
@@ -0,0 +1,119 @@
+import os
+import shutil
+import sys
+import tempfile
+import textwrap
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from abstract_factories import AbstractTypeFactory
+from abstract_factories.scanning import scan_filepath
+
+
+class MockScanAbstract(object):
+    Name = ''
+    Version = 0
+
+
+# ------------------------------------------------------------------------------
+class TestScanFilepath(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, source, filename='plugin.py'):
+        filepath = os.path.join(self.directory, filename)
+        with open(filepath, 'w') as fp:
+            fp.write(textwrap.dedent(source))
+        return filepath
+
+    def test_scan(self):
+        filepath = self.write('''
+            from somewhere import MockScanAbstract
+
+            class Helper(object):
+                pass
+
+            class PluginA(MockScanAbstract):
+                Name = 'A'
+                Version = 2
+
+            class PluginB(PluginA):
+                Version = 3
+
+                def run(self):
+                    Name = 'local'
+                    return Name
+
+            class PluginC(module.MockScanAbstract):
+                Name = 'C'
+
+            plugin = PluginA()
+        ''')
+        records = scan_filepath(filepath, MockScanAbstract, name_key='Name', version_key='Version')
+        self.assertListEqual(records, [('A', 2), ('A', 3), ('C', 0)])
+
+        records = scan_filepath(filepath, MockScanAbstract)
+        self.assertListEqual(records, [('PluginA', None), ('PluginB', None), ('PluginC', None)])
+
+    def test_scan_no_candidates(self):
+        filepath = self.write('''
+            class Helper(object):
+                pass
+        ''')
+        self.assertListEqual(scan_filepath(filepath, MockScanAbstract), [])
+
+    def test_scan_unresolvable(self):
+        sources = [
+            # Unknown base.
+            'class PluginA(Unknown):\n    Name = "A"\n',
+            # Non-literal name.
+            'class PluginA(MockScanAbstract):\n    Name = "A".lower()\n',
+            # Name method.
+            'class PluginA(MockScanAbstract):\n    def Name(self):\n        return "A"\n',
+            # Conditional class.
+            'if True:\n    class PluginA(MockScanAbstract):\n        Name = "A"\n',
+            # Star import.
+            'from somewhere import *\n',
+            # Rebound class.
+            'class PluginA(MockScanAbstract):\n    Name = "A"\nPluginA = None\n',
+            # Conditional name.
+            'class PluginA(MockScanAbstract):\n    if True:\n        Name = "A"\n    else:\n        Name = "B"\n',
+            # Unpacked name.
+            'class PluginA(MockScanAbstract):\n    Name, Version = "A", 1\n',
+            # Decorated class.
+            '@register\nclass PluginA(MockScanAbstract):\n    Name = "A"\n',
+            # Dynamic class.
+            'PluginA = type("PluginA", (MockScanAbstract,), {"Name": "A"})\n',
+            # Class factory.
+            'class PluginA(MockScanAbstract):\n    Name = "A"\nPluginB = create_plugin(PluginA, "B")\n',
+            # Syntax error.
+            'class PluginA(MockScanAbstract)\n',
+        ]
+        for source in sources:
+            filepath = self.write(source)
+            self.assertIsNone(scan_filepath(filepath, MockScanAbstract, name_key='Name'), source)
+
+    def test_lazy_fallback(self):
+        self.write('class PluginA(MockScanAbstract):\n    Name = "A"\n', filename='plugin_a.py')
+        self.write(
+            'import sys\n'
+            'MockScanAbstract = sys.modules["test_abstract_factories_scanning"].MockScanAbstract\n'
+            'class PluginB(MockScanAbstract):\n    Name = "B".lower()\n',
+            filename='plugin_b.py',
+        )
+        sys.modules.setdefault('test_abstract_factories_scanning', sys.modules[__name__])
+
+        factory = AbstractTypeFactory(MockScanAbstract, name_key='Name')
+        self.assertEqual(factory.register_path(self.directory, lazy=True), 2)
+        self.assertEqual(len(factory._items), 1)  # plugin_b.py imported immediately.
+        self.assertCountEqual(factory.names(), ['A', 'b'])
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main(verbosity=1)
@@ -0,0 +1,249 @@
+import os
+import py_compile
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+import zipfile
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from abstract_factories import utils
+
+
+# ------------------------------------------------------------------------------
+class TestIterPythonFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for relative_path in [
+            'b.py',
+            'a.py',
+            'notes.txt',
+            os.path.join('sub_b', 'd.py'),
+            os.path.join('sub_a', 'c.py'),
+            os.path.join('sub_a', 'nested', 'e.py'),
+        ]:
+            filepath = os.path.join(self.directory, relative_path)
+            if not os.path.isdir(os.path.dirname(filepath)):
+                os.makedirs(os.path.dirname(filepath))
+            with open(filepath, 'w') as fp:
+                fp.write('')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def expected(self, *relative_paths):
+        return [utils.normalise_path(os.path.join(self.directory, x)) for x in relative_paths]
+
+    def test_iter_directory(self):
+        self.assertListEqual(
+            list(utils.iter_python_files(self.directory)),
+            self.expected('a.py', 'b.py', 'sub_a/c.py', 'sub_a/nested/e.py', 'sub_b/d.py'),
+        )
+
+    def test_iter_directory_non_recursive(self):
+        self.assertListEqual(
+            list(utils.iter_python_files(self.directory, recursive=False)),
+            self.expected('a.py', 'b.py'),
+        )
+
+    def test_iter_directory_workers(self):
+        self.assertListEqual(
+            list(utils.iter_python_files(self.directory, workers=4)),
+            list(utils.iter_python_files(self.directory)),
+        )
+
+    def test_iter_file(self):
+        filepath = os.path.join(self.directory, 'a.py')
+        self.assertListEqual(list(utils.iter_python_files(filepath)), self.expected('a.py'))
+
+    @unittest.skipUnless(hasattr(os, 'symlink'), 'Symlinks not supported.')
+    def test_iter_symlinked_file(self):
+        link_directory = tempfile.mkdtemp()
+        try:
+            os.symlink(os.path.join(self.directory, 'a.py'), os.path.join(link_directory, 'link.py'))
+            self.assertListEqual(list(utils.iter_python_files(link_directory)), self.expected('a.py'))
+        finally:
+            shutil.rmtree(link_directory)
+
+
+# ------------------------------------------------------------------------------
+class TestImportFromFilepaths(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filepaths = []
+        for index in range(6):
+            filepath = os.path.join(self.directory, 'module_{}.py'.format(index))
+            with open(filepath, 'w') as fp:
+                fp.write('VALUE = {}\n'.format(index))
+            self.filepaths.append(filepath)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_import_serial(self):
+        results = list(utils.iter_import_from_filepaths(self.filepaths))
+        self.assertListEqual([filepath for filepath, _ in results], self.filepaths)
+        self.assertListEqual([module.VALUE for _, module in results], list(range(6)))
+
+    def test_import_workers(self):
+        results = list(utils.iter_import_from_filepaths(iter(self.filepaths), workers=2))
+        self.assertListEqual([filepath for filepath, _ in results], self.filepaths)
+        self.assertListEqual([module.VALUE for _, module in results], list(range(6)))
+
+    def test_import_workers_compiled(self):
+        pyc_filepath = os.path.join(self.directory, 'compiled.pyc')
+        py_compile.compile(self.filepaths[1], cfile=pyc_filepath, doraise=True)
+
+        results = list(utils.iter_import_from_filepaths([self.filepaths[0], pyc_filepath], workers=2))
+        self.assertListEqual([module.VALUE for _, module in results], [0, 1])
+
+    def test_import_workers_failure(self):
+        with open(self.filepaths[2], 'w') as fp:
+            fp.write('VALUE = \n')
+
+        results = dict(utils.iter_import_from_filepaths(self.filepaths, workers=2))
+        self.assertIsNone(results[self.filepaths[2]])
+        self.assertEqual(results[self.filepaths[3]].VALUE, 3)
+
+    def test_import_results(self):
+        with open(self.filepaths[2], 'w') as fp:
+            fp.write('raise ValueError()\n')
+
+        for workers in (None, 2):
+            results = list(utils.iter_import_results(self.filepaths, workers=workers))
+            self.assertListEqual([x.filepath for x in results], self.filepaths)
+            self.assertIsInstance(results[2].error, ValueError)
+            self.assertIsNone(results[2].module)
+            self.assertIsNone(results[3].error)
+            self.assertTrue(all(x.seconds >= 0 for x in results))
+
+    def test_reuse_modules(self):
+        module = utils.import_from_filepath(self.filepaths[0])
+        self.assertIs(utils.import_from_filepath(self.filepaths[0]), module)
+        self.assertIs(utils.get_cached_module(self.filepaths[0]), module)
+        self.assertIs(dict(utils.iter_import_from_filepaths(self.filepaths, workers=2))[self.filepaths[0]], module)
+
+        self.assertIsNot(utils.import_from_filepath(self.filepaths[0], reuse=False), module)
+        self.assertIsNot(utils.import_from_filepath(self.filepaths[0], module_name='named_module'), module)
+
+    def test_reuse_modified_modules(self):
+        module = utils.import_from_filepath(self.filepaths[0])
+        with open(self.filepaths[0], 'w') as fp:
+            fp.write('VALUE = "modified"\n')
+        self.assertIsNone(utils.get_cached_module(self.filepaths[0]))
+        self.assertEqual(utils.import_from_filepath(self.filepaths[0]).VALUE, 'modified')
+        self.assertEqual(module.VALUE, 0)
+
+    def test_invalidate_modules(self):
+        modules = [utils.import_from_filepath(x) for x in self.filepaths]
+        self.assertEqual(utils.invalidate_modules(self.filepaths[0]), 1)
+        self.assertEqual(utils.invalidate_modules(self.filepaths[0]), 0)
+        self.assertIsNone(utils.get_cached_module(self.filepaths[0]))
+        self.assertIsNot(utils.import_from_filepath(self.filepaths[0]), modules[0])
+        self.assertIs(utils.import_from_filepath(self.filepaths[1]), modules[1])
+
+        self.assertGreaterEqual(utils.invalidate_modules(), len(self.filepaths))
+        self.assertIsNot(utils.import_from_filepath(self.filepaths[1]), modules[1])
+
+
+# ------------------------------------------------------------------------------
+class TestArchives(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.archive_path = os.path.join(self.directory, 'bundle.zip')
+
+        pyc_filepath = os.path.join(self.directory, 'compiled.py')
+        with open(pyc_filepath, 'w') as fp:
+            fp.write('VALUE = "compiled"\n')
+        py_compile.compile(pyc_filepath, cfile=pyc_filepath + 'c', doraise=True)
+
+        with zipfile.ZipFile(self.archive_path, 'w') as archive:
+            archive.writestr('b.py', 'VALUE = "b"\n')
+            archive.writestr('a.py', 'VALUE = "a"\n')
+            archive.writestr('notes.txt', '')
+            archive.writestr('sub/', '')
+            archive.writestr('sub/c.py', 'VALUE = "c"\n')
+            archive.writestr('sub/nested/d.py', 'VALUE = "d"\n')
+            archive.write(pyc_filepath + 'c', 'compiled.pyc')
+
+    def tearDown(self):
+        utils.close_archives()
+        shutil.rmtree(self.directory)
+
+    def expected(self, *members):
+        return ['{}/{}'.format(utils.normalise_path(self.archive_path), x) for x in members]
+
+    def test_split_archive_path(self):
+        self.assertTupleEqual(utils.split_archive_path(self.archive_path), (self.archive_path, ''))
+        self.assertTupleEqual(
+            utils.split_archive_path(os.path.join(self.archive_path, 'sub', 'c.py')),
+            (self.archive_path, 'sub/c.py'),
+        )
+        self.assertIsNone(utils.split_archive_path(os.path.join(self.directory, 'other.py')))
+        self.assertIsNone(utils.split_archive_path(os.path.join(self.directory, 'missing.zip', 'a.py')))
+
+    def test_iter_archive(self):
+        self.assertListEqual(
+            list(utils.iter_python_files(self.archive_path)),
+            self.expected('a.py', 'b.py', 'compiled.pyc', 'sub/c.py', 'sub/nested/d.py'),
+        )
+        self.assertListEqual(
+            list(utils.iter_python_files(self.archive_path, recursive=False)),
+            self.expected('a.py', 'b.py', 'compiled.pyc'),
+        )
+        self.assertListEqual(
+            list(utils.iter_python_files(os.path.join(self.archive_path, 'sub'))),
+            self.expected('sub/c.py', 'sub/nested/d.py'),
+        )
+
+    def test_import_archive(self):
+        filepaths = list(utils.iter_python_files(self.archive_path))
+        results = list(utils.iter_import_from_filepaths(filepaths))
+        self.assertListEqual([module.VALUE for _, module in results], ['a', 'b', 'compiled', 'c', 'd'])
+        self.assertEqual(results[0][1].__file__, filepaths[0])
+
+        results = list(utils.iter_import_from_filepaths(filepaths, workers=2))
+        self.assertListEqual([module.VALUE for _, module in results], ['a', 'b', 'compiled', 'c', 'd'])
+
+    def test_read_and_mtime(self):
+        filepath = self.expected('sub/c.py')[0]
+        self.assertEqual(utils.read_file(filepath), b'VALUE = "c"\n')
+        self.assertEqual(utils.get_mtime(filepath), os.path.getmtime(self.archive_path))
+
+    def test_close_archives(self):
+        filepath = self.expected('a.py')[0]
+        self.assertEqual(utils.read_file(filepath), b'VALUE = "a"\n')
+        archive = utils._open_archive(self.archive_path)
+
+        # Replaced archives release their old handle.
+        with zipfile.ZipFile(self.archive_path, 'a') as new_archive:
+            new_archive.writestr('e.py', 'VALUE = "e"\n')
+        mtime = os.path.getmtime(self.archive_path) + 10
+        os.utime(self.archive_path, (mtime, mtime))
+        self.assertEqual(utils.read_file(self.expected('e.py')[0]), b'VALUE = "e"\n')
+        self.assertIsNone(archive.fp)
+
+        archive = utils._open_archive(self.archive_path)
+        self.assertGreaterEqual(utils.close_archives(), 1)
+        self.assertIsNone(archive.fp)
+        self.assertEqual(utils.read_file(filepath), b'VALUE = "a"\n')
+        self.assertRaises(OSError, utils.get_mtime, self.expected('missing.py')[0])
+
+    def test_replaced_archive(self):
+        filepath = self.expected('a.py')[0]
+        self.assertEqual(utils.import_from_filepath(filepath).VALUE, 'a')
+
+        time.sleep(0.01)
+        with zipfile.ZipFile(self.archive_path, 'w') as archive:
+            archive.writestr('a.py', 'VALUE = "replaced"\n')
+        self.assertEqual(utils.import_from_filepath(filepath).VALUE, 'replaced')
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main(verbosity=1)